@@ -6,5 +6,13 @@
 
 __version__ = "0.0.16"
 
-# Initialize the logger
-from openspeleo_lib import logger  # noqa: F401 # pyright: ignore[reportUnusedImport]
+
+def __getattr__(name: str):
+    # The logger is initialized on first access rather than at import time to keep
+    # the `openspeleo` CLI startup as light as possible.
+    if name == "logger":
+        import importlib  # noqa: PLC0415
+
+        return importlib.import_module(f"{__name__}.logger")
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
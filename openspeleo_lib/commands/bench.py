@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+import orjson
+
+import openspeleo_lib
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# ruff: noqa: T201, PLC0415
+
+STAGES = [
+    "zip_read",
+    "xml_to_dict",
+    "ariane_decode",
+    "validation",
+    "ariane_encode",
+    "xml_write",
+    "geojson_propagation",
+    "geojson_serialization",
+]
+
+
+class StageRecorder:
+    """Times each pipeline stage, and optionally records its peak memory as well
+    as the memory retained by the loaded survey."""
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.durations: dict[str, float] = {}
+        self.peak_memory: dict[str, int] = {}
+        self.survey_memory: int | None = None
+
+        if trace_memory:
+            self._base_memory, _ = tracemalloc.get_traced_memory()
+
+    def record_survey_memory(self) -> None:
+        """Records the memory allocated since the recorder was created."""
+        if self.trace_memory:
+            current_memory, _ = tracemalloc.get_traced_memory()
+            self.survey_memory = current_memory - self._base_memory
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None]:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base_memory, _ = tracemalloc.get_traced_memory()
+
+        start_t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = time.perf_counter() - start_t
+
+            if self.trace_memory:
+                _, peak_memory = tracemalloc.get_traced_memory()
+                self.peak_memory[name] = peak_memory - base_memory
+
+
+def run_pipeline(
+    filepath: pathlib.Path, target_f: pathlib.Path, recorder: StageRecorder
+) -> int:
+    """Runs the full TML => Survey => TML / GeoJSON pipeline once.
+
+    Returns the number of shots loaded.
+    """
+    from openspeleo_core import ariane_core
+
+    from openspeleo_lib.generators import UniqueValueGenerator
+    from openspeleo_lib.geojson import NoKnownAnchorError
+    from openspeleo_lib.geojson import build_feature_collection
+    from openspeleo_lib.geojson import propagate_survey
+    from openspeleo_lib.interfaces.ariane.decoding import ariane_decode
+    from openspeleo_lib.interfaces.ariane.encoding import ariane_encode
+    from openspeleo_lib.interfaces.ariane.interface import ArianeSurvey
+    from openspeleo_lib.interfaces.ariane.interface import load_tml_xml
+    from openspeleo_lib.interfaces.ariane.interface import save_tml_xml
+
+    # ============================== LOADING ============================== #
+
+    with recorder.stage("zip_read"):
+        xml_str = load_tml_xml(filepath)
+
+    with recorder.stage("xml_to_dict"):
+        data = ariane_core.xml_str_to_dict(xml_str, keep_null=False)["CaveFile"]
+
+    with recorder.stage("ariane_decode"):
+        data = ariane_decode(data)
+
+    with recorder.stage("validation"), UniqueValueGenerator.activate_uniqueness():
+        survey = ArianeSurvey.model_validate(data, by_alias=True)
+
+    del xml_str, data
+    recorder.record_survey_memory()
+
+    # ============================== EXPORT =============================== #
+
+    with recorder.stage("ariane_encode"):
+        data = ariane_encode(survey.model_dump(mode="json", by_alias=True))
+
+    with recorder.stage("xml_write"):
+        save_tml_xml(ariane_core.dict_to_xml_str(data, root_name="CaveFile"), target_f)
+
+    del data
+
+    # ============================== GEOJSON ============================== #
+
+    try:
+        with recorder.stage("geojson_propagation"):
+            shots_map, valid_shot_ids = propagate_survey(survey)
+
+    except NoKnownAnchorError:
+        # Surveys without any anchor can't be exported to GeoJSON
+        recorder.durations.pop("geojson_propagation", None)
+        recorder.peak_memory.pop("geojson_propagation", None)
+
+    else:
+        with recorder.stage("geojson_serialization"):
+            orjson.dumps(build_feature_collection(survey, shots_map, valid_shot_ids))
+
+    return sum(1 for _ in survey.shots)
+
+
+def _summarize(runs: list[float]) -> dict[str, float]:
+    return {
+        "mean": statistics.mean(runs),
+        "median": statistics.median(runs),
+        "min": min(runs),
+        "max": max(runs),
+        "stdev": statistics.stdev(runs) if len(runs) > 1 else 0.0,
+    }
+
+
+def bench_file(
+    filepath: pathlib.Path,
+    iterations: int = 10,
+    warmup: int = 2,
+    trace_memory: bool = True,
+) -> dict:
+    """Benchmarks each stage of the pipeline for `filepath`."""
+    runs: dict[str, list[float]] = {}
+    shots = 0
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        target_f = pathlib.Path(tmp_dir) / "export.tml"
+
+        for idx in range(warmup + iterations):
+            gc.collect()
+            recorder = StageRecorder()
+            shots = run_pipeline(filepath, target_f, recorder)
+
+            if idx < warmup:
+                continue
+
+            for stage, duration in recorder.durations.items():
+                runs.setdefault(stage, []).append(duration)
+
+        # Memory is recorded on a separate pass: `tracemalloc` would otherwise
+        # distort the timings.
+        peak_memory: dict[str, int] = {}
+        survey_memory = None
+        if trace_memory:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                recorder = StageRecorder(trace_memory=True)
+                run_pipeline(filepath, target_f, recorder)
+                peak_memory = recorder.peak_memory
+                survey_memory = recorder.survey_memory
+            finally:
+                tracemalloc.stop()
+
+    stages = {}
+    for stage in STAGES:
+        if stage not in runs:
+            continue
+        stages[stage] = _summarize(runs[stage])
+        if stage in peak_memory:
+            stages[stage]["peak_memory"] = peak_memory[stage]
+
+    totals = [sum(values) for values in zip(*runs.values(), strict=True)]
+
+    results = {
+        "size": filepath.stat().st_size,
+        "shots": shots,
+        "stages": stages,
+        "total": _summarize(totals),
+    }
+    if survey_memory is not None:
+        results["survey_memory"] = survey_memory
+
+    return results
+
+
+def file_keys(filepaths: list[pathlib.Path]) -> list[str]:
+    """Keys of `filepaths` in the results: their paths relative to the deepest
+    directory holding all of them (e.g. `ariane/project.tml`).
+
+    File names alone would collide across directories, while paths relative to
+    the working directory would change with it and break the comparisons
+    against a baseline.
+    """
+    filepaths = [filepath.resolve() for filepath in filepaths]
+    root = os.path.commonpath([filepath.parent for filepath in filepaths])
+    return [filepath.relative_to(root).as_posix() for filepath in filepaths]
+
+
+def compare_to_baseline(
+    results: dict, baseline: dict, threshold: float, min_delta: float
+) -> list[str]:
+    """Returns the stages which regressed by more than `threshold` percent.
+
+    Differences smaller than `min_delta` seconds are ignored to avoid flagging
+    noise on very fast stages.
+    """
+    regressions = []
+    for filename, file_results in results["files"].items():
+        if (baseline_file := baseline.get("files", {}).get(filename)) is None:
+            continue
+
+        for stage, stats in [
+            *file_results["stages"].items(),
+            ("total", file_results["total"]),
+        ]:
+            if stage == "total":
+                baseline_stats = baseline_file.get("total")
+            else:
+                baseline_stats = baseline_file.get("stages", {}).get(stage)
+
+            if baseline_stats is None:
+                continue
+
+            current, reference = stats["median"], baseline_stats["median"]
+            if current - reference > min_delta and current > reference * (
+                1.0 + threshold / 100.0
+            ):
+                regressions.append(
+                    f"{filename} [{stage}]: {reference * 1000:.2f} ms => "
+                    f"{current * 1000:.2f} ms "
+                    f"(+{(current / reference - 1.0) * 100:.1f}%)"
+                )
+
+    return regressions
+
+
+def _print_report(results: dict) -> None:
+    for filename, file_results in results["files"].items():
+        print(
+            f"\n{filename} - {file_results['size'] / 1024.0:.1f} KB - "
+            f"{file_results['shots']} shots"
+        )
+        print(f"  {'Stage':<24s} {'Median':>10s} {'Min':>10s} {'Peak Mem':>12s}")
+        for stage, stats in [
+            *file_results["stages"].items(),
+            ("total", file_results["total"]),
+        ]:
+            peak = stats.get("peak_memory")
+            peak_str = f"{peak / 1024.0 / 1024.0:.2f} MB" if peak is not None else "-"
+            print(
+                f"  {stage:<24s} {stats['median'] * 1000:>7.2f} ms "
+                f"{stats['min'] * 1000:>7.2f} ms {peak_str:>12s}"
+            )
+
+        if (survey_memory := file_results.get("survey_memory")) is not None:
+            print(f"  Survey memory: {survey_memory / 1024.0 / 1024.0:.2f} MB")
+
+
+def bench(args):
+    parser = argparse.ArgumentParser(
+        prog="bench", description="Benchmark the OpenSpeleo load/export pipeline"
+    )
+
+    parser.add_argument(
+        "input_files",
+        type=pathlib.Path,
+        nargs="+",
+        help="TML files to benchmark.",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=10,
+        help="Number of timed iterations per file.",
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=2,
+        help="Number of untimed iterations per file.",
+    )
+
+    parser.add_argument(
+        "--no_memory",
+        action="store_true",
+        help="Skip the peak memory (`tracemalloc`) measurement pass.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output_file",
+        type=pathlib.Path,
+        default=None,
+        help="Path to save the JSON results at (`-` for stdout).",
+    )
+
+    parser.add_argument(
+        "--baseline",
+        type=pathlib.Path,
+        default=None,
+        help="JSON results of a previous run to compare against.",
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="Regression threshold in percent of the baseline median.",
+    )
+
+    parser.add_argument(
+        "--min_delta_ms",
+        type=float,
+        default=1.0,
+        help="Ignore regressions smaller than this many milliseconds.",
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.iterations < 1:
+        parser.error("`--iterations` must be at least 1.")
+
+    for input_file in parsed_args.input_files:
+        if not input_file.exists():
+            raise FileNotFoundError(f"File not found: `{input_file}`")
+
+    baseline = None
+    if parsed_args.baseline is not None:
+        if not parsed_args.baseline.exists():
+            raise FileNotFoundError(f"File not found: `{parsed_args.baseline}`")
+        baseline = orjson.loads(parsed_args.baseline.read_bytes())
+
+    results = {
+        "openspeleo_lib": openspeleo_lib.__version__,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "iterations": parsed_args.iterations,
+        "warmup": parsed_args.warmup,
+        "files": {
+            key: bench_file(
+                input_file,
+                iterations=parsed_args.iterations,
+                warmup=parsed_args.warmup,
+                trace_memory=not parsed_args.no_memory,
+            )
+            for key, input_file in zip(
+                file_keys(parsed_args.input_files),
+                parsed_args.input_files,
+                strict=True,
+            )
+        },
+    }
+
+    json_data = orjson.dumps(
+        results, None, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+    )
+
+    if parsed_args.output_file is not None and str(parsed_args.output_file) == "-":
+        sys.stdout.write(json_data.decode("utf-8") + "\n")
+    else:
+        _print_report(results)
+        if parsed_args.output_file is not None:
+            parsed_args.output_file.write_bytes(json_data)
+
+    if baseline is not None:
+        if regressions := compare_to_baseline(
+            results,
+            baseline,
+            threshold=parsed_args.threshold,
+            min_delta=parsed_args.min_delta_ms / 1000.0,
+        ):
+            print(
+                f"\n[FAIL] {len(regressions)} regression(s) detected:", file=sys.stderr
+            )
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            return 1
+
+        print("\nNo regression detected.", file=sys.stderr)
+
+    return 0
@@ -1,37 +1,325 @@
 from __future__ import annotations
 
 import argparse
+import io
 import logging
+import os
 import pathlib
+import sys
+import time
+from typing import TYPE_CHECKING
+from typing import BinaryIO
+from typing import NamedTuple
 
-import orjson
+if TYPE_CHECKING:
+    from collections.abc import Generator
 
-from openspeleo_lib.geojson import survey_to_geojson
-from openspeleo_lib.interfaces import ArianeInterface
+    from openspeleo_lib.models import Survey
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Heavy dependencies (pydantic models, pyproj, ...) are imported on first use to
+# keep `openspeleo` startup fast.
+# ruff: noqa: T201, PLC0415
+
+# `-i -` / `-o -` read from stdin / write to stdout.
+STDIO_PATH = "-"
+
+
+class ConversionResult(NamedTuple):
+    input_file: pathlib.Path
+    output_file: pathlib.Path
+    status: str  # "converted", "skipped" or "failed"
+    elapsed: float = 0.0
+    size: int = 0
+    error: str | None = None
+
+
+def serialize_survey(survey: Survey, fmt: str, beautify: bool = False) -> bytes:
+    import orjson
+
+    from openspeleo_lib.geojson import survey_to_geojson
+
+    match fmt:
+        case "geojson":
+            return orjson.dumps(
+                survey_to_geojson(survey),
+                None,
+                option=(
+                    (orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS) if beautify else None
+                ),
+            )
+
+        case "json":
+            return survey.to_json_bytes(beautify=beautify)
+
+        case _:
+            raise ValueError(f"Unsupported conversion format: `{fmt}`")
+
+
+def iter_serialized_survey(
+    survey: Survey, fmt: str, beautify: bool = False
+) -> Generator[bytes]:
+    """Yields the serialized survey chunk by chunk (one per feature / section).
+
+    The concatenated chunks are identical to `serialize_survey()`. Beautified
+    outputs have their keys sorted at every level and are yielded at once.
+    """
+    if beautify:
+        yield serialize_survey(survey, fmt=fmt, beautify=True)
+        return
+
+    import orjson
+
+    from openspeleo_lib.geojson import iter_features
+    from openspeleo_lib.geojson import propagate_survey
+
+    match fmt:
+        case "geojson":
+            shots_map, valid_shot_ids = propagate_survey(survey)
+
+            yield b'{"type":"FeatureCollection","features":['
+            for idx, feature in enumerate(
+                iter_features(survey, shots_map, valid_shot_ids)
+            ):
+                yield b"," + orjson.dumps(feature) if idx else orjson.dumps(feature)
+            yield b"]}"
+
+        case "json":
+            yield from survey.iter_json_bytes()
+
+        case _:
+            raise ValueError(f"Unsupported conversion format: `{fmt}`")
+
+
+def load_survey(
+    input_file: pathlib.Path | BinaryIO, *, lazy_shapes: bool = False
+) -> Survey:
+    """Loads a survey from a path or from a binary stream holding a TML file.
+
+    `lazy_shapes` keeps the wall shapes as raw XML (see `ArianeInterface`).
+    """
+    from openspeleo_lib.interfaces import ArianeInterface
+
+    if not isinstance(input_file, pathlib.Path):
+        # Streams (e.g. stdin) aren't seekable: buffered in memory for `zipfile`.
+        return ArianeInterface.from_fileobj(
+            io.BytesIO(input_file.read()), lazy_shapes=lazy_shapes
+        )
+
+    match input_file.suffix:
+        case ".tml":
+            return ArianeInterface.from_file(input_file, lazy_shapes=lazy_shapes)
+
+        case _:
+            raise ValueError(f"Unsupported file format: `{input_file.suffix}`")
+
+
+def write_survey(
+    survey: Survey, fileobj: BinaryIO, fmt: str, beautify: bool = False
+) -> None:
+    """Streams the serialized survey into `fileobj`."""
+    for chunk in iter_serialized_survey(survey, fmt=fmt, beautify=beautify):
+        fileobj.write(chunk)
+
+
+def convert_file(
+    input_file: pathlib.Path | BinaryIO,
+    output_file: pathlib.Path | BinaryIO,
+    fmt: str,
+    beautify: bool = False,
+) -> None:
+    """Converts `input_file` into `output_file`, each one a path or a stream."""
+    # GeoJSON only needs the centerline: wall shapes are never decoded.
+    survey = load_survey(input_file, lazy_shapes=fmt == "geojson")
+
+    if not isinstance(output_file, pathlib.Path):
+        write_survey(survey, output_file, fmt=fmt, beautify=beautify)
+        output_file.flush()
+        return
+
+    with output_file.open(mode="wb") as f:
+        write_survey(survey, f, fmt=fmt, beautify=beautify)
+
+
+def _batch_output_path(
+    input_file: pathlib.Path, output_dir: pathlib.Path, fmt: str
+) -> pathlib.Path:
+    # Mirrors the naming used by the Makefile `regen-test-*` targets:
+    #   - geojson: `project.tml` => `project.geojson`
+    #   - json:    `project.tml` => `project.tml.json`
+    match fmt:
+        case "geojson":
+            return output_dir / f"{input_file.stem}.geojson"
+        case "json":
+            return output_dir / f"{input_file.name}.json"
+        case _:
+            raise ValueError(f"Unsupported conversion format: `{fmt}`")
+
+
+def _convert_task(
+    input_file: pathlib.Path, output_file: pathlib.Path, fmt: str, beautify: bool
+) -> ConversionResult:
+    """Worker entrypoint - never raises so that results can always be pickled."""
+    start_t = time.perf_counter()
+    try:
+        convert_file(input_file, output_file, fmt=fmt, beautify=beautify)
+    except Exception as e:  # noqa: BLE001
+        return ConversionResult(
+            input_file=input_file,
+            output_file=output_file,
+            status="failed",
+            elapsed=time.perf_counter() - start_t,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+    return ConversionResult(
+        input_file=input_file,
+        output_file=output_file,
+        status="converted",
+        elapsed=time.perf_counter() - start_t,
+        size=input_file.stat().st_size,
+    )
+
+
+def convert_directory(
+    input_dir: pathlib.Path,
+    output_dir: pathlib.Path,
+    *,
+    fmt: str,
+    pattern: str = "*.tml",
+    jobs: int = 1,
+    beautify: bool = False,
+    overwrite: bool = False,
+) -> list[ConversionResult]:
+    """Convert every file of `input_dir` matching `pattern` into `output_dir`.
+
+    Outputs that are newer than their input are skipped unless `overwrite` is
+    set. Conversions are dispatched to a pool of `jobs` long-lived worker
+    processes, so interpreter startup and module imports are only paid once per
+    worker instead of once per file.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results: list[ConversionResult] = []
+    tasks: list[tuple[pathlib.Path, pathlib.Path]] = []
+
+    for input_file in sorted(input_dir.glob(pattern)):
+        if not input_file.is_file():
+            continue
+
+        output_file = _batch_output_path(input_file, output_dir, fmt)
+
+        if (
+            not overwrite
+            and output_file.exists()
+            and output_file.stat().st_mtime >= input_file.stat().st_mtime
+        ):
+            results.append(
+                ConversionResult(
+                    input_file=input_file, output_file=output_file, status="skipped"
+                )
+            )
+            continue
+
+        tasks.append((input_file, output_file))
+
+    if jobs == 1 or len(tasks) <= 1:
+        results.extend(
+            _convert_task(input_f, output_f, fmt, beautify)
+            for input_f, output_f in tasks
+        )
+
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_convert_task, input_f, output_f, fmt, beautify)
+                for input_f, output_f in tasks
+            ]
+            results.extend(future.result() for future in futures)
+
+    for result in results:
+        if result.status == "failed":
+            logger.error(
+                "Conversion failed: `%(input_file)s` - %(error)s",
+                {"input_file": result.input_file, "error": result.error},
+            )
+
+    return results
+
+
+def _print_summary(results: list[ConversionResult], elapsed: float) -> None:
+    converted = [r for r in results if r.status == "converted"]
+    skipped = [r for r in results if r.status == "skipped"]
+    failed = [r for r in results if r.status == "failed"]
+
+    total_mb = sum(r.size for r in converted) / 1024.0 / 1024.0
+
+    print(
+        f"Converted: {len(converted)} - Skipped: {len(skipped)} - "
+        f"Failed: {len(failed)} - Total: {len(results)}"
+    )
+    if elapsed > 0:
+        print(
+            f"Elapsed: {elapsed:.2f} secs - Throughput: "
+            f"{len(converted) / elapsed:.2f} files/sec, {total_mb / elapsed:.2f} MB/sec"
+        )
+    for result in failed:
+        print(f"[FAILED] {result.input_file}: {result.error}")
+
 
 def convert(args):
     parser = argparse.ArgumentParser(
         prog="convert", description="Convert a Survey File"
     )
-    parser.add_argument(
+
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
         "-i",
         "--input_file",
         type=pathlib.Path,
-        required=True,
-        help="Path to the TML file to be validated",
+        help="Path to the TML file to be converted (`-` to read from stdin).",
+    )
+    input_group.add_argument(
+        "--input_dir",
+        "--input-dir",
+        type=pathlib.Path,
+        help="Directory containing the files to convert in batch.",
     )
 
-    parser.add_argument(
+    output_group = parser.add_mutually_exclusive_group(required=True)
+    output_group.add_argument(
         "-o",
         "--output_file",
         type=pathlib.Path,
         default=None,
-        required=True,
-        help="Path to save the converted file at.",
+        help="Path to save the converted file at (`-` to write to stdout).",
+    )
+    output_group.add_argument(
+        "--output_dir",
+        "--output-dir",
+        type=pathlib.Path,
+        default=None,
+        help="Directory to save the converted files at (batch mode).",
+    )
+
+    parser.add_argument(
+        "-g",
+        "--glob",
+        type=str,
+        default="*.tml",
+        help="Glob pattern used to select the input files (batch mode).",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (batch mode). `0` uses all the CPUs.",
     )
 
     parser.add_argument(
@@ -61,43 +349,67 @@ def convert(args):
 
     parsed_args = parser.parse_args(args)
 
+    # ============================ BATCH MODE ============================ #
+
+    if (input_dir := parsed_args.input_dir) is not None:
+        if (output_dir := parsed_args.output_dir) is None:
+            parser.error("`--input_dir` requires `--output_dir`.")
+
+        if not input_dir.is_dir():
+            raise NotADirectoryError(f"Directory not found: `{input_dir}`")
+
+        if (jobs := parsed_args.jobs) < 0:
+            parser.error("`--jobs` must be a positive integer.")
+
+        start_t = time.perf_counter()
+        results = convert_directory(
+            input_dir=input_dir,
+            output_dir=output_dir,
+            fmt=parsed_args.format,
+            pattern=parsed_args.glob,
+            jobs=jobs or os.cpu_count() or 1,
+            beautify=parsed_args.beautify,
+            overwrite=parsed_args.overwrite,
+        )
+        _print_summary(results, elapsed=time.perf_counter() - start_t)
+
+        return 1 if any(r.status == "failed" for r in results) else 0
+
+    # ========================= SINGLE FILE MODE ========================= #
+
     input_file: pathlib.Path = parsed_args.input_file
     output_file: pathlib.Path = parsed_args.output_file
 
-    if not input_file.exists():
+    if output_file is None:
+        parser.error("`--input_file` requires `--output_file`.")
+
+    if str(input_file) == STDIO_PATH:
+        input_file = sys.stdin.buffer
+
+    elif not input_file.exists():
         raise FileNotFoundError(f"File not found: `{input_file}`")
 
-    if output_file.exists() and not parsed_args.overwrite:
+    if str(output_file) == STDIO_PATH:
+        output_file = sys.stdout.buffer
+
+    elif output_file.exists() and not parsed_args.overwrite:
         raise FileExistsError(
             f"The file `{output_file}` already existing. "
             "Please pass the flag `--overwrite` to ignore."
         )
 
-    match input_file.suffix:
-        case ".tml":
-            survey = ArianeInterface.from_file(input_file)
-
-        case _:
-            raise ValueError(f"Unsupported file format: `{input_file.suffix}`")
-
-    match parsed_args.format:
-        case "geojson":
-            geojson_data = survey_to_geojson(survey)
-            with output_file.open(mode="wb") as f:
-                f.write(
-                    orjson.dumps(
-                        geojson_data,
-                        None,
-                        option=(
-                            (orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
-                            if parsed_args.beautify
-                            else None
-                        ),
-                    )
-                )
+    try:
+        convert_file(
+            input_file,
+            output_file,
+            fmt=parsed_args.format,
+            beautify=parsed_args.beautify,
+        )
 
-        case "json":
-            survey.to_json(filepath=output_file, beautify=parsed_args.beautify)
+    except BrokenPipeError:
+        # The downstream reader (e.g. `head`) exited early. Stdout is redirected
+        # to devnull so that the interpreter doesn't fail flushing it at exit.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
 
-        case _:
-            raise ValueError(f"Unsupported conversion format: `{parsed_args.format}`")
+    return 0
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from pathlib import Path
+
+from openspeleo_lib.commands.encrypt import load_env_key
+from openspeleo_lib.commands.encrypt import print_summary
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def decrypt(args: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="openspeleo decrypt")
+
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
+        "-i",
+        "--input_file",
+        type=str,
+        default=None,
+        help="Encrypted file to decrypt.",
+    )
+    input_group.add_argument(
+        "--input_dir",
+        "--input-dir",
+        type=Path,
+        default=None,
+        help=(
+            "Directory whose `*.encrypted` files are decrypted next to them. "
+            "Files already up to date (see `manifest.json`) are skipped."
+        ),
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output_file",
+        type=str,
+        default=None,
+        help="Path to save the decrypted file at.",
+    )
+
+    parser.add_argument(
+        "-e",
+        "--env_file",
+        type=str,
+        default=None,
+        required=True,
+        help="Path of the environment file containing the AES-SIV key.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (directory mode). `0` uses all the CPUs.",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--overwrite",
+        action="store_true",
+        help=(
+            "Allow overwrite an already existing file. In directory mode, "
+            "decrypt the up to date files too."
+        ),
+        default=False,
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if (jobs := parsed_args.jobs) < 0:
+        parser.error("`--jobs` must be a positive integer.")
+
+    # ========================== DIRECTORY MODE ========================== #
+
+    if (input_dir := parsed_args.input_dir) is not None:
+        if parsed_args.output_file is not None:
+            parser.error("`--input_dir` decrypts the files next to their source.")
+
+        if not input_dir.is_dir():
+            raise NotADirectoryError(f"Directory not found: `{input_dir}`")
+
+        key = load_env_key(Path(parsed_args.env_file))
+
+        from openspeleo_lib.encryption import decrypt_directory  # noqa: PLC0415
+
+        results = decrypt_directory(
+            input_dir,
+            key,
+            jobs=jobs or os.cpu_count() or 1,
+            overwrite=parsed_args.overwrite,
+        )
+        print_summary(results)
+
+        return 1 if any(r.status == "failed" for r in results) else 0
+
+    # ========================= SINGLE FILE MODE ========================= #
+
+    if parsed_args.output_file is None:
+        parser.error("`--input_file` requires `--output_file`.")
+
+    if not (input_file := Path(parsed_args.input_file)).exists():
+        raise FileNotFoundError(f"Impossible to find: `{input_file}`.")
+
+    if (
+        output_file := Path(parsed_args.output_file)
+    ).exists() and not parsed_args.overwrite:
+        raise FileExistsError(
+            f"The file {output_file} already existing. "
+            "Please pass the flag `--overwrite` to ignore."
+        )
+
+    key = load_env_key(Path(parsed_args.env_file))
+
+    from openspeleo_lib.encryption import decrypt_file  # noqa: PLC0415
+
+    decrypt_file(input_file, output_file, key)
+
+    return 0
@@ -0,0 +1,462 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import pathlib
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import parse_qs
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Heavy dependencies are imported in the worker processes (or before forking
+# them), never when the command module is loaded.
+# ruff: noqa: PLC0415
+
+CHUNK_SIZE = 64 * 1024
+MAX_HEADER_COUNT = 100
+
+# Endpoints served: `route => (task, default conversion format)`
+ROUTES = {
+    "/convert": ("convert", "json"),
+    "/geojson": ("convert", "geojson"),
+    "/validate": ("validate", None),
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str | None = None):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ WORKERS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+def _preload_modules() -> None:
+    """Imports everything a request needs so that workers start warm."""
+    from openspeleo_lib.commands.convert import serialize_survey  # noqa: F401
+    from openspeleo_lib.geojson import get_geod
+    from openspeleo_lib.interfaces import ArianeInterface  # noqa: F401
+
+    get_geod()
+
+
+def _warmup() -> int:
+    return os.getpid()
+
+
+def _run_task(task: str, payload: bytes, fmt: str | None, beautify: bool) -> tuple:
+    """Worker entrypoint - returns `(ok, data)` and never raises so that results
+    can always be pickled back to the server process."""
+    from openspeleo_lib.commands.convert import serialize_survey
+    from openspeleo_lib.interfaces import ArianeInterface
+
+    try:
+        survey = ArianeInterface.from_bytes(payload)
+
+        if task == "validate":
+            return True, b'{"valid":true}'
+
+        return True, serialize_survey(survey, fmt=fmt, beautify=beautify)
+
+    except Exception as e:  # noqa: BLE001
+        return False, f"{type(e).__name__}: {e}"
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ SERVER ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+class ConversionServer:
+    """Minimal asyncio HTTP/1.1 server dispatching conversions to warm workers.
+
+    - Requests are processed by a pool of `workers` pre-forked processes which
+      already imported the models, pyproj, etc.
+    - At most `workers + max_queue` requests are accepted at once, any other
+      request is rejected with `503 Service Unavailable`.
+    - Requests taking longer than `timeout` seconds are answered with
+      `504 Gateway Timeout`. Their conversion still runs to completion and
+      counts against the limit above until then.
+    - A worker process dying (e.g. killed when out of memory) breaks the whole
+      pool: the pool is replaced and its pending requests are answered with
+      `503 Service Unavailable`.
+    - Responses are sent once the conversion is complete (the worker returns
+      the whole document), using chunked transfer encoding.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        unix_socket: str | pathlib.Path | None = None,
+        workers: int = 1,
+        max_queue: int = 16,
+        timeout: float = 60.0,
+        max_body_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.max_body_size = max_body_size
+
+        self._executor: ProcessPoolExecutor | None = None
+        self._server: asyncio.Server | None = None
+        self._in_flight = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def address(self) -> str | tuple[str, int]:
+        if self.unix_socket is not None:
+            return str(self.unix_socket)
+
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        # Modules are imported before forking so that the workers inherit them.
+        _preload_modules()
+
+        self._executor = self._new_executor()
+
+        # Pre-fork all the workers: the pool only spawns processes on demand.
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self._executor, _warmup)
+                for _ in range(self.workers)
+            )
+        )
+
+        if self.unix_socket is not None:
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, path=str(self.unix_socket)
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, host=self.host, port=self.port
+            )
+
+        logger.info(
+            "Serving on `%(address)s` with %(workers)d worker(s).",
+            {"address": self.address, "workers": self.workers},
+        )
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_preload_modules
+        )
+
+    def _replace_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Replaces a broken pool (once, whichever request noticed first).
+
+        The workers of the new pool are spawned on demand.
+        """
+        if self._executor is not executor:
+            return
+
+        logger.error("A worker process died: restarting the worker pool.")
+        executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._new_executor()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+        if self.unix_socket is not None:
+            with contextlib.suppress(FileNotFoundError):
+                pathlib.Path(self.unix_socket).unlink()  # noqa: ASYNC240
+
+    async def serve_forever(self) -> None:
+        await self.start()
+
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, stop_event.set)
+
+        try:
+            await stop_event.wait()
+        finally:
+            await self.close()
+
+    # ------------------------------------------------------------------- #
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        start_t = time.perf_counter()
+        method = path = "-"
+        status = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        try:
+            method, path, query, body = await self._read_request(reader)
+            status, data = await self._dispatch(method, path, query, body)
+
+        except HTTPError as e:
+            status, data = e.status, _error_body(e.message)
+
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+
+        except Exception:
+            logger.exception("Unexpected error while processing: `%s`", path)
+            status = HTTPStatus.INTERNAL_SERVER_ERROR
+            data = _error_body(status.phrase)
+
+        try:
+            await self._write_response(writer, status, data)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+        logger.debug(
+            "%(method)s %(path)s => %(status)d [%(elapsed).3f secs]",
+            {
+                "method": method,
+                "path": path,
+                "status": status,
+                "elapsed": time.perf_counter() - start_t,
+            },
+        )
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, dict[str, list[str]], bytes]:
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError as e:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line") from e
+
+        headers = {}
+        for _ in range(MAX_HEADER_COUNT):
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise HTTPError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+
+        url = urlsplit(target)
+
+        body = b""
+        if method == "POST":
+            if (content_length := headers.get("content-length")) is None:
+                raise HTTPError(HTTPStatus.LENGTH_REQUIRED)
+
+            try:
+                content_length = int(content_length)
+            except ValueError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length") from e
+
+            if content_length > self.max_body_size:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+            body = await reader.readexactly(content_length)
+
+        return method, url.path, parse_qs(url.query), body
+
+    async def _dispatch(
+        self, method: str, path: str, query: dict[str, list[str]], body: bytes
+    ) -> tuple[HTTPStatus, bytes]:
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, (
+                f'{{"status":"ok","in_flight":{self._in_flight},'
+                f'"capacity":{self.capacity}}}'
+            ).encode()
+
+        if (route := ROUTES.get(path)) is None:
+            raise HTTPError(HTTPStatus.NOT_FOUND)
+
+        if method != "POST":
+            raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
+
+        task, fmt = route
+        fmt = query.get("format", [fmt])[0]
+        if task == "convert" and fmt not in ("geojson", "json"):
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"Unsupported conversion format: `{fmt}`"
+            )
+
+        beautify = query.get("beautify", ["false"])[0].lower() in ("1", "true")
+
+        # Bounded queue: reject instead of piling up requests.
+        if self._in_flight >= self.capacity:
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Server is busy")
+
+        # The slot is released once the worker is done with the job: a
+        # timed-out conversion keeps running (and occupying its worker).
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            future = executor.submit(_run_task, task, body, fmt, beautify)
+        except BrokenProcessPool as e:
+            self._replace_executor(executor)
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Worker crashed") from e
+
+        self._in_flight += 1
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release_slot)
+        )
+
+        try:
+            ok, data = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.timeout
+            )
+        except TimeoutError as e:
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT) from e
+        except BrokenProcessPool as e:
+            self._replace_executor(executor)
+            raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Worker crashed") from e
+
+        if not ok:
+            if task == "validate":
+                return HTTPStatus.UNPROCESSABLE_ENTITY, _error_body(data, valid=False)
+            return HTTPStatus.UNPROCESSABLE_ENTITY, _error_body(data)
+
+        return HTTPStatus.OK, data
+
+    def _release_slot(self) -> None:
+        self._in_flight -= 1
+
+    async def _write_response(
+        self, writer: asyncio.StreamWriter, status: HTTPStatus, data: bytes
+    ) -> None:
+        writer.write(
+            (
+                f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json\r\n"
+                "Transfer-Encoding: chunked\r\n"
+                "Connection: close\r\n"
+                "\r\n"
+            ).encode("latin-1")
+        )
+
+        view = memoryview(data)
+        for offset in range(0, len(view), CHUNK_SIZE):
+            chunk = view[offset : offset + CHUNK_SIZE]
+            writer.write(f"{len(chunk):X}\r\n".encode("latin-1"))
+            writer.write(chunk)
+            writer.write(b"\r\n")
+            await writer.drain()
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def _error_body(message: str, **extra) -> bytes:
+    import orjson
+
+    return orjson.dumps({**extra, "error": message})
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ COMMAND ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+def serve(args):
+    parser = argparse.ArgumentParser(
+        prog="serve",
+        description="Serve survey conversions over a local HTTP or Unix socket",
+    )
+
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Host to listen on.",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8080,
+        help="TCP port to listen on.",
+    )
+
+    parser.add_argument(
+        "-u",
+        "--unix_socket",
+        type=pathlib.Path,
+        default=None,
+        help="Listen on a Unix socket instead of a TCP port.",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes. `0` uses all the CPUs.",
+    )
+
+    parser.add_argument(
+        "-q",
+        "--max_queue",
+        type=int,
+        default=16,
+        help="Number of requests allowed to wait for a worker before rejecting.",
+    )
+
+    parser.add_argument(
+        "-t",
+        "--timeout",
+        type=float,
+        default=60.0,
+        help="Per-request timeout in seconds.",
+    )
+
+    parser.add_argument(
+        "--max_body_mb",
+        type=float,
+        default=256.0,
+        help="Maximum accepted upload size in MB.",
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.workers < 0:
+        parser.error("`--workers` must be a positive integer.")
+
+    server = ConversionServer(
+        host=parsed_args.host,
+        port=parsed_args.port,
+        unix_socket=parsed_args.unix_socket,
+        workers=parsed_args.workers or os.cpu_count() or 1,
+        max_queue=parsed_args.max_queue,
+        timeout=parsed_args.timeout,
+        max_body_size=int(parsed_args.max_body_mb * 1024 * 1024),
+    )
+
+    asyncio.run(server.serve_forever())
+
+    return 0
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openspeleo_lib.memory import MemoryReport
+    from openspeleo_lib.stats import SurveyStats
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Heavy dependencies (pydantic models, ...) are imported on first use to keep
+# `openspeleo` startup fast.
+# ruff: noqa: T201, PLC0415
+
+
+def _print_survey_stats(stats: SurveyStats, *, sections: bool = False) -> None:
+    unit = stats.unit.value.lower()
+
+    print(f"  {'Length':<16s} {stats.length:>12.2f} {unit}")
+    print(f"  {'Plan length':<16s} {stats.plan_length:>12.2f} {unit}")
+    print(f"  {'Excluded length':<16s} {stats.excluded_length:>12.2f} {unit}")
+    if stats.depth_min is not None:
+        print(
+            f"  {'Depth':<16s} {stats.depth_min:>12.2f} -> {stats.depth_max:.2f} "
+            f"{unit} (vertical extent: {stats.vertical_extent:.2f} {unit})"
+        )
+    print(
+        f"  {'Shot types':<16s} "
+        + ", ".join(f"{name}: {count}" for name, count in stats.shot_types.items())
+    )
+
+    print(f"\n  {'Date':<12s} {'Length':>14s}")
+    for date, length in stats.dates.items():
+        label = "undated" if date is None else date.isoformat()
+        print(f"  {label:<12s} {length:>12.2f} {unit}")
+
+    if sections:
+        width = max((len(section.name) for section in stats.sections), default=0)
+        width = max(width, len("Section"))
+        print(
+            f"\n  {'Section':<{width}s} {'Date':<10s} {'Shots':>7s} {'Length':>12s} "
+            f"{'Plan length':>12s}"
+        )
+        for section in stats.sections:
+            date = "-" if section.date is None else section.date.isoformat()
+            print(
+                f"  {section.name:<{width}s} {date:<10s} {section.n_shots:>7d} "
+                f"{section.length:>12.2f} {section.plan_length:>12.2f}"
+            )
+
+
+def _print_memory_report(report: MemoryReport) -> None:
+    total = report.total or 1  # Empty surveys
+
+    print(f"  {'Component':<12s} {'Memory':>12s} {'Share':>8s}")
+    for component, size in report.components.items():
+        print(
+            f"  {component:<12s} {size / 1024.0 / 1024.0:>9.2f} MB "
+            f"{size / total * 100.0:>7.1f}%"
+        )
+    print(f"  {'total':<12s} {report.total / 1024.0 / 1024.0:>9.2f} MB")
+
+    if report.is_sampled:
+        print(f"  Estimated from {report.n_sampled_shots} of {report.n_shots} shots.")
+
+
+def stats(args):
+    from openspeleo_lib.memory import DEFAULT_SAMPLE_SIZE
+
+    parser = argparse.ArgumentParser(
+        prog="stats", description="Print statistics about a survey"
+    )
+
+    parser.add_argument(
+        "input_file",
+        type=pathlib.Path,
+        help="Path to the TML file.",
+    )
+
+    parser.add_argument(
+        "--sections",
+        action="store_true",
+        default=False,
+        help="Print the statistics of each section.",
+    )
+
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        default=False,
+        help="Report the memory used by the loaded survey, per component.",
+    )
+
+    parser.add_argument(
+        "--sample_size",
+        "--sample-size",
+        type=int,
+        default=DEFAULT_SAMPLE_SIZE,
+        help="Number of shots measured by `--memory` (`0` measures all of them).",
+    )
+
+    parser.add_argument(
+        "--lazy_shapes",
+        "--lazy-shapes",
+        action="store_true",
+        default=False,
+        help="Keep the wall shapes as raw XML (see `ArianeInterface`).",
+    )
+
+    parser.add_argument(
+        "--opaque_carto",
+        "--opaque-carto",
+        action="store_true",
+        default=False,
+        help="Keep the Ariane carto blocks as raw XML (see `ArianeInterface`).",
+    )
+
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        default=False,
+        help="Print the statistics as JSON.",
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    if parsed_args.sample_size < 0:
+        parser.error("`--sample_size` must be a positive integer.")
+
+    input_file = parsed_args.input_file
+    if not input_file.exists():
+        raise FileNotFoundError(f"File not found: `{input_file}`")
+
+    from openspeleo_lib.interfaces import ArianeInterface
+
+    survey = ArianeInterface.from_file(
+        input_file,
+        lazy_shapes=parsed_args.lazy_shapes,
+        opaque_carto=parsed_args.opaque_carto,
+    )
+
+    stats = survey.stats()
+    results = {
+        "sections": stats.n_sections,
+        "shots": stats.n_shots,
+        "stats": stats.to_dict(),
+    }
+
+    report = None
+    if parsed_args.memory:
+        report = survey.memory_report(sample_size=parsed_args.sample_size or None)
+        results["memory"] = report.to_dict()
+
+    if parsed_args.json:
+        import orjson
+
+        print(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode())
+        return 0
+
+    print(
+        f"{input_file.name} - {results['sections']} sections - {results['shots']} shots"
+    )
+    _print_survey_stats(stats, sections=parsed_args.sections)
+
+    if report is not None:
+        print()
+        _print_memory_report(report)
+
+    return 0
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import pathlib
+import time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# ruff: noqa: PLC0415
+
+
+def synthetic(args):
+    parser = argparse.ArgumentParser(
+        prog="synthetic", description="Generate a synthetic survey file"
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output_file",
+        type=pathlib.Path,
+        required=True,
+        help="Path to save the survey at. Format: `.tml`, `.json` or `.dat`.",
+    )
+
+    parser.add_argument(
+        "-n",
+        "--shots",
+        type=int,
+        default=1000,
+        help="Number of connected shots to generate.",
+    )
+
+    parser.add_argument(
+        "-s",
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the random generator.",
+    )
+
+    parser.add_argument(
+        "--branching",
+        type=float,
+        default=0.05,
+        help="Probability, at each shot, to start a new passage.",
+    )
+
+    parser.add_argument(
+        "--loop_density",
+        type=float,
+        default=0.01,
+        help="Probability, at each shot, to add a loop closure.",
+    )
+
+    parser.add_argument(
+        "--anchors",
+        type=int,
+        default=1,
+        help="Number of independent networks, each one with a geolocated START.",
+    )
+
+    parser.add_argument(
+        "--section_size",
+        type=int,
+        default=100,
+        help="Maximum number of shots per section.",
+    )
+
+    parser.add_argument(
+        "--no_lrud",
+        action="store_true",
+        help="Do not generate LRUD values.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--orphans",
+        type=int,
+        default=0,
+        help="Number of orphan shots to inject.",
+    )
+
+    parser.add_argument(
+        "--cycles",
+        type=int,
+        default=0,
+        help="Number of isolated cycles to inject.",
+    )
+
+    parser.add_argument(
+        "--unit",
+        type=str,
+        choices=["M", "FT"],
+        default="M",
+        help="Length unit of the survey.",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--overwrite",
+        action="store_true",
+        help="Allow overwrite an already existing file.",
+        default=False,
+    )
+
+    parsed_args = parser.parse_args(args)
+
+    output_file: pathlib.Path = parsed_args.output_file
+
+    if output_file.suffix.lower() not in {".tml", ".json", ".dat"}:
+        parser.error(f"Unsupported file format: `{output_file.suffix}`")
+
+    if output_file.exists() and not parsed_args.overwrite:
+        raise FileExistsError(
+            f"The file `{output_file}` already existing. "
+            "Please pass the flag `--overwrite` to ignore."
+        )
+
+    from openspeleo_lib.enums import LengthUnits
+    from openspeleo_lib.interfaces.ariane.interface import ArianeSurvey
+    from openspeleo_lib.synthetic import generate_survey
+    from openspeleo_lib.synthetic import write_survey
+
+    start_t = time.perf_counter()
+    survey = generate_survey(
+        parsed_args.shots,
+        survey_cls=ArianeSurvey,
+        seed=parsed_args.seed,
+        branching=parsed_args.branching,
+        loop_density=parsed_args.loop_density,
+        anchors=parsed_args.anchors,
+        section_size=parsed_args.section_size,
+        lrud=not parsed_args.no_lrud,
+        orphans=parsed_args.orphans,
+        cycles=parsed_args.cycles,
+        unit=LengthUnits.reverse(parsed_args.unit),
+    )
+    write_survey(survey, output_file)
+
+    logger.info(
+        "Generated `%(output_file)s`: %(shots)d shots in %(sections)d sections "
+        "(%(elapsed).2f secs)",
+        {
+            "output_file": output_file,
+            "shots": sum(len(section.shots) for section in survey.sections),
+            "sections": len(survey.sections),
+            "elapsed": time.perf_counter() - start_t,
+        },
+    )
+
+    return 0
@@ -2,33 +2,204 @@ from __future__ import annotations
 
 import argparse
 import logging
+import os
 import pathlib
-
-from openspeleo_lib.interfaces import ArianeInterface
+import time
+from typing import NamedTuple
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Heavy dependencies (pydantic models, ...) are imported on first use to keep
+# `openspeleo` startup fast.
+# ruff: noqa: T201, PLC0415
+
+
+class ValidationResult(NamedTuple):
+    input_file: pathlib.Path
+    issues: list[str]
+    elapsed: float = 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.issues
+
+
+def validate_file(
+    input_file: pathlib.Path, *, fast: bool = False, max_errors: int | None = None
+) -> list[str]:
+    """Returns the issues found in `input_file`, empty if the file is valid.
+
+    In `fast` mode, the file is only structurally validated (see
+    `validate_tml_fast`) and every issue is reported. Otherwise the survey is
+    fully loaded and the first error is reported.
+    """
+    if fast:
+        from openspeleo_lib.interfaces.ariane.validation import validate_tml_fast
+
+        return [
+            str(issue) for issue in validate_tml_fast(input_file, max_errors=max_errors)
+        ]
+
+    from openspeleo_lib.interfaces import ArianeInterface
+
+    try:
+        _ = ArianeInterface.from_file(input_file)
+    except Exception as e:  # noqa: BLE001
+        return [f"{type(e).__name__}: {e}"]
+
+    return []
+
+
+def _validate_task(
+    input_file: pathlib.Path, fast: bool, max_errors: int | None
+) -> ValidationResult:
+    """Worker entrypoint - never raises so that results can always be pickled."""
+    start_t = time.perf_counter()
+    issues = validate_file(input_file, fast=fast, max_errors=max_errors)
+    return ValidationResult(
+        input_file=input_file, issues=issues, elapsed=time.perf_counter() - start_t
+    )
+
+
+def validate_directory(
+    input_dir: pathlib.Path,
+    *,
+    pattern: str = "*.tml",
+    jobs: int = 1,
+    fast: bool = False,
+    max_errors: int | None = None,
+) -> list[ValidationResult]:
+    """Validates every file of `input_dir` matching `pattern`.
+
+    Files are dispatched to a pool of `jobs` worker processes.
+    """
+    input_files = [f for f in sorted(input_dir.glob(pattern)) if f.is_file()]
+
+    if jobs == 1 or len(input_files) <= 1:
+        return [_validate_task(f, fast, max_errors) for f in input_files]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            executor.submit(_validate_task, f, fast, max_errors) for f in input_files
+        ]
+        return [future.result() for future in futures]
+
+
+def _print_report(results: list[ValidationResult], elapsed: float) -> None:
+    for result in results:
+        status = "VALID" if result.is_valid else "INVALID"
+        print(f"[{status}] {result.input_file} ({result.elapsed:.2f} secs)")
+        for issue in result.issues:
+            print(f"  - {issue}")
+
+    invalid = sum(1 for r in results if not r.is_valid)
+    print(
+        f"Valid: {len(results) - invalid} - Invalid: {invalid} - "
+        f"Total: {len(results)} - Elapsed: {elapsed:.2f} secs"
+    )
+
 
 def validate(args):
     parser = argparse.ArgumentParser(
         prog="validate_tml", description="Validate a TML file"
     )
-    parser.add_argument(
+
+    input_group = parser.add_mutually_exclusive_group(required=True)
+    input_group.add_argument(
         "-i",
         "--input_file",
         type=pathlib.Path,
-        required=True,
         help="Path to the TML file to be validated",
     )
+    input_group.add_argument(
+        "--input_dir",
+        "--input-dir",
+        type=pathlib.Path,
+        help="Directory containing the TML files to validate in batch.",
+    )
+
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        default=False,
+        help=(
+            "Only validate the structure of the file (required fields, value "
+            "ranges, enums, unique IDs) without loading the survey: ~2.5x "
+            "faster (20k shots with walls: 0.9s instead of 2.4s), constant "
+            "memory."
+        ),
+    )
+
+    parser.add_argument(
+        "--max_errors",
+        "--max-errors",
+        type=int,
+        default=None,
+        help="Stop validating a file after this many errors (`--fast` mode).",
+    )
+
+    parser.add_argument(
+        "-g",
+        "--glob",
+        type=str,
+        default="*.tml",
+        help="Glob pattern used to select the input files (batch mode).",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (batch mode). `0` uses all the CPUs.",
+    )
 
     parsed_args = parser.parse_args(args)
 
+    if (max_errors := parsed_args.max_errors) is not None and max_errors <= 0:
+        parser.error("`--max_errors` must be a positive integer.")
+
+    # ============================ BATCH MODE ============================ #
+
+    if (input_dir := parsed_args.input_dir) is not None:
+        if not input_dir.is_dir():
+            raise NotADirectoryError(f"Directory not found: `{input_dir}`")
+
+        if (jobs := parsed_args.jobs) < 0:
+            parser.error("`--jobs` must be a positive integer.")
+
+        start_t = time.perf_counter()
+        results = validate_directory(
+            input_dir,
+            pattern=parsed_args.glob,
+            jobs=jobs or os.cpu_count() or 1,
+            fast=parsed_args.fast,
+            max_errors=max_errors,
+        )
+        _print_report(results, elapsed=time.perf_counter() - start_t)
+
+        return 0 if all(r.is_valid for r in results) else 1
+
+    # ========================= SINGLE FILE MODE ========================= #
+
     input_file = parsed_args.input_file
 
     if not input_file.exists():
         raise FileNotFoundError(f"File not found: `{input_file}`")
 
+    if parsed_args.fast:
+        issues = validate_file(input_file, fast=True, max_errors=max_errors)
+        print(f"Filepath: `{input_file}` ... {'INVALID' if issues else 'VALID'}")
+        for issue in issues:
+            print(f"  - {issue}")
+        return 1 if issues else 0
+
+    from openspeleo_lib.interfaces import ArianeInterface
+
     _ = ArianeInterface.from_file(input_file)
 
     logger.info("Filepath: `%(input_file)s` ... VALID", {"input_file": input_file})
+    return 0
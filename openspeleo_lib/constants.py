@@ -15,3 +15,7 @@ ARIANE_DATA_FILENAME = "Data.xml"
 
 # GEOJSON DIGIT PRECISION
 OSPL_GEOJSON_DIGIT_PRECISION = 7
+
+# Length units
+FEET_TO_METERS = float("0.3048")
+METERS_TO_FEET = float("1.0") / FEET_TO_METERS
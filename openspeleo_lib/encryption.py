@@ -0,0 +1,680 @@
+"""Streaming encryption of the (private) test artifacts.
+
+Files are encrypted with AES-SIV in fixed size segments, following the
+STREAM construction: every segment is authenticated with the file header,
+its index and a "last segment" flag as associated data. Segments can't be
+reordered, dropped or moved to another file, and a truncated file is
+detected, while encryption, decryption and verification only ever hold a
+single segment in memory.
+
+File layout::
+
+    header  := MAGIC (8 bytes) | flags (1 byte) | segment size (uint32 BE)
+               | file nonce (16 bytes)
+    segment := SIV tag (16 bytes) | ciphertext (segment size bytes, the last
+               segment may be shorter)
+
+The plaintext is optionally compressed as XZ before being segmented. With
+`threads > 1`, blocks of the plaintext are compressed in parallel into
+concatenated XZ streams, which any XZ decoder (e.g. `lzma.decompress`) reads
+as a single file.
+
+Files produced before this format (a single AES-SIV message, optionally
+holding a XZ stream) don't start with `MAGIC` and are still decrypted, in
+memory.
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import fnmatch
+import functools
+import hashlib
+import lzma
+import os
+import struct
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+import orjson
+from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from collections.abc import Iterable
+    from concurrent.futures import Future
+    from typing import BinaryIO
+
+MAGIC = b"OSPLENC\x02"
+HEADER_FORMAT = ">8sBI16s"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+FLAG_COMPRESSED = 0x01
+
+SIV_TAG_SIZE = 16
+DEFAULT_SEGMENT_SIZE = 1 << 20  # 1 MB
+MAX_SEGMENT_SIZE = 1 << 28
+
+# XZ format magic bytes: 0xFD + "7zXZ" + 0x00
+XZ_MAGIC_HEADER = b"\xfd7zXZ\x00"
+
+# LZMA with preset 9 + PRESET_EXTREME for best compression ratio
+XZ_DEFAULT_PRESET = 9 | lzma.PRESET_EXTREME
+
+# Size of the blocks compressed in parallel by `encrypt_stream(threads=N)`
+XZ_BLOCK_SIZE = 1 << 24  # 16 MB
+
+READ_CHUNK_SIZE = 1 << 20
+
+
+class DecryptionError(ValueError):
+    pass
+
+
+def load_key(key_str: str) -> bytes:
+    """Decodes a base64 (urlsafe) encoded AES-SIV key."""
+    return base64.urlsafe_b64decode(key_str.encode("ascii"))
+
+
+def _segment_ad(header: bytes, index: int, *, is_last: bool) -> list[bytes]:
+    return [header, struct.pack(">QB", index, is_last)]
+
+
+@contextlib.contextmanager
+def _atomic_output(filepath: Path) -> Generator[BinaryIO]:
+    """Writes to a temporary file, moved to `filepath` only on success."""
+    # Unique per process: several processes may decrypt the same directory.
+    tmp_filepath = filepath.with_name(f".{filepath.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_filepath.open("wb") as f:
+            yield f
+        tmp_filepath.replace(filepath)
+    finally:
+        tmp_filepath.unlink(missing_ok=True)
+
+
+def sha256_file(filepath: str | Path) -> str:
+    """Returns the SHA-256 hex digest of `filepath`, read by chunks."""
+    digest = hashlib.sha256()
+    with Path(filepath).open("rb") as f:
+        for chunk in _iter_chunks(f):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _iter_chunks(stream: BinaryIO, size: int = READ_CHUNK_SIZE) -> Generator[bytes]:
+    while chunk := stream.read(size):
+        yield chunk
+
+
+def is_legacy_format(data: bytes) -> bool:
+    """Returns whether `data` (the beginning of a file) predates `MAGIC`."""
+    return not data.startswith(MAGIC)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ ENCRYPTION ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+def _iter_blocks(chunks: Iterable[bytes], block_size: int) -> Generator[bytes]:
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+def _compress_chunks(
+    chunks: Iterable[bytes],
+    *,
+    preset: int = XZ_DEFAULT_PRESET,
+    threads: int = 1,
+    block_size: int = XZ_BLOCK_SIZE,
+) -> Generator[bytes]:
+    filters = [{"id": lzma.FILTER_LZMA2, "preset": preset}]
+
+    if threads <= 1:
+        compressor = lzma.LZMACompressor(format=lzma.FORMAT_XZ, filters=filters)
+        for chunk in chunks:
+            if data := compressor.compress(chunk):
+                yield data
+        yield compressor.flush()
+        return
+
+    # Blocks are compressed in parallel (`lzma` releases the GIL) as independent
+    # XZ streams: their concatenation is a valid XZ file. At most `2 * threads`
+    # blocks are in flight, which bounds memory usage.
+    from concurrent.futures import ThreadPoolExecutor  # noqa: PLC0415
+
+    compress = functools.partial(lzma.compress, format=lzma.FORMAT_XZ, filters=filters)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending: deque[Future[bytes]] = deque()
+
+        for block in _iter_blocks(chunks, block_size):
+            pending.append(executor.submit(compress, block))
+            if len(pending) >= 2 * threads:
+                yield pending.popleft().result()
+
+        if not pending:
+            pending.append(executor.submit(compress, b""))
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def _decompress_chunks(chunks: Iterable[bytes]) -> Generator[bytes]:
+    """Decompresses a XZ file made of one or more concatenated streams."""
+    decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+    for chunk in chunks:
+        pending = chunk
+        while True:
+            if decompressor.eof:
+                if not (pending := decompressor.unused_data + pending):
+                    break
+                decompressor = lzma.LZMADecompressor(format=lzma.FORMAT_XZ)
+
+            # Bounded output: a highly compressed chunk can't blow up memory.
+            if data := decompressor.decompress(pending, max_length=READ_CHUNK_SIZE):
+                yield data
+            pending = b""
+
+            if decompressor.needs_input and not decompressor.eof:
+                break
+
+    if not decompressor.eof:
+        raise DecryptionError("Truncated compressed stream.")
+
+
+def encrypt_stream(
+    src: BinaryIO,
+    dst: BinaryIO,
+    key: bytes,
+    *,
+    compress: bool = False,
+    preset: int = XZ_DEFAULT_PRESET,
+    threads: int = 1,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+) -> str:
+    """Encrypts `src` into `dst`.
+
+    Args:
+        src: Plaintext binary file object.
+        dst: Binary file object the encrypted file is written to.
+        key: AES-SIV key.
+        compress: Compress the plaintext as XZ before encryption.
+        preset: XZ compression preset (`0-9`, optionally `| PRESET_EXTREME`).
+        threads: Number of blocks compressed in parallel.
+        segment_size: Size of the encrypted segments.
+
+    Returns:
+        The SHA-256 hex digest of the plaintext.
+    """
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise ValueError(f"Invalid segment size: {segment_size}")
+
+    aead = AESSIV(key)
+    digest = hashlib.sha256()
+
+    header = struct.pack(
+        HEADER_FORMAT,
+        MAGIC,
+        FLAG_COMPRESSED if compress else 0,
+        segment_size,
+        os.urandom(16),
+    )
+    dst.write(header)
+
+    def iter_plaintext() -> Generator[bytes]:
+        for chunk in _iter_chunks(src):
+            digest.update(chunk)
+            yield chunk
+
+    chunks = iter_plaintext()
+    if compress:
+        chunks = _compress_chunks(chunks, preset=preset, threads=threads)
+
+    # A full segment is only written once more data is known to follow: the
+    # last segment always holds between 0 and `segment_size` bytes.
+    buffer = bytearray()
+    index = 0
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) > segment_size:
+            segment = bytes(buffer[:segment_size])
+            del buffer[:segment_size]
+            dst.write(aead.encrypt(segment, _segment_ad(header, index, is_last=False)))
+            index += 1
+
+    dst.write(aead.encrypt(bytes(buffer), _segment_ad(header, index, is_last=True)))
+
+    return digest.hexdigest()
+
+
+def encrypt_file(
+    input_file: str | Path,
+    output_file: str | Path,
+    key: bytes,
+    *,
+    compress: bool = False,
+    preset: int = XZ_DEFAULT_PRESET,
+    threads: int = 1,
+    segment_size: int = DEFAULT_SEGMENT_SIZE,
+    verify: bool = True,
+) -> str:
+    """Encrypts `input_file` into `output_file`.
+
+    If `verify` is set, `output_file` is decrypted back (streaming) and
+    checked against the plaintext digest.
+
+    Returns:
+        The SHA-256 hex digest of the plaintext.
+    """
+    output_file = Path(output_file)
+
+    with Path(input_file).open("rb") as src, _atomic_output(output_file) as dst:
+        digest = encrypt_stream(
+            src,
+            dst,
+            key,
+            compress=compress,
+            preset=preset,
+            threads=threads,
+            segment_size=segment_size,
+        )
+
+    if verify:
+        digest_sink = _DigestSink()
+        with output_file.open("rb") as src:
+            decrypt_stream(src, digest_sink, key)
+
+        if digest_sink.hexdigest() != digest:
+            raise DecryptionError(f"Roundtrip verification failed: `{output_file}`")
+
+    return digest
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ DECRYPTION ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+class _DigestSink:
+    """Write-only file object computing the SHA-256 of what is written."""
+
+    def __init__(self) -> None:
+        self._digest = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        return len(data)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _iter_decrypted_segments(
+    src: BinaryIO, aead: AESSIV, header: bytes, segment_size: int
+) -> Generator[bytes]:
+    index = 0
+    block = src.read(segment_size + SIV_TAG_SIZE)
+
+    while True:
+        next_block = src.read(segment_size + SIV_TAG_SIZE)
+        is_last = not next_block
+
+        try:
+            segment = aead.decrypt(block, _segment_ad(header, index, is_last=is_last))
+        except Exception as e:
+            raise DecryptionError(
+                f"Segment #{index} failed authentication: the file is corrupted, "
+                "truncated or the key is invalid."
+            ) from e
+
+        yield segment
+
+        if is_last:
+            return
+
+        block = next_block
+        index += 1
+
+
+def _decrypt_legacy(data: bytes, aead: AESSIV) -> bytes:
+    try:
+        dec_data = aead.decrypt(data, None)
+    except Exception as e:
+        raise DecryptionError(
+            "Decryption failed: the file is corrupted or the key is invalid."
+        ) from e
+
+    # Auto-detect and decompress XZ/LZMA compressed data
+    if dec_data.startswith(XZ_MAGIC_HEADER):
+        dec_data = lzma.decompress(dec_data)
+
+    return dec_data
+
+
+def decrypt_stream(src: BinaryIO, dst: BinaryIO, key: bytes) -> str:
+    """Decrypts `src` into `dst`. Legacy files are detected and supported.
+
+    Returns:
+        The SHA-256 hex digest of the plaintext.
+    """
+    aead = AESSIV(key)
+    digest = hashlib.sha256()
+
+    header = src.read(HEADER_SIZE)
+
+    if is_legacy_format(header):
+        data = _decrypt_legacy(header + src.read(), aead)
+        digest.update(data)
+        dst.write(data)
+        return digest.hexdigest()
+
+    if len(header) < HEADER_SIZE:
+        raise DecryptionError("Truncated file header.")
+
+    _, flags, segment_size, _ = struct.unpack(HEADER_FORMAT, header)
+    if not 0 < segment_size <= MAX_SEGMENT_SIZE:
+        raise DecryptionError(f"Invalid segment size: {segment_size}")
+
+    segments = _iter_decrypted_segments(src, aead, header, segment_size)
+
+    if flags & FLAG_COMPRESSED:
+        segments = _decompress_chunks(segments)
+
+    for data in segments:
+        digest.update(data)
+        dst.write(data)
+
+    return digest.hexdigest()
+
+
+def decrypt_file(input_file: str | Path, output_file: str | Path, key: bytes) -> str:
+    """Decrypts `input_file` into `output_file`.
+
+    `output_file` is only written once the whole file has been authenticated.
+
+    Returns:
+        The SHA-256 hex digest of the plaintext.
+    """
+    with Path(input_file).open("rb") as src, _atomic_output(Path(output_file)) as dst:
+        return decrypt_stream(src, dst, key)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ DIRECTORIES ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+#
+# Each directory holds a `manifest.json` with, for every encrypted file, the
+# SHA-256 of its plaintext and of its ciphertext:
+#
+#     {"version": 1, "files": {"project.tml": {"plaintext": ..., "ciphertext": ...}}}
+#
+# Encryption isn't deterministic (random file nonce): unchanged plaintexts are
+# not re-encrypted, and ciphertexts matching the manifest aren't decrypted again
+# if the plaintext is up to date.
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+ENCRYPTED_SUFFIX = ".encrypted"
+
+
+class CryptoResult(NamedTuple):
+    input_file: Path
+    output_file: Path
+    status: str  # "encrypted", "decrypted", "skipped" or "failed"
+    plaintext_sha256: str | None = None
+    ciphertext_sha256: str | None = None
+    error: str | None = None
+
+
+def load_manifest(directory: Path) -> dict[str, dict[str, str]]:
+    """Returns the `{filename: {"plaintext": ..., "ciphertext": ...}}` entries."""
+    if not (manifest_f := directory / MANIFEST_FILENAME).exists():
+        return {}
+
+    manifest = orjson.loads(manifest_f.read_bytes())
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported manifest version: `{manifest.get('version')}` "
+            f"in `{manifest_f}`"
+        )
+    return manifest["files"]
+
+
+def save_manifest(directory: Path, entries: dict[str, dict[str, str]]) -> None:
+    with _atomic_output(directory / MANIFEST_FILENAME) as f:
+        f.write(
+            orjson.dumps(
+                {"version": MANIFEST_VERSION, "files": entries},
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS,
+            )
+        )
+
+
+def _iter_matching_files(directory: Path, patterns: Iterable[str]) -> list[Path]:
+    # Case insensitive, like the former `shopt -s nocaseglob` Makefile loops.
+    patterns = [pattern.lower() for pattern in patterns]
+    return [
+        filepath
+        for filepath in sorted(directory.iterdir())
+        if filepath.is_file()
+        and filepath.name != MANIFEST_FILENAME
+        and not filepath.name.endswith(ENCRYPTED_SUFFIX)
+        and any(fnmatch.fnmatch(filepath.name.lower(), p) for p in patterns)
+    ]
+
+
+def _run_tasks(
+    task: Callable[..., CryptoResult], tasks: list[dict[str, Any]], jobs: int
+) -> list[CryptoResult]:
+    if jobs == 1 or len(tasks) <= 1:
+        return [task(**kwargs) for kwargs in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(task, **kwargs) for kwargs in tasks]
+        return [future.result() for future in futures]
+
+
+def _encrypt_task(
+    *,
+    input_file: Path,
+    output_file: Path,
+    key: bytes,
+    compress: bool,
+    preset: int,
+    threads: int,
+    plaintext_sha256: str,
+) -> CryptoResult:
+    """Worker entrypoint - never raises so that results can always be pickled."""
+    try:
+        encrypt_file(
+            input_file,
+            output_file,
+            key,
+            compress=compress,
+            preset=preset,
+            threads=threads,
+        )
+        return CryptoResult(
+            input_file=input_file,
+            output_file=output_file,
+            status="encrypted",
+            plaintext_sha256=plaintext_sha256,
+            ciphertext_sha256=sha256_file(output_file),
+        )
+    except Exception as e:  # noqa: BLE001
+        return CryptoResult(
+            input_file=input_file,
+            output_file=output_file,
+            status="failed",
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def encrypt_directory(
+    directory: Path,
+    key: bytes,
+    *,
+    patterns: Iterable[str] = ("*",),
+    compress: bool = False,
+    preset: int = XZ_DEFAULT_PRESET,
+    jobs: int = 1,
+    threads: int = 1,
+    overwrite: bool = False,
+) -> list[CryptoResult]:
+    """Encrypts the files of `directory` matching `patterns` to `*.encrypted`.
+
+    Files whose plaintext and ciphertext match `manifest.json` are skipped
+    unless `overwrite` is set. Files are encrypted by a pool of `jobs` worker
+    processes, each compressing `threads` blocks of its file in parallel (see
+    `encrypt_stream`), then the manifest is updated.
+    """
+    manifest = load_manifest(directory)
+    results: list[CryptoResult] = []
+    tasks: list[dict[str, Any]] = []
+
+    for input_file in _iter_matching_files(directory, patterns):
+        output_file = input_file.with_name(input_file.name + ENCRYPTED_SUFFIX)
+        plaintext_sha256 = sha256_file(input_file)
+
+        if (
+            not overwrite
+            and (entry := manifest.get(input_file.name)) is not None
+            and entry["plaintext"] == plaintext_sha256
+            and output_file.exists()
+            and sha256_file(output_file) == entry["ciphertext"]
+        ):
+            results.append(
+                CryptoResult(
+                    input_file=input_file,
+                    output_file=output_file,
+                    status="skipped",
+                    plaintext_sha256=entry["plaintext"],
+                    ciphertext_sha256=entry["ciphertext"],
+                )
+            )
+            continue
+
+        tasks.append(
+            {
+                "input_file": input_file,
+                "output_file": output_file,
+                "key": key,
+                "compress": compress,
+                "preset": preset,
+                "threads": threads,
+                "plaintext_sha256": plaintext_sha256,
+            }
+        )
+
+    results.extend(_run_tasks(_encrypt_task, tasks, jobs=jobs))
+
+    for result in results:
+        if result.status != "failed":
+            manifest[result.input_file.name] = {
+                "plaintext": result.plaintext_sha256,
+                "ciphertext": result.ciphertext_sha256,
+            }
+
+    # Entries of deleted encrypted files are dropped.
+    save_manifest(
+        directory,
+        {
+            name: entry
+            for name, entry in manifest.items()
+            if (directory / (name + ENCRYPTED_SUFFIX)).exists()
+        },
+    )
+
+    return sorted(results, key=lambda result: result.input_file)
+
+
+def _decrypt_task(
+    *,
+    input_file: Path,
+    output_file: Path,
+    key: bytes,
+    expected_sha256: str | None,
+) -> CryptoResult:
+    """Worker entrypoint - never raises so that results can always be pickled."""
+    try:
+        plaintext_sha256 = decrypt_file(input_file, output_file, key)
+        if expected_sha256 is not None and plaintext_sha256 != expected_sha256:
+            raise DecryptionError(  # noqa: TRY301
+                f"The plaintext digest doesn't match `{MANIFEST_FILENAME}`."
+            )
+
+        return CryptoResult(
+            input_file=input_file,
+            output_file=output_file,
+            status="decrypted",
+            plaintext_sha256=plaintext_sha256,
+        )
+    except Exception as e:  # noqa: BLE001
+        return CryptoResult(
+            input_file=input_file,
+            output_file=output_file,
+            status="failed",
+            error=f"{type(e).__name__}: {e}",
+        )
+
+
+def decrypt_directory(
+    directory: Path, key: bytes, *, jobs: int = 1, overwrite: bool = False
+) -> list[CryptoResult]:
+    """Decrypts the `*.encrypted` files of `directory` next to them.
+
+    A file is skipped when its ciphertext matches `manifest.json` and its
+    plaintext is already up to date, unless `overwrite` is set. Decrypted
+    plaintexts are checked against the manifest.
+    """
+    manifest = load_manifest(directory)
+    results: list[CryptoResult] = []
+    tasks: list[dict[str, Any]] = []
+
+    for input_file in sorted(directory.glob(f"*{ENCRYPTED_SUFFIX}")):
+        output_file = input_file.with_suffix("")
+
+        expected_sha256 = None
+        if (entry := manifest.get(output_file.name)) is not None and (
+            sha256_file(input_file) == entry["ciphertext"]
+        ):
+            expected_sha256 = entry["plaintext"]
+
+            if (
+                not overwrite
+                and output_file.exists()
+                and sha256_file(output_file) == expected_sha256
+            ):
+                results.append(
+                    CryptoResult(
+                        input_file=input_file,
+                        output_file=output_file,
+                        status="skipped",
+                        plaintext_sha256=entry["plaintext"],
+                        ciphertext_sha256=entry["ciphertext"],
+                    )
+                )
+                continue
+
+        tasks.append(
+            {
+                "input_file": input_file,
+                "output_file": output_file,
+                "key": key,
+                "expected_sha256": expected_sha256,
+            }
+        )
+
+    results.extend(_run_tasks(_decrypt_task, tasks, jobs=jobs))
+
+    return sorted(results, key=lambda result: result.input_file)
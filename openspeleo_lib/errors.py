@@ -11,3 +11,7 @@ class MaxRetriesError(RuntimeError):
 
 class EmptySurveyError(ValueError):
     pass
+
+
+class DetachedModelError(ValueError):
+    pass
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from collections import deque
+from functools import cache
 from itertools import count
 from typing import TYPE_CHECKING
 
@@ -10,23 +11,48 @@ from geojson import Feature
 from geojson import FeatureCollection
 from geojson import LineString
 from geojson import Point
-from pyproj import Geod
 
+from openspeleo_lib import instrumentation
+from openspeleo_lib.constants import FEET_TO_METERS
+from openspeleo_lib.constants import METERS_TO_FEET
 from openspeleo_lib.constants import OSPL_GEOJSON_DIGIT_PRECISION
 from openspeleo_lib.enums import ArianeShotType
 from openspeleo_lib.enums import LengthUnits
 
 if TYPE_CHECKING:
+    from collections.abc import Generator
+    from collections.abc import Mapping
+    from collections.abc import Sequence
+    from collections.abc import Set as AbstractSet
+
+    from pyproj import Geod
+
     from openspeleo_lib.models import Section
     from openspeleo_lib.models import Shot
     from openspeleo_lib.models import Survey
 
 logger = logging.getLogger(__name__)
 
-# clrk66 WGS84
-GEOD = Geod(ellps="WGS84")
-FEET_TO_METERS = float("0.3048")
-METERS_TO_FEET = float("1.0") / FEET_TO_METERS
+
+@cache
+def get_geod() -> Geod:
+    """Returns the WGS84 `Geod` used for position propagation.
+
+    `pyproj` is slow to import, it is only loaded the first time a position
+    actually needs to be propagated.
+    """
+    from pyproj import Geod  # noqa: PLC0415
+
+    # clrk66 WGS84
+    return Geod(ellps="WGS84")
+
+
+def __getattr__(name: str):
+    # Backward compatibility: `GEOD` used to be built at import time.
+    if name == "GEOD":
+        return get_geod()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class DisconnectedShotError(Exception):
@@ -74,7 +100,7 @@ def normalize_depth(depth: float, unit: LengthUnits) -> float:
 def propagate_position(
     base_lat: float, base_lon: float, length_m: float, azimuth_deg: float
 ) -> tuple[float, float]:
-    longitude, latitude, _ = GEOD.fwd(
+    longitude, latitude, _ = get_geod().fwd(
         base_lon, base_lat, azimuth_deg, length_m, return_back_azimuth=False
     )
     return latitude, longitude
@@ -93,17 +119,14 @@ def build_shot_graph(sections: list[Section]) -> dict[int, list[int]]:
     return graph
 
 
-def build_shots_map(survey: Survey) -> dict[int, Shot]:
-    shots = {}
-    for shot in survey.shots:
-        if shot.shot_type == ArianeShotType.CLOSURE:
-            continue
-        shots[shot.id_stop] = shot
+def build_shots_map(survey: Survey) -> Mapping[int, Shot]:
+    """Shot of each station, closure shots excluded (see `Survey.shot_by_id`)."""
+    return survey.shot_by_id
 
-    return shots
 
+@instrumentation.timed("geojson.find_valid_shot_ids")
 def find_valid_shot_ids(
-    shots_map: dict[int, Shot], graph: dict[int, list[int]]
+    shots_map: Mapping[int, Shot], graph: Mapping[int, Sequence[int]]
 ) -> set[int]:
     """Find all shot IDs reachable from anchor points.
 
@@ -144,6 +167,7 @@ def find_valid_shot_ids(
 
     # Identify invalid shots and classify them
     invalid_ids = set(shots_map.keys()) - visited
+    instrumentation.incr("geojson.invalid_shots", len(invalid_ids))
     if invalid_ids:
         orphans, cycles = _classify_invalid_shots(invalid_ids, shots_map)
 
@@ -185,9 +209,8 @@ def find_valid_shot_ids(
     return visited
 
 
-
 def _classify_invalid_shots(
-    invalid_ids: set[int], shots_map: dict[int, Shot]
+    invalid_ids: set[int], shots_map: Mapping[int, Shot]
 ) -> tuple[set[int], set[int]]:
     """Classify invalid shots as either orphans or cycle members.
 
@@ -239,8 +262,9 @@ def _classify_invalid_shots(
     return orphans, cycles
 
 
-def propagate_coordinates(survey: Survey, shots_map: dict[int, Shot]) -> None:
-    graph = build_shot_graph(survey.sections)
+@instrumentation.timed("geojson.propagate_coordinates")
+def propagate_coordinates(survey: Survey, shots_map: Mapping[int, Shot]) -> None:
+    graph = survey.children_of
 
     anchors = [s for s in shots_map.values() if s.is_geolocation_known()]
     logging.info("Found %d anchor shots with known coordinates.", len(anchors))
@@ -261,9 +285,13 @@ def propagate_coordinates(survey: Survey, shots_map: dict[int, Shot]) -> None:
             )
 
     queue = deque(a.id_stop for a in anchors)
+    queued = set(queue)  # `visited` is a subset: shots are queued only once
     visited = set()
+    geod_calls = 0
 
-    max_iterations = 1e6  # ridiculously high for any realistic survey
+    # ridiculously high for any realistic survey - but synthetic surveys may be
+    # way bigger: each shot is queued at most once.
+    max_iterations = max(1e6, 2 * len(shots_map))
     iteration_count = count(0)
     while queue:
         if next(iteration_count) > max_iterations:
@@ -288,7 +316,7 @@ def propagate_coordinates(survey: Survey, shots_map: dict[int, Shot]) -> None:
         )
 
         for child_id in graph.get(current_id, []):
-            if child_id in visited or child_id in queue:
+            if child_id in queued:
                 continue
 
             child_shot = shots_map[child_id]
@@ -313,12 +341,18 @@ def propagate_coordinates(survey: Survey, shots_map: dict[int, Shot]) -> None:
                 unit=survey.unit,
             )
 
-            child_shot.latitude, child_shot.longitude = propagate_position(
+            latitude, longitude = propagate_position(
                 base_lat=current_shot.latitude,
                 base_lon=current_shot.longitude,
                 length_m=length_m,
                 azimuth_deg=child_shot.azimuth_true,
             )
+            # Written without change tracking: the propagated coordinates are
+            # derived data, they must neither invalidate the caches of the
+            # survey (e.g. `Survey.geo_anchor`, read by `azimuth_true`) nor
+            # move the anchor while propagating.
+            child_shot.__dict__.update(latitude=latitude, longitude=longitude)
+            geod_calls += 1
 
             logger.debug(
                 "Propagated ID=%04d: lat=%.7f lon=%.7f from=%04d",
@@ -329,10 +363,13 @@ def propagate_coordinates(survey: Survey, shots_map: dict[int, Shot]) -> None:
             )
 
             queue.append(child_id)
+            queued.add(child_id)
+
+    instrumentation.incr("geojson.geod_calls", geod_calls)
 
 
 def shot_to_geojson_feature(
-    shot: Shot, shots_dict: dict[int, Shot], name: str, unit: LengthUnits
+    shot: Shot, shots_dict: Mapping[int, Shot], name: str, unit: LengthUnits
 ) -> dict | None:
     props = {
         "id": shot.id_stop,
@@ -386,24 +423,58 @@ def shot_to_geojson_feature(
     )
 
 
-def survey_to_geojson(survey: Survey) -> dict:
-    shots_map: dict[int, Shot] = build_shots_map(survey)
-    graph = build_shot_graph(survey.sections)
+def propagate_survey(survey: Survey) -> tuple[Mapping[int, Shot], frozenset[int]]:
+    """Propagates coordinates to every shot reachable from an anchor.
+
+    The result is cached on the survey until it is modified (see
+    `Survey.derived`): exporting an unchanged survey twice propagates once.
+
+    Returns:
+        Tuple of (shots_map, valid_shot_ids)
+    """
+    return survey.derived("geojson.propagation", lambda: _propagate_survey(survey))
+
+
+def _propagate_survey(survey: Survey) -> tuple[Mapping[int, Shot], frozenset[int]]:
+    shots_map = survey.shot_by_id
 
     # Find valid shots (reachable from anchors, excluding orphans and cycles)
-    valid_shot_ids = find_valid_shot_ids(shots_map, graph)
+    valid_shot_ids = find_valid_shot_ids(shots_map, survey.children_of)
 
     logger.debug("Starting coordinate propagation ...")
     propagate_coordinates(survey, shots_map)
 
-    features = [
-        shot_to_geojson_feature(shot, shots_map, section.name, survey.unit)
-        for section in survey.sections
-        for shot in section.shots
-        if shot.shot_type in [ArianeShotType.REAL, ArianeShotType.START]
-        # if shot.shot_type != ArianeShotType.CLOSURE
-        if not shot.excluded
-        if shot.id_stop in valid_shot_ids  # Filter out orphans and cycles
-    ]
+    return shots_map, frozenset(valid_shot_ids)
+
+
+def iter_features(
+    survey: Survey, shots_map: Mapping[int, Shot], valid_shot_ids: AbstractSet[int]
+) -> Generator[Feature]:
+    """Yields the GeoJSON features one by one (see `build_feature_collection`)."""
+    for section in survey.sections:
+        for shot in section.shots:
+            if (
+                shot.shot_type in [ArianeShotType.REAL, ArianeShotType.START]
+                # if shot.shot_type != ArianeShotType.CLOSURE
+                and not shot.excluded
+                and shot.id_stop in valid_shot_ids  # Filter out orphans and cycles
+            ):
+                yield shot_to_geojson_feature(
+                    shot, shots_map, section.name, survey.unit
+                )
+
+
+@instrumentation.timed("geojson.build_feature_collection")
+def build_feature_collection(
+    survey: Survey, shots_map: Mapping[int, Shot], valid_shot_ids: AbstractSet[int]
+) -> dict:
+    features = list(iter_features(survey, shots_map, valid_shot_ids))
 
+    instrumentation.incr("geojson.features", len(features))
     return FeatureCollection(features=features)
+
+
+@instrumentation.timed("geojson.survey_to_geojson")
+def survey_to_geojson(survey: Survey) -> dict:
+    shots_map, valid_shot_ids = propagate_survey(survey)
+    return build_feature_collection(survey, shots_map, valid_shot_ids)
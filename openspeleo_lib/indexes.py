@@ -0,0 +1,83 @@
+"""Lookup tables of a survey (see `Survey.shot_by_id` and co).
+
+`SurveyIndexes` is an immutable snapshot built in a single pass over the shots.
+`Survey` builds it on first use and rebuilds it once the survey topology
+changes (see `Survey.topology_version`).
+"""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
+from openspeleo_lib.enums import ArianeShotType
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from openspeleo_lib.models import Section
+    from openspeleo_lib.models import Shot
+    from openspeleo_lib.models import Survey
+
+
+class SurveyIndexes:
+    """Lookup tables of a survey.
+
+    Closure shots only close a loop onto existing stations: like
+    `geojson.build_shots_map`, they are left out of `shot_by_id` and
+    `children_of`.
+
+    Attributes:
+        shot_by_id: Shot of each station (`id_stop`).
+        shots_by_name: Shots of each name (names aren't unique).
+        section_by_name: First section of each name.
+        children_of: Stations (`id_stop`) surveyed from each station.
+    """
+
+    __slots__ = (
+        "children_of",
+        "key",
+        "section_by_name",
+        "shot_by_id",
+        "shots_by_name",
+    )
+
+    def __init__(self, survey: Survey) -> None:
+        self.key = survey.topology_version
+
+        shot_by_id: dict[int, Shot] = {}
+        shots_by_name: dict[str, list[Shot]] = {}
+        section_by_name: dict[str, Section] = {}
+        children_of: dict[int, list[int]] = {}
+
+        for section in survey.sections:
+            section_by_name.setdefault(section.name, section)
+
+            for shot in section.shots:
+                if shot.name is not None:
+                    shots_by_name.setdefault(shot.name, []).append(shot)
+
+                if shot.shot_type == ArianeShotType.CLOSURE:
+                    continue
+
+                shot_by_id[shot.id_stop] = shot
+                if shot.id_start != -1:
+                    children_of.setdefault(shot.id_start, []).append(shot.id_stop)
+
+        # Read-only views: the tables are shared by every caller.
+        self.shot_by_id: Mapping[int, Shot] = MappingProxyType(shot_by_id)
+        self.shots_by_name: Mapping[str, tuple[Shot, ...]] = MappingProxyType(
+            {name: tuple(shots) for name, shots in shots_by_name.items()}
+        )
+        self.section_by_name: Mapping[str, Section] = MappingProxyType(section_by_name)
+        self.children_of: Mapping[int, tuple[int, ...]] = MappingProxyType(
+            {shot_id: tuple(ids) for shot_id, ids in children_of.items()}
+        )
+
+    # The tables reference the shots of their survey: copies (`deepcopy`,
+    # `pickle`) of a survey drop them and build their own when needed.
+    def __deepcopy__(self, memo: dict) -> None:
+        return None
+
+    def __reduce__(self) -> tuple:
+        return type(None), ()
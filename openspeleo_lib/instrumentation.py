@@ -0,0 +1,359 @@
+"""Lightweight span timers and counters for the load / export pipeline.
+
+Instrumentation is disabled until a listener is registered: `span()` then
+returns a shared no-op context manager and `incr()` returns immediately, so
+instrumented code pays a single function call per stage.
+
+Example:
+    >>> from openspeleo_lib import instrumentation
+    >>> with instrumentation.collect() as collector:
+    ...     survey = ArianeInterface.from_file("project.tml")
+    >>> collector.spans["interface.from_file"].total
+    0.0123
+    >>> collector.counters["ariane.shots_decoded"]
+    20161
+
+Services forward the measurements to their own metrics system by
+registering an `InstrumentationListener` with `add_listener()`.
+
+Spans can also be recorded in the Chrome trace-event format, to be inspected
+in Perfetto (https://ui.perfetto.dev) or `chrome://tracing`, either with the
+`trace_to()` context manager or by setting `OPENSPELEO_TRACE=trace.json`.
+With `OPENSPELEO_TRACE=trace-{pid}.json`, forked processes (e.g. the workers
+of a `multiprocessing` pool) each write their own trace as well.
+
+Note: listeners are per process. Work dispatched to worker processes is only
+observed by listeners registered in those workers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import ParamSpec
+from typing import TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Generator
+    from typing import Self
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Registered listeners. The tuple is replaced (never mutated) so that it can be
+# iterated without locking.
+_listeners: tuple[InstrumentationListener, ...] = ()
+_lock = threading.Lock()
+
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class InstrumentationListener:
+    """Receives the measurements of the pipeline.
+
+    Subclasses override the hooks they're interested in. Hooks are called
+    synchronously from the instrumented code and must be fast.
+    """
+
+    def on_span(
+        self, name: str, start_ns: int, duration_ns: int, attrs: dict[str, Any]
+    ) -> None:
+        """Called when a span ends. `start_ns` is a `time.perf_counter_ns()`."""
+
+    def on_counter(self, name: str, value: int) -> None:
+        """Called when a counter is incremented by `value`."""
+
+
+class _Span:
+    __slots__ = ("attrs", "name", "start_ns")
+
+    def __init__(self, name: str, attrs: dict[str, Any]) -> None:
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+
+    def __enter__(self) -> Self:
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        for listener in _listeners:
+            listener.on_span(self.name, self.start_ns, duration_ns, self.attrs)
+
+
+def is_enabled() -> bool:
+    """Returns whether at least one listener is registered."""
+    return bool(_listeners)
+
+
+def span(name: str, **attrs: Any) -> contextlib.AbstractContextManager:
+    """Times the enclosed block and reports it as `name` to the listeners."""
+    if not _listeners:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator reporting each call of the decorated function as a span."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if not _listeners:
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def incr(name: str, value: int = 1) -> None:
+    """Increments the counter `name` by `value`."""
+    if not _listeners:
+        return
+    for listener in _listeners:
+        listener.on_counter(name, value)
+
+
+def add_listener(listener: InstrumentationListener) -> None:
+    global _listeners  # noqa: PLW0603
+    with _lock:
+        _listeners = (*_listeners, listener)
+
+
+def remove_listener(listener: InstrumentationListener) -> None:
+    global _listeners  # noqa: PLW0603
+    with _lock:
+        _listeners = tuple(item for item in _listeners if item is not listener)
+
+
+@contextlib.contextmanager
+def listening(
+    listener: InstrumentationListener,
+) -> Generator[InstrumentationListener]:
+    """Registers `listener` for the duration of the `with` block."""
+    add_listener(listener)
+    try:
+        yield listener
+    finally:
+        remove_listener(listener)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ COLLECTOR ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+class SpanStats:
+    """Aggregated durations (in seconds) of every occurrence of a span."""
+
+    __slots__ = ("count", "max", "min", "total")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total += duration
+        self.min = min(self.min, duration)
+        self.max = max(self.max, duration)
+
+    def to_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+class Collector(InstrumentationListener):
+    """Aggregates spans and counters in memory."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.spans: dict[str, SpanStats] = {}
+        self.counters: dict[str, int] = {}
+
+    def on_span(
+        self, name: str, start_ns: int, duration_ns: int, attrs: dict[str, Any]
+    ) -> None:
+        with self._lock:
+            if (stats := self.spans.get(name)) is None:
+                stats = self.spans[name] = SpanStats()
+            stats.add(duration_ns / 1e9)
+
+    def on_counter(self, name: str, value: int) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.counters.clear()
+
+    def snapshot(self) -> dict[str, dict]:
+        """Returns a JSON serializable copy of the measurements."""
+        with self._lock:
+            return {
+                "spans": {name: stats.to_dict() for name, stats in self.spans.items()},
+                "counters": dict(self.counters),
+            }
+
+
+@contextlib.contextmanager
+def collect() -> Generator[Collector]:
+    """Collects the measurements of the enclosed block."""
+    with listening(Collector()) as collector:
+        yield collector
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ CHROME TRACING ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+TRACE_ENV_VAR = "OPENSPELEO_TRACE"
+TRACE_BUFFER_ENV_VAR = "OPENSPELEO_TRACE_BUFFER"
+TRACE_DEFAULT_MAX_EVENTS = 100_000
+
+
+class TraceRecorder(InstrumentationListener):
+    """Records spans and counters as Chrome trace events.
+
+    Events are kept in a ring buffer of `max_events`: on long running jobs,
+    only the most recent events are kept and memory usage stays bounded.
+    """
+
+    def __init__(self, max_events: int = TRACE_DEFAULT_MAX_EVENTS) -> None:
+        self.events: deque[dict[str, Any]] = deque(maxlen=max_events)
+        self._counters: dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def on_span(
+        self, name: str, start_ns: int, duration_ns: int, attrs: dict[str, Any]
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": name.partition(".")[0],
+            "ph": "X",
+            "ts": start_ns / 1e3,
+            "dur": duration_ns / 1e3,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if attrs:
+            event["args"] = {key: str(value) for key, value in attrs.items()}
+        self.events.append(event)
+
+    def on_counter(self, name: str, value: int) -> None:
+        # Counters are reported cumulatively to be plotted as a track.
+        total = self._counters[name] = self._counters.get(name, 0) + value
+        self.events.append(
+            {
+                "name": name,
+                "cat": name.partition(".")[0],
+                "ph": "C",
+                "ts": time.perf_counter_ns() / 1e3,
+                "pid": self._pid,
+                "args": {"value": total},
+            }
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        metadata = {
+            "name": "process_name",
+            "ph": "M",
+            "pid": self._pid,
+            "args": {"name": "openspeleo"},
+        }
+        return {
+            "traceEvents": [metadata, *self.events],
+            "displayTimeUnit": "ms",
+        }
+
+    def save(self, filepath: str | Path) -> None:
+        import orjson  # noqa: PLC0415
+
+        Path(filepath).write_bytes(orjson.dumps(self.to_dict()))
+
+
+@contextlib.contextmanager
+def trace_to(
+    filepath: str | Path, max_events: int = TRACE_DEFAULT_MAX_EVENTS
+) -> Generator[TraceRecorder]:
+    """Records the spans of the enclosed block into a Chrome trace file."""
+    recorder = TraceRecorder(max_events=max_events)
+    try:
+        with listening(recorder):
+            yield recorder
+    finally:
+        recorder.save(filepath)
+
+
+# Recorder set up from `OPENSPELEO_TRACE`, with the file it is saved to.
+_env_trace: tuple[TraceRecorder, str] | None = None
+
+
+def _trace_from_env() -> None:
+    global _env_trace  # noqa: PLW0603
+    if not (filepath := os.environ.get(TRACE_ENV_VAR)):
+        return
+
+    # `{pid}` allows each process of a worker pool to write its own trace.
+    filepath = filepath.replace("{pid}", str(os.getpid()))
+    max_events = int(
+        os.environ.get(TRACE_BUFFER_ENV_VAR, "") or TRACE_DEFAULT_MAX_EVENTS
+    )
+
+    recorder = TraceRecorder(max_events=max_events)
+    add_listener(recorder)
+    _env_trace = (recorder, filepath)
+
+
+def _save_env_trace() -> None:
+    global _env_trace
+    if _env_trace is not None:
+        (recorder, filepath), _env_trace = _env_trace, None
+        recorder.save(filepath)
+
+
+def _trace_after_fork() -> None:
+    """Forked processes record their own trace when the file name contains
+    `{pid}`, and none otherwise (the file of the parent is left alone)."""
+    global _env_trace  # noqa: PLW0603
+    if _env_trace is not None:
+        remove_listener(_env_trace[0])
+        _env_trace = None
+
+    if "{pid}" in os.environ.get(TRACE_ENV_VAR, ""):
+        _trace_from_env()
+
+
+def _finalize_env_trace(_: object) -> None:
+    # `multiprocessing` workers exit with `os._exit()`, skipping `atexit`: the
+    # trace is saved by the exit handler of `multiprocessing` instead.
+    from multiprocessing.util import Finalize  # noqa: PLC0415
+
+    Finalize(None, _save_env_trace, exitpriority=0)
+
+
+if os.environ.get(TRACE_ENV_VAR):
+    from multiprocessing.util import register_after_fork
+
+    _trace_from_env()
+    atexit.register(_save_env_trace)
+    os.register_at_fork(after_in_child=_trace_after_fork)
+    # Called in `multiprocessing` children, once its finalizers were reset.
+    register_after_fork(_save_env_trace, _finalize_env_trace)
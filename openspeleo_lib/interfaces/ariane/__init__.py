@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from openspeleo_lib.interfaces.ariane.interface import ArianeInterface
+
+__all__ = ["ArianeInterface"]
+
+
+def __getattr__(name: str):
+    # Imported on first access: the models (pydantic, ...) aren't needed by the
+    # other modules of the package (e.g. `validate_tml_fast`).
+    if name == "ArianeInterface":
+        from openspeleo_lib.interfaces.ariane.interface import ArianeInterface  # noqa: PLC0415
+
+        return ArianeInterface
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
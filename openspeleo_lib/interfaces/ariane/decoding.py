@@ -7,14 +7,20 @@ from pathlib import Path
 from typing import Any
 from xml.parsers.expat import ExpatError
 
+from openspeleo_lib import instrumentation
 from openspeleo_lib.debug_utils import write_debugdata_to_disk
 from openspeleo_lib.enums import LengthUnits
 from openspeleo_lib.errors import EmptySurveyError
 from openspeleo_lib.interfaces.ariane.xml_utils import deserialize_xmlfield_to_dict
+from openspeleo_lib.interning import StringPool
 
 logger = logging.getLogger(__name__)
 DEBUG = False
 
+# Shot values kept as strings by the models, repeated across the survey.
+INTERNED_SHOT_FIELDS = ("Color", "Comment")
+SHAPE_FIELD = "Shape"
+
 
 @lru_cache(maxsize=128)
 def get_section_key(
@@ -30,6 +36,7 @@ def get_section_key(
     return hash(f"{name}∎{description}∎{date}∎{explorers}∎{surveyors}")
 
 
+@instrumentation.timed("ariane.decode")
 def ariane_decode(data: dict) -> dict:  # noqa: PLR0915
     # ===================== DICT FORMATTING TO OSPL ===================== #
 
@@ -53,6 +60,10 @@ def ariane_decode(data: dict) -> dict:  # noqa: PLR0915
 
     # 3. Sort `SurveyData` into `sections`
     sections: dict[tuple[str, str], dict[str, Any]] = {}
+    cache_hits = get_section_key.cache_info().hits
+
+    # Equal strings share a single object (see `interning`)
+    pool = StringPool()
 
     try:
         shots = data.pop("Data")["SurveyData"]
@@ -62,6 +73,13 @@ def ariane_decode(data: dict) -> dict:  # noqa: PLR0915
     for shot in shots:
         shot: dict[str, Any]
 
+        for key in INTERNED_SHOT_FIELDS:
+            if type(value := shot.get(key)) is str:
+                shot[key] = pool.intern(value)
+
+        if (shape := shot.get(SHAPE_FIELD)) is not None:
+            shot[SHAPE_FIELD] = pool.intern_tree(shape)
+
         # Separate SurveyData into sections
         try:
             name = shot.pop("Section", "")
@@ -122,10 +140,14 @@ def ariane_decode(data: dict) -> dict:  # noqa: PLR0915
             if section_key not in sections:
                 sections[section_key] = {
                     "name": name,
-                    "description": description,
+                    "description": pool.intern(description),
                     "date": section_date,
-                    "explorers": [val.strip() for val in section_explorers.split(",")],
-                    "surveyors": [val.strip() for val in section_surveyors.split(",")],
+                    "explorers": pool.intern_list(
+                        [val.strip() for val in section_explorers.split(",")]
+                    ),
+                    "surveyors": pool.intern_list(
+                        [val.strip() for val in section_surveyors.split(",")]
+                    ),
                     "shots": [],
                 }
 
@@ -140,6 +162,14 @@ def ariane_decode(data: dict) -> dict:  # noqa: PLR0915
 
     data["sections"] = list(sections.values())
 
+    instrumentation.incr("ariane.shots_decoded", len(shots))
+    instrumentation.incr("ariane.sections_created", len(sections))
+    instrumentation.incr("ariane.interned_strings", len(pool))
+    instrumentation.incr(
+        "ariane.section_key_cache_hits",
+        get_section_key.cache_info().hits - cache_hits,
+    )
+
     if DEBUG:
         write_debugdata_to_disk(data, Path("data.import.step02-sections.json"))
 
@@ -4,6 +4,7 @@ import contextlib
 import logging
 from pathlib import Path
 
+from openspeleo_lib import instrumentation
 from openspeleo_lib.debug_utils import write_debugdata_to_disk
 from openspeleo_lib.interfaces.ariane.xml_utils import serialize_dict_to_xmlfield
 
@@ -11,6 +12,7 @@ logger = logging.getLogger(__name__)
 DEBUG = False
 
 
+@instrumentation.timed("ariane.encode")
 def ariane_encode(data: dict) -> dict:
     # ==================== FORMATING FROM OSPL TO TML =================== #
 
@@ -59,6 +61,8 @@ def ariane_encode(data: dict) -> dict:
 
     data["Data"] = {"SurveyData": shots}
 
+    instrumentation.incr("ariane.shots_encoded", len(shots))
+
     if DEBUG:
         write_debugdata_to_disk(data, Path("data.export.step02.json"))
 
@@ -4,48 +4,126 @@ import logging
 import uuid
 import zipfile
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 from openspeleo_core import ariane_core
 
+from openspeleo_lib import instrumentation
 from openspeleo_lib.constants import ARIANE_DATA_FILENAME
 from openspeleo_lib.debug_utils import write_debugdata_to_disk
 from openspeleo_lib.interfaces.ariane.decoding import ariane_decode
 from openspeleo_lib.interfaces.ariane.encoding import ariane_encode
 from openspeleo_lib.interfaces.ariane.enums_cls import ArianeFileType
 from openspeleo_lib.interfaces.ariane.name_map import ARIANE_MAPPING
+from openspeleo_lib.interfaces.ariane.xml_utils import extract_elements
+from openspeleo_lib.interfaces.ariane.xml_utils import extract_top_level_elements
 from openspeleo_lib.interfaces.base import BaseInterface
+from openspeleo_lib.models import Shot as BaseShot
 from openspeleo_lib.models import Survey as BaseSurvey
+from openspeleo_lib.opaque_xml import OpaqueXML
+from openspeleo_lib.opaque_xml import OpaqueXMLRegistry
 from openspeleo_lib.pydantic_utils import aliased_model
 
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
 logger = logging.getLogger(__name__)
 DEBUG = False
 
 ArianeSurvey = aliased_model(BaseSurvey, ARIANE_MAPPING, "Ariane")
 
+# Ariane viewer blocks OpenSpeleo never interprets: with `opaque_carto=True`
+# they are kept as raw XML (see `OpaqueXML`) instead of being converted.
+OPAQUE_SURVEY_FIELDS = (
+    "ariane_viewer_layers",
+    "carto_ellipse",
+    "carto_line",
+    "carto_linked_surface",
+    "carto_overlay",
+    "carto_page",
+    "carto_rectangle",
+    "carto_selection",
+    "carto_spline",
+    "constraints",
+    "list_annotation",
+    "list_lidar_records",
+)
+OPAQUE_XML_TAGS = tuple(ARIANE_MAPPING[BaseSurvey][f] for f in OPAQUE_SURVEY_FIELDS)
+
+# Wall shapes: with `lazy_shapes=True` each one is replaced by a token while
+# parsing the document and attached to its shot as an `OpaqueXML`.
+SHAPE_TAG = ARIANE_MAPPING[BaseShot]["shape"]
+
+# With `opaque_carto=True`, the LiDAR point clouds are decoded from their raw
+# XML (see `LidarRecords`).
+LIDAR_TAG = ARIANE_MAPPING[BaseSurvey]["list_lidar_records"]
+LAZY_SHAPE_PREFIX = "__ospl_shape_"
+
+
+def load_tml_xml(filepath: str | Path | BinaryIO) -> str:
+    """Reads the raw XML document stored inside a TML (zip) file."""
+    with instrumentation.span("ariane.zip_read"):
+        with zipfile.ZipFile(filepath, "r") as zf:
+            data = zf.read(ARIANE_DATA_FILENAME)
+
+        instrumentation.incr("ariane.bytes_read", len(data))
+        return data.decode("utf-8")
+
+
+def save_tml_xml(xml_str: str, filepath: str | Path | BinaryIO) -> None:
+    """Writes a raw XML document into a TML (zip) file."""
+    with instrumentation.span("ariane.zip_write"):
+        data = xml_str.encode("utf-8")
+        with zipfile.ZipFile(filepath, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(ARIANE_DATA_FILENAME, data)
+
+        instrumentation.incr("ariane.bytes_written", len(data))
+
 
 class ArianeInterface(BaseInterface):
     @classmethod
     def to_file(cls, survey: BaseSurvey, filepath: Path) -> None:
+        with instrumentation.span("interface.to_file", interface=cls.__name__):
+            if (
+                filetype := ArianeFileType.from_path(filepath=filepath)
+            ) != ArianeFileType.TML:
+                raise TypeError(
+                    f"Unsupported fileformat: `{filetype.name}`. "
+                    f"Expected: `{ArianeFileType.TML.name}`"
+                )
+
+            xml_str = cls._to_xml_str(survey)
+
+            logging.debug(
+                "Exporting %(filetype)s File: `%(filepath)s`",
+                {"filetype": filetype.name, "filepath": filepath},
+            )
+            save_tml_xml(xml_str, filepath)
+
+    @classmethod
+    def to_fileobj(cls, survey: BaseSurvey, fileobj: BinaryIO) -> None:
+        """Writes the survey as a TML (zip) archive into a binary file object."""
+        with instrumentation.span("interface.to_fileobj", interface=cls.__name__):
+            save_tml_xml(cls._to_xml_str(survey), fileobj)
+
+    @classmethod
+    def _to_xml_str(cls, survey: BaseSurvey) -> str:
         # 1. Validation
 
         if not isinstance(survey, ArianeSurvey):
             raise TypeError(f"Unexpected type received: `{type(survey)}`.")
 
-        if (
-            filetype := ArianeFileType.from_path(filepath=filepath)
-        ) != ArianeFileType.TML:
-            raise TypeError(
-                f"Unsupported fileformat: `{filetype.name}`. "
-                f"Expected: `{ArianeFileType.TML.name}`"
-            )
-
         # 2. Populate missing shot UUIDs
         for shot in survey.shots:
             if shot.id is None:
                 shot.id = uuid.uuid4()
 
-        # 3. Convert to dict
-        data = survey.model_dump(mode="json", by_alias=True)
+        # 3. Convert to dict - raw XML blocks are replaced by placeholders
+        registry = OpaqueXMLRegistry()
+        with instrumentation.span("ariane.serialization"):
+            data = survey.model_dump(
+                mode="json", by_alias=True, context=registry.context
+            )
 
         # ------------------------------------------------------------------- #
 
@@ -62,23 +140,36 @@ class ArianeInterface(BaseInterface):
         # =========================== DICT TO XML =========================== #
 
         # xml_str = dict_to_xml(data)
-        xml_str = ariane_core.dict_to_xml_str(data, root_name="CaveFile")
+        with instrumentation.span("ariane.dict_to_xml"):
+            xml_str = ariane_core.dict_to_xml_str(data, root_name="CaveFile")
+            xml_str = registry.substitute(xml_str)
 
         if DEBUG:
             with Path("data.export.xml").open(mode="w") as f:
                 f.write(xml_str)
 
-        # ========================== WRITE TO DISK ========================== #
-
-        with zipfile.ZipFile(filepath, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            logging.debug(
-                "Exporting %(filetype)s File: `%(filepath)s`",
-                {"filetype": filetype.name, "filepath": filepath},
-            )
-            zf.writestr(ARIANE_DATA_FILENAME, xml_str)
+        return xml_str
 
     @classmethod
-    def _from_file(cls, filepath: str | Path) -> BaseSurvey:
+    def _from_file(
+        cls,
+        filepath: str | Path,
+        *,
+        opaque_carto: bool = False,
+        lazy_shapes: bool = False,
+    ) -> BaseSurvey:
+        """Loads a TML file.
+
+        Args:
+            filepath: Path of the TML file.
+            opaque_carto: Keep the `Carto*`, `Layers`, `Constraints`,
+                `ListAnnotation` and `ListLidarRecords` blocks as raw XML,
+                only decoded on access and written back verbatim. The LiDAR
+                points are then decoded into NumPy arrays (`LidarRecords`).
+            lazy_shapes: Same for the wall shape (`Shot.shape`) of each shot.
+                Loading a survey with walls then costs about the same as
+                loading one without.
+        """
         # ========================= INPUT VALIDATION ======================== #
 
         if (
@@ -100,15 +191,51 @@ class ArianeInterface(BaseInterface):
 
         match filetype:
             case ArianeFileType.TML:
-                data = ariane_core.load_ariane_tml_file_to_dict(path=filepath)[
-                    "CaveFile"
-                ]
+                return cls._from_xml_str(
+                    load_tml_xml(filepath),
+                    opaque_carto=opaque_carto,
+                    lazy_shapes=lazy_shapes,
+                )
 
             case _:
                 raise NotImplementedError(
                     f"Not supported yet - Format: `{filetype.name}`"
                 )
 
+    @classmethod
+    def _from_fileobj(
+        cls,
+        fileobj: BinaryIO,
+        *,
+        opaque_carto: bool = False,
+        lazy_shapes: bool = False,
+    ) -> BaseSurvey:
+        return cls._from_xml_str(
+            load_tml_xml(fileobj),
+            opaque_carto=opaque_carto,
+            lazy_shapes=lazy_shapes,
+        )
+
+    @classmethod
+    def _from_xml_str(
+        cls, xml_str: str, *, opaque_carto: bool = False, lazy_shapes: bool = False
+    ) -> BaseSurvey:
+        # =========================== XML TO DICT =========================== #
+
+        opaque_elements: dict[str, str] = {}
+        with instrumentation.span("ariane.xml_to_dict"):
+            if opaque_carto:
+                xml_str, opaque_elements = extract_top_level_elements(
+                    xml_str, OPAQUE_XML_TAGS
+                )
+
+            shapes: list[str] = []
+            if lazy_shapes:
+                xml_str, shapes = extract_elements(
+                    xml_str, SHAPE_TAG, LAZY_SHAPE_PREFIX
+                )
+            data = ariane_core.xml_str_to_dict(xml_str, keep_null=False)["CaveFile"]
+
         # ------------------------------------------------------------------- #
 
         if DEBUG:
@@ -119,6 +246,25 @@ class ArianeInterface(BaseInterface):
         if DEBUG:
             write_debugdata_to_disk(data, Path("data.import.after.json"))
 
+        for tag, raw in opaque_elements.items():
+            if tag == LIDAR_TAG:
+                from openspeleo_lib.lidar import LidarRecords  # noqa: PLC0415
+
+                data[tag] = LidarRecords(tag, raw)
+            else:
+                data[tag] = OpaqueXML(tag, raw)
+
+        if shapes:
+            for section in data["sections"]:
+                for shot in section["shots"]:
+                    if isinstance(
+                        token := shot.get(SHAPE_TAG), str
+                    ) and token.startswith(LAZY_SHAPE_PREFIX):
+                        shot[SHAPE_TAG] = OpaqueXML(
+                            SHAPE_TAG, shapes[int(token[len(LAZY_SHAPE_PREFIX) :])]
+                        )
+
         # ------------------------------------------------------------------- #
 
-        return ArianeSurvey.model_validate(data, by_alias=True)
+        with instrumentation.span("ariane.validation"):
+            return ArianeSurvey.model_validate(data, by_alias=True)
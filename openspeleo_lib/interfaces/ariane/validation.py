@@ -0,0 +1,330 @@
+"""Fast structural validation of TML files.
+
+`validate_tml_fast` streams the XML document of a TML archive and checks each
+`SurveyData` record as soon as it has been parsed, without building any
+pydantic model:
+
+- required fields are present,
+- numeric fields parse and are within range,
+- `Type` / `Profiletype` belong to their enums,
+- shot IDs are unique.
+
+Memory usage doesn't depend on the number of shots: records are discarded once
+checked, wall shapes are skipped without being parsed and seen IDs are tracked
+in a bitset.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from typing import TYPE_CHECKING
+from typing import NamedTuple
+from xml.etree.ElementTree import ParseError
+from xml.etree.ElementTree import XMLPullParser
+
+from openspeleo_lib.constants import ARIANE_DATA_FILENAME
+from openspeleo_lib.constants import OSPL_SECTIONNAME_MAX_LENGTH
+from openspeleo_lib.constants import OSPL_SHOTNAME_MAX_LENGTH
+from openspeleo_lib.enums import ArianeProfileType
+from openspeleo_lib.enums import ArianeShotType
+from openspeleo_lib.utils import gc_paused
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from pathlib import Path
+    from typing import BinaryIO
+
+REQUIRED_SHOT_FIELDS = ("ID", "Length", "Depth", "Azimut")
+FLOAT_SHOT_FIELDS = ("Length", "Depth", "Azimut", "DepthIn", "Inclination")
+INT_SHOT_FIELDS = ("FromID", "ClosureToID")
+BOOL_SHOT_FIELDS = ("Excluded", "Locked")
+LRUD_SHOT_FIELDS = ("Left", "Right", "Up", "Down")
+
+SHOT_TYPES = frozenset(item.value for item in ArianeShotType)
+PROFILE_TYPES = frozenset(item.value for item in ArianeProfileType)
+MAX_LATITUDE = 90.0
+MAX_LONGITUDE = 180.0
+
+UNITS = frozenset({"ft", "feet", "m", "meters", "meter"})
+
+# Values accepted by pydantic for booleans
+BOOL_VALUES = frozenset(
+    {"0", "1", "true", "false", "t", "f", "yes", "no", "y", "n", "on", "off"}
+)
+
+# `<CaveFile><Data><SurveyData>`: depth of the elements holding the records
+RECORDS_PARENT_DEPTH = 2
+
+SHAPE_OPEN_TAG = b"<Shape>"
+SHAPE_CLOSE_TAG = b"</Shape>"
+CHUNK_SIZE = 1 << 16
+
+# IDs above this value are tracked in a `set` rather than in the bitset.
+MAX_BITSET_ID = 1 << 27  # 16 MB bitset
+
+
+class ValidationIssue(NamedTuple):
+    shot_index: int | None  # Position of the `SurveyData` record, if any
+    shot_id: str | None
+    message: str
+
+    def __str__(self) -> str:
+        if self.shot_index is None:
+            return self.message
+        return f"[Shot #{self.shot_index} - ID={self.shot_id}] {self.message}"
+
+
+class _MaxErrorsReachedError(Exception):
+    pass
+
+
+class _IDBitset:
+    """Set of non negative integers backed by a growable bitset."""
+
+    def __init__(self) -> None:
+        self._bits = bytearray(1024)
+        self._overflow: set[int] = set()
+
+    def add(self, value: int) -> bool:
+        """Adds `value`. Returns `False` if it was already present."""
+        if value >= MAX_BITSET_ID:
+            if value in self._overflow:
+                return False
+            self._overflow.add(value)
+            return True
+
+        byte_idx, mask = value >> 3, 1 << (value & 7)
+        if byte_idx >= len(self._bits):
+            self._bits.extend(
+                bytes(max(byte_idx + 1, 2 * len(self._bits)) - len(self._bits))
+            )
+
+        if self._bits[byte_idx] & mask:
+            return False
+
+        self._bits[byte_idx] |= mask
+        return True
+
+
+class _Validator:
+    def __init__(self, max_errors: int | None) -> None:
+        self.max_errors = max_errors
+        self.errors: list[ValidationIssue] = []
+        self.ids = _IDBitset()
+        self.shot_count = 0
+
+    def error(
+        self, message: str, shot_index: int | None = None, shot_id: str | None = None
+    ) -> None:
+        self.errors.append(ValidationIssue(shot_index, shot_id, message))
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            raise _MaxErrorsReachedError
+
+    def check_unit(self, value: str | None) -> None:
+        if (value or "").strip().lower() not in UNITS:
+            self.error(f"Unknown unit: `{value}`")
+
+    def check_shot(self, fields: dict[str, str | None]) -> None:
+        idx = self.shot_count
+        self.shot_count += 1
+        shot_id = fields.get("ID")
+
+        def error(message: str) -> None:
+            self.error(message, shot_index=idx, shot_id=shot_id)
+
+        for key in REQUIRED_SHOT_FIELDS:
+            if fields.get(key) is None:
+                error(f"Missing required field `{key}`")
+
+        # Shot type: non `REAL` shots have negative values coerced to 0
+        shot_type = fields.get("Type")
+        if shot_type is not None and shot_type not in SHOT_TYPES:
+            error(f"Unknown shot type `{shot_type}`")
+        is_real = shot_type is None or shot_type == ArianeShotType.REAL.value
+
+        if (profile := fields.get("Profiletype")) is not None and (
+            profile not in PROFILE_TYPES
+        ):
+            error(f"Unknown profile type `{profile}`")
+
+        # IDs
+        if shot_id is not None:
+            try:
+                value = int(shot_id)
+            except ValueError:
+                error(f"`ID` is not an integer: `{shot_id}`")
+            else:
+                if value < 0:
+                    error(f"`ID` must be non negative: `{shot_id}`")
+                elif not self.ids.add(value):
+                    error(f"Duplicate shot `ID`: `{shot_id}`")
+
+        for key in INT_SHOT_FIELDS:
+            if (raw := fields.get(key)) is not None:
+                try:
+                    int(raw)
+                except ValueError:
+                    error(f"`{key}` is not an integer: `{raw}`")
+
+        # Floats & ranges
+        values: dict[str, float] = {}
+        for key in (*FLOAT_SHOT_FIELDS, *LRUD_SHOT_FIELDS, "Latitude", "Longitude"):
+            if (raw := fields.get(key)) is None:
+                continue
+            try:
+                values[key] = float(raw)
+            except ValueError:
+                error(f"`{key}` is not a number: `{raw}`")
+
+        if is_real:
+            for key in ("Length", *LRUD_SHOT_FIELDS):
+                if values.get(key, 0.0) < 0:
+                    error(f"`{key}` must be non negative: `{fields[key]}`")
+
+        if not -MAX_LATITUDE <= values.get("Latitude", 0.0) <= MAX_LATITUDE:
+            error(f"`Latitude` out of range: `{fields['Latitude']}`")
+
+        if not -MAX_LONGITUDE <= values.get("Longitude", 0.0) <= MAX_LONGITUDE:
+            error(f"`Longitude` out of range: `{fields['Longitude']}`")
+
+        # Booleans & strings
+        for key in BOOL_SHOT_FIELDS:
+            if (raw := fields.get(key)) is not None and raw.lower() not in BOOL_VALUES:
+                error(f"`{key}` is not a boolean: `{raw}`")
+
+        if len(fields.get("Name") or "") > OSPL_SHOTNAME_MAX_LENGTH:
+            error(f"`Name` is longer than {OSPL_SHOTNAME_MAX_LENGTH} characters")
+
+        if len(fields.get("Section") or "") > OSPL_SECTIONNAME_MAX_LENGTH:
+            error(f"`Section` is longer than {OSPL_SECTIONNAME_MAX_LENGTH} characters")
+
+
+def _iter_chunks_without_shapes(
+    stream: BinaryIO, chunk_size: int = CHUNK_SIZE
+) -> Generator[bytes]:
+    """Yields the content of `stream` with the `<Shape>` blocks removed.
+
+    Wall shapes make up most of the XML elements of a TML file but aren't
+    validated: skipping them at the byte level avoids building an element for
+    each of their nodes.
+    """
+    buffer = b""
+    in_shape = False
+
+    while chunk := stream.read(chunk_size):
+        buffer += chunk
+        parts: list[bytes] = []
+        pos = 0
+
+        while True:
+            if in_shape:
+                if (end := buffer.find(SHAPE_CLOSE_TAG, pos)) < 0:
+                    # Keep what could be the beginning of the closing tag.
+                    pos = max(pos, len(buffer) - len(SHAPE_CLOSE_TAG) + 1)
+                    break
+                pos = end + len(SHAPE_CLOSE_TAG)
+                in_shape = False
+
+            else:
+                if (start := buffer.find(SHAPE_OPEN_TAG, pos)) < 0:
+                    keep = max(pos, len(buffer) - len(SHAPE_OPEN_TAG) + 1)
+                    parts.append(buffer[pos:keep])
+                    pos = keep
+                    break
+                parts.append(buffer[pos:start])
+                pos = start + len(SHAPE_OPEN_TAG)
+                in_shape = True
+
+        buffer = buffer[pos:]
+        if parts:
+            yield b"".join(parts)
+
+    # An unterminated `<Shape>` is left for the XML parser to report.
+    yield SHAPE_OPEN_TAG + buffer if in_shape else buffer
+
+
+def _validate_stream(stream: BinaryIO, validator: _Validator) -> None:
+    parser = XMLPullParser(events=("start", "end"))
+    read_events = parser.read_events
+    check_shot = validator.check_shot
+    depth = 0
+    data_elem = None
+
+    for chunk in _iter_chunks_without_shapes(stream):
+        parser.feed(chunk)
+
+        for event, elem in read_events():
+            if event == "start":
+                depth += 1
+                if depth == RECORDS_PARENT_DEPTH and elem.tag == "Data":
+                    data_elem = elem
+                continue
+
+            depth -= 1
+
+            if (
+                data_elem is not None
+                and depth == RECORDS_PARENT_DEPTH
+                and elem.tag == "SurveyData"
+            ):
+                check_shot({child.tag: child.text for child in elem})
+                # Detached right away: memory doesn't grow with the number of shots
+                data_elem.remove(elem)
+
+            elif depth == 1:
+                if elem.tag == "unit":
+                    validator.check_unit(elem.text)
+                elif elem.tag == "Data":
+                    data_elem = None
+                # Top level blocks (carto, layers, ...) aren't needed anymore.
+                elem.clear()
+
+            elif depth == 0 and elem.tag != "CaveFile":
+                validator.error(f"Unexpected root element: `{elem.tag}`")
+
+    parser.close()
+
+
+def validate_tml_fast(
+    source: str | Path | BinaryIO, max_errors: int | None = None
+) -> list[ValidationIssue]:
+    """Validates the structure of a TML file without building the survey.
+
+    Args:
+        source: Path or seekable binary file object of the TML file.
+        max_errors: Stop validating after this many errors.
+
+    Returns:
+        The list of issues found, empty if the file is valid.
+    """
+    validator = _Validator(max_errors=max_errors)
+
+    try:
+        # The records are freed as soon as checked, without reference cycles:
+        # the collections triggered by their allocation would be wasted (~20%).
+        with (
+            gc_paused(),
+            zipfile.ZipFile(source, "r") as zf,
+            zf.open(ARIANE_DATA_FILENAME) as stream,
+        ):
+            _validate_stream(stream, validator)
+
+    except _MaxErrorsReachedError:
+        return validator.errors
+
+    except zipfile.BadZipFile as e:
+        return [ValidationIssue(None, None, f"Invalid TML archive: {e}")]
+
+    except KeyError:
+        return [
+            ValidationIssue(None, None, f"Missing `{ARIANE_DATA_FILENAME}` in archive")
+        ]
+
+    except ParseError as e:
+        validator.errors.append(ValidationIssue(None, None, f"Invalid XML: {e}"))
+        return validator.errors
+
+    if validator.shot_count == 0 and not validator.errors:
+        validator.errors.append(ValidationIssue(None, None, "The survey is empty"))
+
+    return validator.errors
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import re
+from typing import TYPE_CHECKING
+
 import xmltodict
 from dicttoxml2 import dicttoxml
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 
 def deserialize_xmlfield_to_dict(xmlfield: str) -> dict | str | None:
     return xmltodict.parse(f"<root>{xmlfield}</root>")["root"]
@@ -16,3 +22,98 @@ def serialize_dict_to_xmlfield(data: dict | str) -> str:
         return ""
 
     return dicttoxml(data, attr_type=False, root=False).decode("utf-8")
+
+
+def extract_top_level_elements(
+    xml_str: str, tags: Iterable[str]
+) -> tuple[str, dict[str, str]]:
+    """Cuts the non-empty top level `tags` elements out of an Ariane document.
+
+    The elements are searched around the `<Data>` block only: shots are never
+    scanned.
+
+    Returns:
+        The document without the extracted elements and the raw XML of each of
+        them (tags included) keyed by tag.
+    """
+    data_start = xml_str.find("<Data>")
+    data_end = xml_str.rfind("</Data>")
+
+    if data_start < 0 or data_end < 0:
+        head, data, tail = xml_str, "", ""
+    else:
+        data_end += len("</Data>")
+        head, data, tail = (
+            xml_str[:data_start],
+            xml_str[data_start:data_end],
+            xml_str[data_end:],
+        )
+
+    pattern = re.compile(rf"<({'|'.join(re.escape(tag) for tag in tags)})>")
+    elements: dict[str, str] = {}
+
+    def extract(segment: str) -> str:
+        parts: list[str] = []
+        pos = 0
+
+        while (match := pattern.search(segment, pos)) is not None:
+            tag = match.group(1)
+            open_tag, close_tag = f"<{tag}>", f"</{tag}>"
+
+            # Finds the matching closing tag (Ariane elements aren't expected to
+            # nest themselves, but better safe than sorry).
+            depth, cursor = 1, match.end()
+            while depth:
+                if (close_idx := segment.find(close_tag, cursor)) < 0:
+                    # Malformed document: left for the XML parser to report.
+                    return "".join(parts) + segment[pos:]
+                depth += segment.count(open_tag, cursor, close_idx) - 1
+                cursor = close_idx + len(close_tag)
+
+            element = segment[match.start() : cursor]
+            if element[len(open_tag) : -len(close_tag)].strip():
+                parts.append(segment[pos : match.start()])
+                elements[tag] = element
+            else:
+                parts.append(segment[pos:cursor])
+            pos = cursor
+
+        parts.append(segment[pos:])
+        return "".join(parts)
+
+    return extract(head) + data + extract(tail), elements
+
+
+def extract_elements(
+    xml_str: str, tag: str, token_prefix: str
+) -> tuple[str, list[str]]:
+    """Replaces the content of every non-empty `tag` element by a token.
+
+    `tag` elements must not nest. The `i`-th extracted element becomes
+    `<tag>{token_prefix}{i}</tag>`, which an XML parser reads as a short string.
+
+    Returns:
+        The document with the tokens and the raw XML of the extracted elements
+        (tags included), in document order.
+    """
+    open_tag, close_tag = f"<{tag}>", f"</{tag}>"
+    parts: list[str] = []
+    elements: list[str] = []
+    pos = 0
+
+    # `str.find` based: much faster than a regex over multi-MB documents.
+    while (start := xml_str.find(open_tag, pos)) >= 0:
+        if (end := xml_str.find(close_tag, start)) < 0:
+            break  # Malformed document: left for the XML parser to report.
+        end += len(close_tag)
+
+        if xml_str[start + len(open_tag) : end - len(close_tag)].strip():
+            parts.append(xml_str[pos:start])
+            parts.append(f"{open_tag}{token_prefix}{len(elements)}{close_tag}")
+            elements.append(xml_str[start:end])
+        else:
+            parts.append(xml_str[pos:end])
+        pos = end
+
+    parts.append(xml_str[pos:])
+    return "".join(parts), elements
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import io
 from abc import ABCMeta
 from abc import abstractmethod
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from openspeleo_lib import instrumentation
 from openspeleo_lib.generators import UniqueValueGenerator
+from openspeleo_lib.utils import gc_paused
 
 if TYPE_CHECKING:
+    from typing import BinaryIO
+
     from openspeleo_lib.models import Survey
 
 
@@ -23,15 +28,59 @@ class BaseInterface(metaclass=ABCMeta):
         raise NotImplementedError  # pragma: no cover
 
     @classmethod
-    def from_file(cls, filepath: str | Path) -> Survey:
+    def to_fileobj(cls, survey: Survey, fileobj: BinaryIO) -> None:
+        """Writes the survey into a binary file object (e.g. `BytesIO`)."""
+        raise NotImplementedError(
+            f"`{cls.__name__}` doesn't support writing to a file object."
+        )
+
+    @classmethod
+    def to_bytes(cls, survey: Survey) -> bytes:
+        """Returns the survey serialized as it would be written by `to_file`."""
+        buffer = io.BytesIO()
+        cls.to_fileobj(survey, buffer)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_file(cls, filepath: str | Path, **kwargs) -> Survey:
+        """Loads a survey from `filepath`.
+
+        `kwargs` are interface specific loading options (see `_from_file`).
+        The cyclic garbage collector is paused while loading (see `gc_paused`).
+        """
         filepath = Path(filepath)
         if not filepath.exists():
             raise FileNotFoundError(f"File not found: `{filepath}`")
 
-        with UniqueValueGenerator.activate_uniqueness():
-            return cls._from_file(filepath=filepath)
+        with (
+            instrumentation.span("interface.from_file", interface=cls.__name__),
+            UniqueValueGenerator.activate_uniqueness(),
+            gc_paused(),
+        ):
+            return cls._from_file(filepath=filepath, **kwargs)
 
     @classmethod
     @abstractmethod
-    def _from_file(cls, filepath: Path) -> Survey:
+    def _from_file(cls, filepath: Path, **kwargs) -> Survey:
         raise NotImplementedError  # pragma: no cover
+
+    @classmethod
+    def from_fileobj(cls, fileobj: BinaryIO, **kwargs) -> Survey:
+        """Loads a survey from a seekable binary file object (e.g. `BytesIO`)."""
+        with (
+            instrumentation.span("interface.from_fileobj", interface=cls.__name__),
+            UniqueValueGenerator.activate_uniqueness(),
+            gc_paused(),
+        ):
+            return cls._from_fileobj(fileobj=fileobj, **kwargs)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, **kwargs) -> Survey:
+        """Loads a survey from the in-memory content of a file."""
+        return cls.from_fileobj(io.BytesIO(data), **kwargs)
+
+    @classmethod
+    def _from_fileobj(cls, fileobj: BinaryIO, **kwargs) -> Survey:
+        raise NotImplementedError(
+            f"`{cls.__name__}` doesn't support reading from a file object."
+        )
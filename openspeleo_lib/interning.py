@@ -0,0 +1,76 @@
+"""Per-load string pool.
+
+The XML parser produces a new `str` object for every value: the values
+repeated across a survey (`Shot.color`, the keys and values of the wall shapes,
+explorers, ...) are held hundreds of thousands of times. A `StringPool` maps each
+value to a single shared object, only for the duration of a load: unlike
+`sys.intern`, the strings are released along with the survey.
+
+Models validated with a pool in their context (see `StringPool.context`) intern
+their wall shapes.
+"""
+
+from __future__ import annotations
+
+from typing import TypeVar
+
+T = TypeVar("T")
+
+# Key of the `StringPool` in the pydantic validation context.
+STRING_POOL_CONTEXT_KEY = "string_pool"
+
+
+class StringPool:
+    """Deduplicates equal strings: `intern(value)` returns the first equal string
+    seen by the pool."""
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    @property
+    def context(self) -> dict[str, StringPool]:
+        """Validation context to pass to `model_validate(context=...)`."""
+        return {STRING_POOL_CONTEXT_KEY: self}
+
+    def intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def intern_list(self, values: list[str]) -> list[str]:
+        setdefault = self._strings.setdefault
+        return [setdefault(value, value) for value in values]
+
+    def intern_tree(self, obj: T) -> T:
+        """Returns a copy of `obj` whose strings (dict keys included), nested in
+        dicts / lists, are interned. Other values are returned unchanged."""
+        setdefault = self._strings.setdefault
+
+        # Strings are interned inline: a call per leaf would double the cost.
+        def intern(obj):
+            obj_type = type(obj)
+            if obj_type is dict:
+                return {
+                    setdefault(key, key): (
+                        setdefault(value, value)
+                        if type(value) is str
+                        else intern(value)
+                    )
+                    for key, value in obj.items()
+                }
+
+            if obj_type is list:
+                return [
+                    setdefault(value, value) if type(value) is str else intern(value)
+                    for value in obj
+                ]
+
+            if obj_type is str:
+                return setdefault(obj, obj)
+
+            return obj
+
+        return intern(obj)
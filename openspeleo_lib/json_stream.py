@@ -0,0 +1,251 @@
+"""Incremental reader of OSPL JSON files (see `Survey.to_json`).
+
+`Survey.from_json` loads the whole file at once. `SurveyJSONReader` walks its
+top-level object instead and yields the sections one by one: only one section
+is held in memory at a time.
+
+The survey fields (`SurveyJSONReader.survey`) may be written before or after
+the sections: when requested first, the sections are skipped over (parsed,
+not validated) to reach them and their position is remembered, the next
+iteration resumes from there.
+"""
+
+from __future__ import annotations
+
+import codecs
+import collections
+import json
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import BinaryIO
+from typing import Generic
+from typing import TypeVar
+from typing import get_args
+
+from openspeleo_lib.interning import StringPool
+from openspeleo_lib.models import Section
+from openspeleo_lib.models import Survey
+from openspeleo_lib.utils import gc_paused
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+SurveyT = TypeVar("SurveyT", bound=Survey)
+
+# Bytes read at once, doubled while a single value doesn't fit.
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class _JSONTextStream:
+    """Buffered JSON tokens of a binary file, starting at byte `offset`."""
+
+    def __init__(self, f: BinaryIO, offset: int = 0, chunk_size: int = 0) -> None:
+        f.seek(offset)
+        self._f = f
+        self._chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._decode = json.JSONDecoder().raw_decode
+
+        self._buffer = ""
+        self._pos = 0
+        self._offset = offset  # Byte offset of `_buffer`
+        self._eof = False
+
+    @property
+    def offset(self) -> int:
+        """Byte offset of the next token in the file."""
+        self._skip_whitespace()
+        return self._offset + len(self._buffer[: self._pos].encode())
+
+    def _fill(self) -> bool:
+        """Reads more data, returns `False` at the end of the file."""
+        if self._eof:
+            return False
+
+        # At least the pending data: values spanning several chunks are
+        # re-parsed a bounded number of times.
+        pending = len(self._buffer) - self._pos
+        data = self._f.read(max(self._chunk_size, pending))
+        self._eof = not data
+
+        self._offset += len(self._buffer[: self._pos].encode())
+        self._buffer = self._buffer[self._pos :] + self._decoder.decode(
+            data, final=self._eof
+        )
+        self._pos = 0
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _next_char(self) -> str:
+        """Consumes the next token character, `""` at the end of the file."""
+        self._skip_whitespace()
+        char = self._buffer[self._pos : self._pos + 1]
+        self._pos += len(char)
+        return char
+
+    def expect(self, chars: str) -> str:
+        if not (char := self._next_char()) or char not in chars:
+            raise ValueError(
+                f"Invalid JSON: expected one of `{chars}` at byte {self.offset}, "
+                f"got `{char}`"
+            )
+        return char
+
+    def value(self) -> Any:
+        """Parses the next JSON value."""
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = self._decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+
+            # Numbers may continue in the next chunk.
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+    def iter_keys(self) -> Generator[str]:
+        """Yields the keys of the next object: the caller consumes each value."""
+        self.expect("{")
+        if self._peek() == "}":
+            self.expect("}")
+            return
+
+        while True:
+            if self._peek() != '"':
+                raise ValueError(f"Invalid JSON: expected a key at byte {self.offset}")
+            key = self.value()
+            self.expect(":")
+            yield key
+
+            if self.expect(",}") == "}":
+                return
+
+    def iter_items(self) -> Generator[None]:
+        """Yields once per item of the next array: the caller consumes each one."""
+        self.expect("[")
+        if self._peek() == "]":
+            self.expect("]")
+            return
+
+        while True:
+            yield
+
+            if self.expect(",]") == "]":
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        return self._buffer[self._pos : self._pos + 1]
+
+
+class SurveyJSONReader(Generic[SurveyT]):
+    """Reads an OSPL JSON file section by section.
+
+    ```python
+    reader = SurveyJSONReader("survey.json")
+    print(reader.survey.name)  # Survey fields, without the sections
+    for section in reader:
+        ...
+    ```
+
+    The sections yielded aren't linked to `survey`: they are meant to be
+    processed and dropped.
+
+    Args:
+        filepath: OSPL JSON file.
+        survey_cls: Survey model of the file (e.g. `ArianeSurvey`).
+        chunk_size: Bytes read at once.
+        intern_strings: Interns the wall shapes (see `Survey.from_json_bytes`).
+    """
+
+    def __init__(
+        self,
+        filepath: str | Path,
+        survey_cls: type[SurveyT] = Survey,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        intern_strings: bool = False,
+    ) -> None:
+        self.filepath = Path(filepath)
+        self.survey_cls = survey_cls
+        self.chunk_size = chunk_size
+
+        self._context = StringPool().context if intern_strings else None
+        self._section_cls: type[Section] = get_args(
+            survey_cls.model_fields["sections"].annotation
+        )[0]
+
+        # Known once the file was walked through
+        self._fields: dict[str, Any] | None = None
+        self._sections_offset: int | None = None
+        self._survey: SurveyT | None = None
+
+    @property
+    def fields(self) -> dict[str, Any]:
+        """Raw (JSON) survey fields, without the sections."""
+        if self._fields is None:
+            collections.deque(self._walk(skip_sections=True), maxlen=0)
+        return self._fields
+
+    @property
+    def survey(self) -> SurveyT:
+        """The survey without its sections."""
+        if self._survey is None:
+            self._survey = self.survey_cls.model_validate(
+                self.fields, context=self._context
+            )
+        return self._survey
+
+    def __iter__(self) -> Generator[Section]:
+        return self.iter_sections()
+
+    def iter_sections(self) -> Generator[Section]:
+        """Yields the sections of the file, in order."""
+        if self._sections_offset is None:
+            yield from self._walk(skip_sections=False)
+            return
+
+        with self.filepath.open(mode="rb") as f:
+            stream = _JSONTextStream(f, self._sections_offset, self.chunk_size)
+            yield from self._iter_sections(stream)
+
+    def _iter_sections(self, stream: _JSONTextStream) -> Generator[Section]:
+        for _ in stream.iter_items():
+            with gc_paused():
+                section = self._section_cls.model_validate(
+                    stream.value(), context=self._context
+                )
+            yield section
+
+    def _walk(self, *, skip_sections: bool) -> Generator[Section]:
+        """Walks the whole file, collecting the survey fields."""
+        fields = {}
+        with self.filepath.open(mode="rb") as f:
+            stream = _JSONTextStream(f, chunk_size=self.chunk_size)
+
+            for key in stream.iter_keys():
+                if key != "sections":
+                    fields[key] = stream.value()
+                    continue
+
+                self._sections_offset = stream.offset
+                if skip_sections:
+                    for _ in stream.iter_items():
+                        stream.value()
+                else:
+                    yield from self._iter_sections(stream)
+
+        self._fields = fields
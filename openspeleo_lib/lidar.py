@@ -0,0 +1,254 @@
+"""LiDAR point clouds stored in the Ariane `ListLidarRecords` block, loaded as
+a `LidarRecords` with `opaque_carto=True` (see `ArianeInterface.from_file`).
+
+`LidarRecords` is an `OpaqueXML`: it keeps the raw XML of the block, which is
+written back verbatim on export, and decodes the points into float32 NumPy
+arrays on first access instead of nested dicts of strings.
+
+The block is expected to hold one element per record, each of them holding
+points as elements with `X`, `Y`, `Z` and optionally `Intensity` children::
+
+    <ListLidarRecords>
+        <LidarRecord>
+            <Points>
+                <Point><X>1.0</X><Y>2.0</Y><Z>3.0</Z><Intensity>0.5</Intensity></Point>
+            </Points>
+        </LidarRecord>
+    </ListLidarRecords>
+
+Point fields are matched case insensitively, other elements are ignored (but
+preserved in the raw XML).
+"""
+
+from __future__ import annotations
+
+from array import array
+from itertools import pairwise
+from pathlib import Path
+from typing import TYPE_CHECKING
+from xml.etree.ElementTree import XMLPullParser
+
+import numpy as np
+
+from openspeleo_lib.opaque_xml import OpaqueXML
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+LIDAR_RECORDS_TAG = "ListLidarRecords"
+
+AXIS_INDEX = {"x": 0, "y": 1, "z": 2}
+INTENSITY_TAG = "intensity"
+
+# Depth of the record elements: direct children of `<ListLidarRecords>`.
+RECORD_DEPTH = 2
+
+# Files written by `LidarRecords.save()`.
+POINTS_FILENAME = "points.npy"
+INTENSITY_FILENAME = "intensity.npy"
+OFFSETS_FILENAME = "record_offsets.npy"
+RAW_FILENAME = "records.xml"
+
+
+class LidarRecords(OpaqueXML):
+    """Point clouds of an Ariane `ListLidarRecords` block.
+
+    The arrays are read-only: they always match the raw XML. To modify the
+    points, build a new instance with `LidarRecords.from_arrays()`.
+    """
+
+    __slots__ = ("_intensity", "_offsets", "_points")
+
+    def __init__(self, tag: str, raw: str) -> None:
+        super().__init__(tag, raw)
+        self._points: np.ndarray | None = None
+        self._intensity: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+
+    @property
+    def points(self) -> np.ndarray:
+        """`(n_points, 3)` float32 array of the `x, y, z` coordinates."""
+        if self._points is None:
+            self._decode_points()
+        return self._points
+
+    @property
+    def intensity(self) -> np.ndarray | None:
+        """`(n_points,)` float32 array, `None` if no point has an intensity."""
+        if self._points is None:
+            self._decode_points()
+        return self._intensity
+
+    @property
+    def record_offsets(self) -> np.ndarray:
+        """Index of the first point of each record, followed by `n_points`."""
+        if self._points is None:
+            self._decode_points()
+        return self._offsets
+
+    @property
+    def n_points(self) -> int:
+        return len(self.points)
+
+    @property
+    def n_records(self) -> int:
+        return len(self.record_offsets) - 1
+
+    def iter_records(self) -> Iterator[tuple[np.ndarray, np.ndarray | None]]:
+        """Yields the `(points, intensity)` views of each record."""
+        intensity = self.intensity
+        for start, stop in pairwise(self.record_offsets):
+            yield (
+                self.points[start:stop],
+                None if intensity is None else intensity[start:stop],
+            )
+
+    def _decode_points(self) -> None:
+        coords = array("f")
+        intensity = array("f")
+        offsets = array("q")
+        has_intensity = False
+
+        parser = XMLPullParser(events=("start", "end"))
+        parser.feed(self.raw)
+        parser.close()
+
+        depth = 0
+        for event, elem in parser.read_events():
+            if event == "start":
+                depth += 1
+                if depth == RECORD_DEPTH:
+                    offsets.append(len(coords) // 3)
+                continue
+
+            depth -= 1
+            if len(elem) == 0:
+                continue
+
+            fields = {child.tag.lower(): child.text for child in elem}
+            if not AXIS_INDEX.keys() <= fields.keys():
+                continue
+
+            coords.extend(float(fields[axis]) for axis in AXIS_INDEX)
+            if (value := fields.get(INTENSITY_TAG)) is not None:
+                has_intensity = True
+                intensity.append(float(value))
+            else:
+                intensity.append(np.nan)
+            elem.clear()
+
+        offsets.append(len(coords) // 3)
+
+        self._set_arrays(
+            np.frombuffer(coords, dtype=np.float32).reshape(-1, 3),
+            np.frombuffer(intensity, dtype=np.float32) if has_intensity else None,
+            np.frombuffer(offsets, dtype=np.int64),
+        )
+
+    def _set_arrays(
+        self,
+        points: np.ndarray,
+        intensity: np.ndarray | None,
+        offsets: np.ndarray,
+    ) -> None:
+        for arr in (points, intensity, offsets):
+            if arr is not None and arr.flags.writeable:
+                arr.setflags(write=False)
+
+        self._points, self._intensity, self._offsets = points, intensity, offsets
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ BUILDING ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+    @classmethod
+    def from_arrays(
+        cls,
+        points: np.ndarray,
+        intensity: np.ndarray | None = None,
+        record_offsets: np.ndarray | None = None,
+    ) -> LidarRecords:
+        """Builds the records (and their XML) from point arrays.
+
+        Args:
+            points: `(n_points, 3)` array of coordinates.
+            intensity: Optional `(n_points,)` array of intensities.
+            record_offsets: Index of the first point of each record, followed
+                by `n_points`. Default: a single record.
+        """
+        points = np.array(points, dtype=np.float32)  # Copy: made read-only
+        if points.ndim != 2 or points.shape[1] != len(AXIS_INDEX):
+            raise ValueError(f"Expected a `(n, 3)` array, got `{points.shape}`.")
+
+        if intensity is not None:
+            intensity = np.array(intensity, dtype=np.float32)
+            if intensity.shape != (len(points),):
+                raise ValueError(
+                    f"Expected `{len(points)}` intensities, got `{intensity.shape}`."
+                )
+
+        if record_offsets is None:
+            record_offsets = np.array([0, len(points)], dtype=np.int64)
+        record_offsets = np.array(record_offsets, dtype=np.int64)
+        if (
+            record_offsets[0] != 0
+            or record_offsets[-1] != len(points)
+            or np.any(np.diff(record_offsets) < 0)
+        ):
+            raise ValueError("Invalid `record_offsets`.")
+
+        parts = [f"<{LIDAR_RECORDS_TAG}>"]
+        for start, stop in pairwise(record_offsets):
+            parts.append("<LidarRecord><Points>")
+            for idx in range(start, stop):
+                x, y, z = points[idx]
+                # 9 significant digits: float32 values round trip exactly.
+                parts.append(f"<Point><X>{x:.9g}</X><Y>{y:.9g}</Y><Z>{z:.9g}</Z>")
+                if intensity is not None:
+                    parts.append(f"<Intensity>{intensity[idx]:.9g}</Intensity>")
+                parts.append("</Point>")
+            parts.append("</Points></LidarRecord>")
+        parts.append(f"</{LIDAR_RECORDS_TAG}>")
+
+        records = cls(LIDAR_RECORDS_TAG, "".join(parts))
+        records._set_arrays(points, intensity, record_offsets)
+        return records
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ STORAGE ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+    def save(self, directory: str | Path) -> None:
+        """Saves the arrays (`.npy`) and the raw XML into `directory`."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.save(directory / POINTS_FILENAME, self.points)
+        np.save(directory / OFFSETS_FILENAME, self.record_offsets)
+        if self.intensity is not None:
+            np.save(directory / INTENSITY_FILENAME, self.intensity)
+        (directory / RAW_FILENAME).write_text(self.raw, encoding="utf-8")
+
+    @classmethod
+    def load(cls, directory: str | Path, *, mmap: bool = True) -> LidarRecords:
+        """Loads records saved by `save()`.
+
+        With `mmap=True`, the arrays are memory-mapped (read-only): the points
+        are only read from disk when accessed.
+        """
+        directory = Path(directory)
+        mmap_mode = "r" if mmap else None
+
+        records = cls(
+            LIDAR_RECORDS_TAG, (directory / RAW_FILENAME).read_text(encoding="utf-8")
+        )
+        records._set_arrays(
+            np.load(directory / POINTS_FILENAME, mmap_mode=mmap_mode),
+            (
+                np.load(directory / INTENSITY_FILENAME, mmap_mode=mmap_mode)
+                if (directory / INTENSITY_FILENAME).exists()
+                else None
+            ),
+            np.load(directory / OFFSETS_FILENAME, mmap_mode=mmap_mode),
+        )
+        return records
+
+    def __setstate__(self, state: tuple[str, str, dict | None]) -> None:
+        super().__setstate__(state)
+        self._points = self._intensity = self._offsets = None
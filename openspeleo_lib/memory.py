@@ -0,0 +1,284 @@
+"""Deep memory footprint of a survey (see `Survey.memory_report`).
+
+Sizes are computed with `sys.getsizeof`, following the references of each
+object. An object referenced several times (interned strings, shared parent
+links, ...) is only counted once, by the first component reaching it.
+
+For large surveys, only a sample of the shots is measured and the per-shot
+components are extrapolated to the whole survey. Strings are the exception:
+shared between shots (interned names, colors, ...), they are collected from
+every shot and measured once each.
+"""
+
+from __future__ import annotations
+
+import sys
+from enum import Enum
+from operator import attrgetter
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+from pydantic import BaseModel
+
+from openspeleo_lib.opaque_xml import OpaqueXML
+
+if TYPE_CHECKING:
+    from openspeleo_lib.models import Section
+    from openspeleo_lib.models import Shot
+    from openspeleo_lib.models import Survey
+
+COMPONENTS = (
+    "survey",  # Survey / Section objects and containers
+    "shots",  # Shot objects and their non-string values
+    "shapes",  # Wall shapes (decoded dicts or raw XML)
+    "strings",  # String values of the shots and sections
+    "carto",  # Ariane viewer / carto blocks
+    "lidar",  # LiDAR records (raw XML and point arrays)
+    "indexes",  # Lookup tables (see `indexes`)
+    "caches",  # Derived data (see `Survey.derived`)
+)
+
+# Components extrapolated from the sampled shots.
+SHOT_COMPONENTS = ("shots", "shapes")
+
+# Attributes measured separately from their model.
+SHOT_SKIP = frozenset({"shape"})
+SECTION_SKIP = frozenset({"shots", "_declination"})
+SURVEY_SKIP = frozenset({"sections", "_indexes", "_derived"})
+
+LIDAR_FIELDS = frozenset({"list_lidar_records"})
+
+# Shots measured by default.
+DEFAULT_SAMPLE_SIZE = 1_000
+
+# Singletons / shared objects never attributed to a survey.
+_STATIC_TYPES = (type(None), bool, Enum, type)
+
+
+class MemoryReport(NamedTuple):
+    components: dict[str, int]  # Bytes per component, see `COMPONENTS`
+    n_shots: int
+    n_sampled_shots: int
+
+    @property
+    def total(self) -> int:
+        return sum(self.components.values())
+
+    @property
+    def is_sampled(self) -> bool:
+        return self.n_sampled_shots < self.n_shots
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "components": dict(self.components),
+            "total": self.total,
+            "n_shots": self.n_shots,
+            "n_sampled_shots": self.n_sampled_shots,
+        }
+
+
+class DeepSizer:
+    """Measures the deep size of objects, counting each object only once."""
+
+    def __init__(self) -> None:
+        self._seen: set[int] = set()
+
+    def sizeof(self, *objs: Any) -> int:
+        total = 0
+        stack = list(objs)
+        seen = self._seen
+
+        # NumPy is only imported along with the LiDAR records (see `lidar`),
+        # the statistics and the unit conversions.
+        ndarray = getattr(sys.modules.get("numpy"), "ndarray", ())
+
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, _STATIC_TYPES) or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+
+            total += sys.getsizeof(obj)
+
+            if isinstance(obj, (str, bytes, int, float)):
+                continue
+
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+
+            elif isinstance(obj, (list, tuple, set, frozenset)):
+                stack.extend(obj)
+
+            elif isinstance(obj, MappingProxyType):
+                # The proxied dict isn't reachable: measured through a copy.
+                total += sys.getsizeof(dict(obj))
+                stack.extend(obj.values())
+
+            elif isinstance(obj, ndarray):
+                # Owned data is included in `getsizeof`, views hold their base.
+                if obj.base is not None:
+                    stack.append(obj.base)
+
+            elif isinstance(obj, BaseModel):
+                stack.append(obj.__dict__)
+                if obj.__pydantic_private__ is not None:
+                    stack.append(obj.__pydantic_private__)
+
+            else:
+                if (attrs := getattr(obj, "__dict__", None)) is not None:
+                    stack.append(attrs)
+                stack.extend(
+                    getattr(obj, slot, None)
+                    for cls in type(obj).__mro__
+                    for slot in getattr(cls, "__slots__", ())
+                    if slot not in {"__dict__", "__weakref__"}
+                )
+
+        return total
+
+    def shallow(self, obj: Any) -> int:
+        """Size of `obj` alone, marking it as seen."""
+        if id(obj) in self._seen:
+            return 0
+        self._seen.add(id(obj))
+        return sys.getsizeof(obj)
+
+    def ignore(self, *objs: Any) -> None:
+        """Marks `objs` as seen, without measuring them."""
+        self._seen.update(map(id, objs))
+
+
+def _model_size(
+    sizer: DeepSizer, model: BaseModel, skip: frozenset[str] = frozenset()
+) -> tuple[int, list[str], dict[str, Any]]:
+    """Measures a model without its string values and the attributes of `skip`
+    (fields or private attributes).
+
+    Returns the size, the string values and the skipped values.
+    """
+    # pydantic bookkeeping included: `__pydantic_fields_set__` is a set per model
+    size = sizer.shallow(model) + sizer.shallow(model.__dict__)
+    size += sizer.sizeof(model.__pydantic_fields_set__, model.__pydantic_extra__)
+
+    strings: list[str] = []
+    skipped: dict[str, Any] = {}
+
+    # Parent links are weak references: their targets aren't followed.
+    if (private := model.__pydantic_private__) is not None:
+        size += sizer.shallow(private)
+        for name, value in private.items():
+            if name in skip:
+                skipped[name] = value
+            else:
+                size += sizer.sizeof(value)
+
+    for name, value in model.__dict__.items():
+        if name in skip:
+            skipped[name] = value
+        elif isinstance(value, str) and not isinstance(value, Enum):
+            strings.append(value)
+        elif isinstance(value, list) and all(isinstance(v, str) for v in value):
+            size += sizer.shallow(value)
+            strings.extend(value)
+        else:
+            size += sizer.sizeof(value)
+
+    return size, strings, skipped
+
+
+def _sample(shots: list[Shot], sample_size: int | None) -> list[Shot]:
+    if sample_size is None or len(shots) <= sample_size:
+        return shots
+
+    # Evenly spread over the survey: sections differ (shapes, ...)
+    step = len(shots) / sample_size
+    return [shots[int(idx * step)] for idx in range(sample_size)]
+
+
+def _shot_strings(shots: list[Shot]) -> list[str]:
+    # Exact type check: the enums (`shot_type`, ...) are counted with the shots.
+    return [
+        value
+        for attrs in map(attrgetter("__dict__"), shots)
+        for value in attrs.values()
+        if type(value) is str
+    ]
+
+
+def memory_report(
+    survey: Survey, sample_size: int | None = DEFAULT_SAMPLE_SIZE
+) -> MemoryReport:
+    """Returns the deep memory footprint of `survey`, per component.
+
+    Args:
+        survey: Survey to measure.
+        sample_size: Maximum number of shots measured, `None` to measure every
+            shot. The per-shot components are extrapolated from the sample.
+    """
+    if sample_size is not None and sample_size < 1:
+        raise ValueError(f"Invalid sample size: `{sample_size}`")
+
+    sizer = DeepSizer()
+    components = dict.fromkeys(COMPONENTS, 0)
+
+    # ================================ SHOTS ================================ #
+
+    shots = list(survey.shots)
+    sampled = _sample(shots, sample_size)
+
+    for shot in sampled:
+        size, _, skipped = _model_size(sizer, shot, skip=SHOT_SKIP)
+        components["shots"] += size
+        components["shapes"] += sizer.sizeof(skipped["shape"])
+
+    # Not extrapolated: a string shared by many shots is only counted once.
+    components["strings"] = sizer.sizeof(*_shot_strings(shots))
+
+    if sampled and len(sampled) < len(shots):
+        ratio = len(shots) / len(sampled)
+        for name in SHOT_COMPONENTS:
+            components[name] = round(components[name] * ratio)
+
+        # Accounted for by the extrapolation
+        sizer.ignore(*shots)
+
+    # ============================== STRUCTURE ============================== #
+
+    opaque_fields = frozenset(
+        name
+        for name, value in survey.__dict__.items()
+        if isinstance(value, (OpaqueXML, dict))
+    )
+    size, survey_strings, skipped = _model_size(
+        sizer, survey, skip=opaque_fields | SURVEY_SKIP
+    )
+    components["survey"] += size + sizer.shallow(skipped["sections"])
+
+    caches = [skipped["_derived"]]
+    section: Section
+    for section in survey.sections:
+        size, section_strings, section_skipped = _model_size(
+            sizer, section, skip=SECTION_SKIP
+        )
+        components["survey"] += size + sizer.shallow(section.shots)
+        survey_strings.extend(section_strings)
+        caches.append(section_skipped["_declination"])
+
+    components["strings"] += sizer.sizeof(*survey_strings)
+
+    for name in opaque_fields:
+        component = "lidar" if name in LIDAR_FIELDS else "carto"
+        components[component] += sizer.sizeof(skipped[name])
+
+    # ========================== INDEXES & CACHES =========================== #
+
+    # Measured last: the shots / sections they reference are already counted.
+    components["indexes"] = sizer.sizeof(skipped["_indexes"])
+    components["caches"] = sizer.sizeof(*caches)
+
+    return MemoryReport(
+        components=components, n_shots=len(shots), n_sampled_shots=len(sampled)
+    )
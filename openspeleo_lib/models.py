@@ -3,11 +3,13 @@ from __future__ import annotations
 import contextlib
 import datetime
 import math
-from functools import cached_property
+import weakref
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Annotated
+from typing import Any
 from typing import NewType
+from typing import TypeVar
 
 import annotated_types
 import orjson
@@ -15,7 +17,9 @@ from pydantic import UUID4
 from pydantic import BaseModel
 from pydantic import ConfigDict
 from pydantic import Field
+from pydantic import ModelWrapValidatorHandler
 from pydantic import NonNegativeInt
+from pydantic import PrivateAttr
 from pydantic import StringConstraints
 from pydantic import ValidationInfo
 from pydantic import field_serializer
@@ -28,20 +32,42 @@ from openspeleo_lib.constants import OSPL_SHOTNAME_MAX_LENGTH
 from openspeleo_lib.enums import ArianeProfileType
 from openspeleo_lib.enums import ArianeShotType
 from openspeleo_lib.enums import LengthUnits
+from openspeleo_lib.errors import DetachedModelError
 from openspeleo_lib.generators import UniqueValueGenerator
 from openspeleo_lib.geo_utils import GeoLocation
 from openspeleo_lib.geo_utils import get_declination
+from openspeleo_lib.indexes import SurveyIndexes
+from openspeleo_lib.interning import STRING_POOL_CONTEXT_KEY
+from openspeleo_lib.interning import StringPool
+from openspeleo_lib.memory import DEFAULT_SAMPLE_SIZE
+from openspeleo_lib.memory import MemoryReport
+from openspeleo_lib.memory import memory_report
+from openspeleo_lib.opaque_xml import OpaqueXML  # noqa: TC001
+from openspeleo_lib.tracking import TOPOLOGY_FIELDS
+from openspeleo_lib.tracking import DerivedCache
+from openspeleo_lib.tracking import TrackedList
+from openspeleo_lib.tracking import drop_parent_link
+from openspeleo_lib.tracking import is_tracked_change
+from openspeleo_lib.tracking import link_children
+from openspeleo_lib.utils import gc_paused
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from collections.abc import Generator
+    from collections.abc import Iterable
+    from collections.abc import Mapping
     from typing import Self
 
+    from openspeleo_lib.stats import SurveyStats
+
 ShotID = NewType("ShotID", int)
 ShotCompassName = NewType("ShotCompassName", str)
 
 SectionID = NewType("SectionID", int)
 SectionName = NewType("SectionName", str)
 
+T = TypeVar("T")
+
 
 # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ Types ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
 
@@ -64,9 +90,6 @@ class Shot(BaseModel):
         ),
     ] = None
 
-    # Exluded Fields - Upward keys
-    section: Annotated[Section | None, Field(default=None, exclude=True)]
-
     # Ariane shot type (before core fields)
     shot_type: ArianeShotType = ArianeShotType.REAL
 
@@ -91,7 +114,7 @@ class Shot(BaseModel):
     locked: bool = False
 
     # Ariane Specific
-    shape: dict | None = None
+    shape: OpaqueXML | dict | None = None
     profiletype: ArianeProfileType = ArianeProfileType.VERTICAL
 
     # LRUD
@@ -105,6 +128,9 @@ class Shot(BaseModel):
     #     validate_by_name=True, validate_by_alias=True, extra="forbid"
     # )
 
+    # Upward key - see `section`
+    _section: weakref.ref[Section] | None = PrivateAttr(default=None)
+
     @field_validator("length", "left", "right", "up", "down", mode="before")
     @classmethod
     def _ensure_non_negative(
@@ -146,6 +172,31 @@ class Shot(BaseModel):
             case _:
                 raise ValueError(f"Unexpected type received: {type(value)}")
 
+    @field_validator("shape", mode="after")
+    @classmethod
+    def _intern_shape(
+        cls, value: OpaqueXML | dict | None, info: ValidationInfo
+    ) -> OpaqueXML | dict | None:
+        # Wall shapes repeat the same keys / values: interned when validated
+        # with a `StringPool` in the context (see `Survey.from_json_bytes`).
+        if type(value) is dict and info.context:
+            if (pool := info.context.get(STRING_POOL_CONTEXT_KEY)) is not None:
+                return pool.intern_tree(value)
+        return value
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _link_section(cls, data: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        # `Shot(section=...)`: the upward link isn't a field (see `section`).
+        if type(data) is not dict or "section" not in data:
+            return handler(data)
+
+        data = dict(data)
+        section = data.pop("section")
+        shot = handler(data)
+        shot.section = section
+        return shot
+
     @model_validator(mode="after")
     def validate_model(self) -> Self:
         # 1. Validate unique keys
@@ -165,6 +216,34 @@ class Shot(BaseModel):
 
         return self
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        if not is_tracked_change(self, name, value):
+            super().__setattr__(name, value)
+            return
+
+        super().__setattr__(name, value)
+        if (section := self.section) is not None:
+            section._touch(topology=name in TOPOLOGY_FIELDS)  # noqa: SLF001
+
+    def __getstate__(self) -> dict[Any, Any]:
+        return drop_parent_link(super().__getstate__(), "_section")
+
+    @property
+    def section(self) -> Section | None:
+        """Section holding the shot, `None` once detached or garbage collected.
+
+        Weak reference: the section owns its shots, not the other way around.
+        Keep a reference to the survey while using its shots on their own (e.g.
+        `azimuth_true`).
+        """
+        # Read from `__pydantic_private__`: pydantic's `__getattr__` is slow
+        ref = self.__pydantic_private__["_section"]
+        return None if ref is None else ref()
+
+    @section.setter
+    def section(self, section: Section | None) -> None:
+        self._section = None if section is None else weakref.ref(section)
+
     # @field_serializer("color")
     # def serialize_color(self, color: Color | None, _info) -> str | None:
     #     print("hello !")
@@ -213,8 +292,9 @@ class Shot(BaseModel):
     @property
     def azimuth_true(self) -> float:
         if (section := self.section) is None:
-            raise ValueError(
-                "Section is not assigned. Impossible to access magnetic declination."
+            raise DetachedModelError(
+                "Shot is detached from its section (never assigned, or released "
+                "along with its survey). Impossible to access magnetic declination."
             )
 
         return (self.azimuth + section.computed_declination) % 360
@@ -238,9 +318,6 @@ class Section(BaseModel):
         ),
     ]  # Default value not allowed - No `None` value set by default
 
-    # Exluded Fields - Upward keys
-    survey: Annotated[Survey | None, Field(default=None, exclude=True)]
-
     # Attributes
     date: datetime.date | None = None
     description: str | None = None
@@ -262,31 +339,128 @@ class Section(BaseModel):
         validate_by_name=True, validate_by_alias=True, extra="forbid"
     )
 
+    # Upward key - see `survey`
+    _survey: weakref.ref[Survey] | None = PrivateAttr(default=None)
+
+    # Change tracking - see `tracking`
+    _version: int = PrivateAttr(default=0)
+    _declination: tuple[tuple, float] | None = PrivateAttr(default=None)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _link_survey(cls, data: Any, handler: ModelWrapValidatorHandler[Self]) -> Self:
+        # `Section(survey=...)`: the upward link isn't a field (see `survey`).
+        if type(data) is not dict or "survey" not in data:
+            return handler(data)
+
+        data = dict(data)
+        survey = data.pop("survey")
+        section = handler(data)
+        section.survey = survey
+        return section
+
     @model_validator(mode="after")
     def validate_model(self) -> Self:
         # 1. Assigning upward reference to the shot => section
-        for shot in self.shots:
-            shot.section = self
+        self._track_shots()
 
         return self
 
+    def _track_shots(self) -> None:
+        """Links the shots to the section and tracks the mutations of the list."""
+        shots = self.shots
+        if not isinstance(shots, TrackedList) or shots.owner is not self:
+            self.__dict__["shots"] = shots = TrackedList(shots, owner=self)
+
+        link_children(shots, "_section", self)
+
+    def _children_changed(self, shots: Iterable[Shot]) -> None:
+        link_children(shots, "_section", self)
+        self._touch(topology=True)
+
+    def _touch(self, *, topology: bool) -> None:
+        # Called on every tracked write: private attributes read directly
+        private = self.__pydantic_private__
+        private["_version"] += 1
+        if (ref := private["_survey"]) is not None and (survey := ref()) is not None:
+            survey._touch(topology=topology)  # noqa: SLF001
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        changed = is_tracked_change(self, name, value)
+        if name == "shots":
+            value = TrackedList(value, owner=self)
+            self._children_changed(value)
+
+        super().__setattr__(name, value)
+        if changed:
+            self._touch(topology=name in TOPOLOGY_FIELDS)
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied._track_shots()  # noqa: SLF001
+        return copied
+
+    def __getstate__(self) -> dict[Any, Any]:
+        return drop_parent_link(super().__getstate__(), "_survey")
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        self._track_shots()
+
+    @property
+    def survey(self) -> Survey | None:
+        """Survey holding the section, `None` once detached or garbage collected.
+
+        Weak reference: the survey owns its sections, not the other way around.
+        Keep a reference to the survey while using its sections on their own
+        (e.g. `computed_declination`).
+        """
+        ref = self.__pydantic_private__["_survey"]
+        return None if ref is None else ref()
+
+    @survey.setter
+    def survey(self, survey: Survey | None) -> None:
+        self._survey = None if survey is None else weakref.ref(survey)
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the section or one of its shots is modified."""
+        return self._version
+
     @field_serializer("date")
     def serialize_dt(self, dt: datetime.date | None, _info):
         if dt is None:
             return None
         return dt.strftime("%Y-%m-%d")
 
-    @cached_property
+    @property
     def computed_declination(self) -> float:
-        if (geo_anchor := self.survey.geo_anchor) is None:
+        if (survey := self.survey) is None:
+            raise DetachedModelError(
+                "Section is detached from its survey (never assigned, or survey "
+                "garbage collected: keep a reference to the survey). Impossible "
+                "to compute the magnetic declination."
+            )
+
+        if (geo_anchor := survey.geo_anchor) is None:
             raise ValueError(
                 "Impossible to find a known Lat/Long point in this survey."
             )
 
-        return get_declination(
-            location=geo_anchor,
-            dt=datetime.datetime(self.date.year, self.date.month, self.date.day),
-        )
+        # Only recomputed when one of its inputs changes.
+        key = (geo_anchor, self.date)
+        if self._declination is None or self._declination[0] != key:
+            self._declination = (
+                key,
+                get_declination(
+                    location=geo_anchor,
+                    dt=datetime.datetime(
+                        self.date.year, self.date.month, self.date.day
+                    ),
+                ),
+            )
+
+        return self._declination[1]
 
 
 class Survey(BaseModel):
@@ -299,19 +473,32 @@ class Survey(BaseModel):
     first_start_absolute_elevation: NonNegativeFloat = 0.0
     use_magnetic_azimuth: bool = True
 
-    ariane_viewer_layers: dict | None = None
-
-    carto_ellipse: dict | None = None
-    carto_line: dict | None = None
-    carto_linked_surface: dict | None = None
-    carto_overlay: dict | None = None
-    carto_page: dict | None = None
-    carto_rectangle: dict | None = None
-    carto_selection: dict | None = None
-    carto_spline: dict | None = None
-    constraints: dict | None = None
-    list_annotation: dict | None = None
-    list_lidar_records: dict | None = None
+    # Ariane viewer data: never interpreted, possibly kept as raw XML until
+    # accessed (see `OpaqueXML`).
+    ariane_viewer_layers: OpaqueXML | dict | None = None
+
+    carto_ellipse: OpaqueXML | dict | None = None
+    carto_line: OpaqueXML | dict | None = None
+    carto_linked_surface: OpaqueXML | dict | None = None
+    carto_overlay: OpaqueXML | dict | None = None
+    carto_page: OpaqueXML | dict | None = None
+    carto_rectangle: OpaqueXML | dict | None = None
+    carto_selection: OpaqueXML | dict | None = None
+    carto_spline: OpaqueXML | dict | None = None
+    constraints: OpaqueXML | dict | None = None
+    list_annotation: OpaqueXML | dict | None = None
+    # `LidarRecords` (an `OpaqueXML`) when loaded from Ariane.
+    list_lidar_records: OpaqueXML | dict | None = None
+
+    # Lookup tables - see `indexes`
+    _indexes: SurveyIndexes | None = PrivateAttr(default=None)
+
+    # Change tracking - see `tracking`
+    _version: int = PrivateAttr(default=0)
+    _topology_version: int = PrivateAttr(default=0)
+    _changed: bool = PrivateAttr(default=False)
+    _topology_changed: bool = PrivateAttr(default=False)
+    _derived: DerivedCache = PrivateAttr(default_factory=DerivedCache)
 
     model_config = ConfigDict(validate_by_name=True, validate_by_alias=True)
     # model_config = ConfigDict(
@@ -321,15 +508,144 @@ class Survey(BaseModel):
     @model_validator(mode="after")
     def validate_model(self) -> Self:
         # 1. Assigning upward reference to the section => survey
-        for section in self.sections:
-            section.survey = self
+        self._track_sections()
 
         return self
 
+    # =========================== CHANGE TRACKING =========================== #
+
+    def _track_sections(self) -> None:
+        """Links the sections to the survey and tracks the mutations of the list."""
+        sections = self.sections
+        if not isinstance(sections, TrackedList) or sections.owner is not self:
+            self.__dict__["sections"] = sections = TrackedList(sections, owner=self)
+
+        link_children(sections, "_survey", self)
+
+    def _children_changed(self, sections: Iterable[Section]) -> None:
+        for section in sections:
+            section._track_shots()  # noqa: SLF001
+        link_children(sections, "_survey", self)
+        self._touch(topology=True)
+
+    def _touch(self, *, topology: bool) -> None:
+        # The versions are bumped once for a batch of changes, when next read
+        # (see `_versions`): a bulk edit costs a flag per write.
+        private = self.__pydantic_private__
+        private["_changed"] = True
+        if topology:
+            private["_topology_changed"] = True
+
+    def _versions(self) -> tuple[int, int]:
+        """`(version, topology_version)`, bumped for the changes made since
+        they were last read."""
+        private = self.__pydantic_private__
+        if private["_changed"]:
+            private["_changed"] = False
+            private["_version"] += 1
+            if private["_topology_changed"]:
+                private["_topology_changed"] = False
+                private["_topology_version"] += 1
+
+        return private["_version"], private["_topology_version"]
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        changed = is_tracked_change(self, name, value)
+        if name == "sections":
+            value = TrackedList(value, owner=self)
+            self._children_changed(value)
+
+        super().__setattr__(name, value)
+        if changed:
+            self._touch(topology=name in TOPOLOGY_FIELDS)
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied._track_sections()  # noqa: SLF001
+        return copied
+
+    def __setstate__(self, state: dict[Any, Any]) -> None:
+        super().__setstate__(state)
+        self._track_sections()
+
+    def _copy_tree(self) -> Self:
+        """Copy with its own sections and shots, sharing their values (wall
+        shapes, Ariane blocks, ...) with `self`."""
+        sections = [
+            section.model_copy(
+                update={
+                    "shots": [shot.model_copy() for shot in section.shots],
+                    **{
+                        name: list(value)
+                        for name, value in section.__dict__.items()
+                        if type(value) is list
+                    },
+                }
+            )
+            for section in self.sections
+        ]
+        for section in sections:
+            section._track_shots()  # noqa: SLF001
+
+        copied = self.model_copy(update={"sections": sections})
+        copied._indexes = None  # noqa: SLF001
+        copied._derived = DerivedCache()  # noqa: SLF001
+        copied._track_sections()  # noqa: SLF001
+        return copied
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the survey, a section or a shot is modified."""
+        return self._versions()[0]
+
+    @property
+    def topology_version(self) -> int:
+        """Incremented when sections / shots are added, removed or reordered and
+        when the fields identifying / linking the shots are modified."""
+        return self._versions()[1]
+
+    def derived(
+        self, key: str, compute: Callable[[], T], *, topology: bool = False
+    ) -> T:
+        """Returns the value cached under `key`, (re)computed by `compute()` if
+        the survey changed since (only its topology if `topology=True`).
+
+        `compute()` may modify the survey (e.g. propagate coordinates): the
+        value is cached with the version reached once it is done.
+        """
+        entry = self._derived.get(key)
+        version = self._versions()[1 if topology else 0]
+        if entry is None or entry[0] != version:
+            value = compute()
+            version = self._versions()[1 if topology else 0]
+            self._derived[key] = entry = (version, value)
+
+        return entry[1]
+
+    # ================================ JSON ================================= #
+
     @classmethod
-    def from_json(cls, filepath: str | Path) -> Self:
-        with Path(filepath).open(mode="rb") as f:
-            return cls.model_validate(orjson.loads(f.read()))
+    def from_json(cls, filepath: str | Path, *, intern_strings: bool = False) -> Self:
+        """Loads a survey from a JSON file (see `to_json` / `from_json_bytes`)."""
+        return cls.from_json_bytes(
+            Path(filepath).read_bytes(), intern_strings=intern_strings
+        )
+
+    @classmethod
+    def from_json_bytes(
+        cls, data: bytes | str, *, intern_strings: bool = False
+    ) -> Self:
+        """Loads a survey from JSON bytes (see `to_json_bytes`).
+
+        Parsed and validated in a single pass by pydantic-core: no intermediate
+        tree of Python dicts.
+
+        `intern_strings` shares the repeated strings of the wall shapes (see
+        `interning`): a smaller survey, at the cost of a slower load.
+        """
+        context = StringPool().context if intern_strings else None
+        with gc_paused():
+            return cls.model_validate_json(data, context=context)
 
     def to_json(self, filepath: str | Path, beautify: bool = True) -> None:
         """
@@ -337,30 +653,148 @@ class Survey(BaseModel):
 
         Args:
             filepath (str | Path): The filepath where the JSON data will be written.
+            beautify (bool): Indents the JSON and sorts its keys. Compact outputs
+                are written section by section (see `iter_json_bytes`).
 
         Returns:
             None
         """
         with Path(filepath).open(mode="wb") as f:
-            f.write(
-                orjson.dumps(
-                    self.model_dump(mode="json"),
-                    None,
-                    option=(
-                        (orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
-                        if beautify
-                        else None
-                    ),
-                )
+            if beautify:
+                f.write(self.to_json_bytes(beautify=True))
+            else:
+                f.writelines(self.iter_json_bytes())
+
+    def to_json_bytes(self, beautify: bool = True) -> bytes:
+        """Serializes the model to JSON bytes (see `to_json`)."""
+        if beautify:
+            # Sorted keys: not supported by the pydantic-core serializer.
+            return orjson.dumps(
+                self.model_dump(mode="json"),
+                None,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS,
             )
 
+        return self.__pydantic_serializer__.to_json(self)
+
+    def iter_json_bytes(self) -> Generator[bytes]:
+        """Yields the compact JSON of the survey chunk by chunk (one per section).
+
+        The concatenated chunks are identical to `to_json_bytes(beautify=False)`,
+        only one section is serialized at a time.
+        """
+        # Keeps the field order of `model_dump()`: the sections are streamed in
+        # between the fields declared before and after them.
+        fields = list(type(self).model_fields)
+        before = set(fields[: fields.index("sections")])
+
+        # `{"a":1,"b":2}` => `"a":1,"b":2`
+        serializer = self.__pydantic_serializer__
+        head = serializer.to_json(self, include=before)[1:-1]
+        tail = serializer.to_json(self, exclude=before | {"sections"})[1:-1]
+
+        yield b"{" + head + (b"," if head else b"") + b'"sections":['
+        for idx, section in enumerate(self.sections):
+            chunk = section.__pydantic_serializer__.to_json(section)
+            yield b"," + chunk if idx else chunk
+        yield b"]" + (b"," if tail else b"") + tail + b"}"
+
     @property
     def shots(self) -> Generator[Shot]:
         """Returns a flat list of all shots in the survey."""
         for section in self.sections:
             yield from section.shots
 
-    @cached_property
+    def memory_report(
+        self, sample_size: int | None = DEFAULT_SAMPLE_SIZE
+    ) -> MemoryReport:
+        """Deep memory footprint of the survey, per component (see `memory`).
+
+        Only `sample_size` shots are measured (`None`: all of them), the
+        per-shot components are extrapolated from the sample.
+        """
+        return memory_report(self, sample_size=sample_size)
+
+    def convert_units(self, unit: LengthUnits, *, inplace: bool = False) -> Self:
+        """Converts the survey lengths to `unit`: shot lengths, depths and LRUD
+        (see `units`), `first_start_absolute_elevation`.
+
+        The radii of the wall shapes (`Shot.shape`) are rescaled as well, on
+        copies of the shapes.
+
+        Returns a new survey unless `inplace=True`. The new survey has its own
+        sections and shots but shares their other values (Ariane blocks, ...)
+        with `self`: replace them rather than mutating them.
+        """
+        # NumPy is only imported along with the unit conversions
+        from openspeleo_lib.units import conversion_factor  # noqa: PLC0415
+        from openspeleo_lib.units import scale_shot_lengths  # noqa: PLC0415
+        from openspeleo_lib.units import scale_shot_shapes  # noqa: PLC0415
+
+        factor = conversion_factor(self.unit, unit)
+        with gc_paused():
+            survey = self if inplace else self._copy_tree()
+            if factor == 1.0:
+                return survey
+
+            shots = list(survey.shots)
+            scale_shot_lengths(shots, factor)
+            scale_shot_shapes(shots, factor)
+            for section in survey.sections:
+                section._touch(topology=False)  # noqa: SLF001
+
+        survey.first_start_absolute_elevation *= factor
+        survey.unit = unit
+        return survey
+
+    def stats(self) -> SurveyStats:
+        """Surveyed lengths, depth range, per-section / per-date totals, ...
+        (see `stats`).
+
+        The first call reads the shots into NumPy columns, cached until the
+        survey changes: for 1M shots (50k sections, single core), ~1.5s cold
+        of which ~1s reading the shots, then ~0.3s per call. The cold call
+        misses the 1s target: reading 1M pydantic models is bound by the
+        per-object attribute access of the interpreter.
+        """
+        # NumPy is only imported along with the statistics
+        from openspeleo_lib.stats import survey_stats  # noqa: PLC0415
+
+        return survey_stats(self)
+
+    # =============================== INDEXES =============================== #
+
+    @property
+    def indexes(self) -> SurveyIndexes:
+        """Lookup tables, rebuilt when the survey topology changes."""
+        if self._indexes is None or self._indexes.key != self.topology_version:
+            self._indexes = SurveyIndexes(self)
+        return self._indexes
+
+    def invalidate_indexes(self) -> None:
+        """Drops the lookup tables: they are rebuilt on next use."""
+        self._indexes = None
+
+    @property
+    def shot_by_id(self) -> Mapping[int, Shot]:
+        """Shot of each station (`id_stop`), closure shots excluded."""
+        return self.indexes.shot_by_id
+
+    @property
+    def shots_by_name(self) -> Mapping[str, tuple[Shot, ...]]:
+        return self.indexes.shots_by_name
+
+    @property
+    def section_by_name(self) -> Mapping[str, Section]:
+        """First section of each name."""
+        return self.indexes.section_by_name
+
+    @property
+    def children_of(self) -> Mapping[int, tuple[int, ...]]:
+        """Stations surveyed from each station, closure shots excluded."""
+        return self.indexes.children_of
+
+    @property
     def geo_anchor(self) -> GeoLocation | None:
         """Returns the geographic anchor point for the survey.
         This point is being used to calculate geo magnetic declination.
@@ -369,6 +803,9 @@ class Survey(BaseModel):
 
         Result: we just return the first `GeoLocation` found.
         """
+        return self.derived("geo_anchor", self._find_geo_anchor)
+
+    def _find_geo_anchor(self) -> GeoLocation | None:
 
         if not self.sections:
             return None
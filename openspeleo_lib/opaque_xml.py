@@ -0,0 +1,146 @@
+"""Lazily decoded XML subtrees.
+
+Some Ariane blocks (`CartoLine`, `Layers`, ...) are never read by OpenSpeleo but
+used to be converted XML => dict => pydantic => dict => XML on every load and
+save. An `OpaqueXML` keeps such a subtree as the raw XML captured while loading:
+
+- it is only decoded into a dict on first access (it is a read-only `Mapping`),
+- it is written back verbatim when the survey is exported to XML, as long as it
+  hasn't been decoded (the decoded dict may have been modified).
+
+Exporting to XML relies on placeholders: when a model is dumped with an
+`OpaqueXMLRegistry` in the serialization context, each `OpaqueXML` is
+serialized as a unique token. Once the XML document is generated, the
+elements holding a token are substituted with the raw XML by
+`OpaqueXMLRegistry.substitute()`.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterator
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+from typing import Any
+
+from pydantic_core import core_schema
+
+if TYPE_CHECKING:
+    from pydantic import GetCoreSchemaHandler
+    from pydantic import SerializationInfo
+
+# Key of the `OpaqueXMLRegistry` in the pydantic serialization context.
+OPAQUE_XML_CONTEXT_KEY = "opaque_xml"
+
+# Placeholder element emitted in place of an `OpaqueXML`: `<Tag>token</Tag>`.
+PLACEHOLDER_RE = re.compile(r"<([\w.:-]+)>(__ospl_opaque_xml_\d+__)</\1>")
+
+
+class OpaqueXML(Mapping):
+    """Raw XML of an element, decoded into a dict on first access.
+
+    Args:
+        tag: Tag of the element.
+        raw: XML of the element, tags included (e.g. `<Layers>...</Layers>`).
+    """
+
+    __slots__ = ("_data", "raw", "tag")
+
+    def __init__(self, tag: str, raw: str) -> None:
+        self.tag = tag
+        self.raw = raw
+        self._data: dict | None = None
+
+    @property
+    def is_decoded(self) -> bool:
+        return self._data is not None
+
+    def to_dict(self) -> dict:
+        """Returns the decoded element, as `xml_str_to_dict` would have."""
+        if self._data is None:
+            from openspeleo_core import ariane_core  # noqa: PLC0415
+
+            self._data = ariane_core.xml_str_to_dict(
+                f"<root>{self.raw}</root>", keep_null=False
+            )["root"][self.tag]
+        return self._data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.to_dict())
+
+    def __len__(self) -> int:
+        return len(self.to_dict())
+
+    def __repr__(self) -> str:
+        state = "decoded" if self.is_decoded else f"{len(self.raw)} chars"
+        return f"{type(self).__name__}(<{self.tag}>, {state})"
+
+    def __getstate__(self) -> tuple[str, str, dict | None]:
+        return self.tag, self.raw, self._data
+
+    def __setstate__(self, state: tuple[str, str, dict | None]) -> None:
+        self.tag, self.raw, self._data = state
+
+    # ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ PYDANTIC ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        return core_schema.is_instance_schema(
+            cls,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                cls._serialize, info_arg=True
+            ),
+        )
+
+    def _serialize(self, info: SerializationInfo) -> dict | str:
+        if (
+            not self.is_decoded
+            and isinstance(info.context, dict)
+            and (registry := info.context.get(OPAQUE_XML_CONTEXT_KEY)) is not None
+        ):
+            return registry.register(self)
+        return self.to_dict()
+
+
+class OpaqueXMLRegistry:
+    """Collects the `OpaqueXML` serialized as placeholders during a dump."""
+
+    def __init__(self) -> None:
+        self._elements: dict[str, OpaqueXML] = {}
+
+    @property
+    def context(self) -> dict[str, OpaqueXMLRegistry]:
+        """Serialization context to pass to `model_dump(context=...)`."""
+        return {OPAQUE_XML_CONTEXT_KEY: self}
+
+    def register(self, element: OpaqueXML) -> str:
+        token = f"__ospl_opaque_xml_{len(self._elements)}__"
+        self._elements[token] = element
+        return token
+
+    def substitute(self, xml_str: str) -> str:
+        """Replaces the placeholder elements of `xml_str` with their raw XML."""
+        if not self._elements:
+            return xml_str
+
+        def replace(match: re.Match) -> str:
+            element = self._elements[match.group(2)]
+            if element.tag != match.group(1):
+                raise ValueError(
+                    f"Placeholder `{match.group(2)}` found in `<{match.group(1)}>`, "
+                    f"expected `<{element.tag}>`."
+                )
+            return element.raw
+
+        # Single pass: documents can hold thousands of placeholders (wall shapes)
+        xml_str, count = PLACEHOLDER_RE.subn(replace, xml_str)
+        if count != len(self._elements):
+            raise ValueError(
+                f"Found {count} placeholders, expected {len(self._elements)}."
+            )
+        return xml_str
@@ -7,9 +7,35 @@ from typing import get_origin
 from pydantic import BaseModel
 from pydantic.fields import Field
 
+from openspeleo_lib import instrumentation
+
+# Generated models keyed by `(base, id(alias_set), name_suffix)`. The `alias_set`
+# is stored alongside the model to keep its `id()` from being recycled.
+_ALIASED_MODELS: dict[
+    tuple[type[BaseModel], int, str], tuple[dict, type[BaseModel]]
+] = {}
+
 
 def aliased_model(
     base: type[BaseModel], alias_set: dict, name_suffix: str
+) -> type[BaseModel]:
+    """Returns a subclass of `base` with the aliases of `alias_set` injected.
+
+    Building a pydantic model is expensive, hence generated models are cached and
+    shared between calls (including nested models).
+    """
+    key = (base, id(alias_set), name_suffix)
+    if (cached := _ALIASED_MODELS.get(key)) is not None:
+        instrumentation.incr("pydantic.aliased_model_cache_hits")
+        return cached[1]
+
+    model = _build_aliased_model(base, alias_set, name_suffix)
+    _ALIASED_MODELS[key] = (alias_set, model)
+    return model
+
+
+def _build_aliased_model(
+    base: type[BaseModel], alias_set: dict, name_suffix: str
 ) -> type[BaseModel]:
     annotations = {}
     namespace = {}
@@ -0,0 +1,402 @@
+"""Synthetic survey generator.
+
+Builds realistic, arbitrarily large surveys used to benchmark how loading,
+saving and coordinate propagation scale beyond the fixed test artifacts.
+
+Every value is drawn from a `random.Random(seed)` instance: the same parameters
+and seed always produce the exact same survey.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+import random
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+
+from openspeleo_lib.constants import METERS_TO_FEET
+from openspeleo_lib.enums import ArianeProfileType
+from openspeleo_lib.enums import ArianeShotType
+from openspeleo_lib.enums import LengthUnits
+from openspeleo_lib.generators import UniqueValueGenerator
+
+if TYPE_CHECKING:
+    from openspeleo_lib.models import Survey
+
+# Anchors are scattered around this location (Quintana Roo, Mexico)
+SYNTHETIC_ANCHOR_LOCATION = (20.2591549, -87.4865103)
+SYNTHETIC_BASE_DATE = datetime.date(2020, 1, 1)
+
+SYNTHETIC_COLORS = [
+    "0xffffffff",
+    "0x6680e6ff",
+    "0x669999ff",
+    "0xe6994dff",
+    "0x8099ffff",
+    "0xffb366ff",
+]
+
+SYNTHETIC_SURVEYORS = ["Panda", "Skanda", "Koala", "Otter", "Lynx", "Heron"]
+
+# Compass marks missing LRUD values with this placeholder.
+COMPASS_MISSING_VALUE = -9999.0
+COMPASS_SHOTS_HEADER = (
+    "        FROM           TO   LENGTH  BEARING      INC     LEFT"
+    "       UP     DOWN    RIGHT   FLAGS  COMMENTS"
+)
+
+
+class _SurveyBuilder:
+    """Holds the state of a survey being generated."""
+
+    def __init__(self, rng: random.Random, section_size: int, lrud: bool) -> None:
+        self.rng = rng
+        self.section_size = section_size
+        self.lrud = lrud
+
+        self.next_id = 0
+        self.sections: list[dict[str, Any]] = []
+        self.section: dict[str, Any] | None = None
+
+    def new_station_id(self) -> int:
+        station_id = self.next_id
+        self.next_id += 1
+        return station_id
+
+    def new_section(self) -> None:
+        rng = self.rng
+        self.section = {
+            "name": f"Passage {len(self.sections):06d}",
+            "description": "",
+            "date": SYNTHETIC_BASE_DATE + datetime.timedelta(days=rng.randrange(1500)),
+            "explorers": ["Synthetic Expedition"],
+            "surveyors": rng.sample(SYNTHETIC_SURVEYORS, k=2),
+            "color": rng.choice(SYNTHETIC_COLORS),
+            "shots": [],
+        }
+        self.sections.append(self.section)
+
+    def add_shot(self, shot: dict[str, Any]) -> None:
+        if self.section is None or len(self.section["shots"]) >= self.section_size:
+            self.new_section()
+
+        shot.setdefault("color", self.section["color"])
+        self.section["shots"].append(shot)
+
+    def shot_name(self) -> str:
+        return "".join(self.rng.choices(UniqueValueGenerator.VOCAB, k=6))
+
+    def real_shot(
+        self,
+        id_start: int,
+        origin_depth: float,
+        heading: float,
+        id_stop: int | None = None,
+    ) -> tuple[dict[str, Any], float]:
+        """Returns a new `REAL` shot starting at `id_start` and its depth."""
+        rng = self.rng
+
+        length = round(rng.uniform(1.0, 30.0), 2)
+        # Depth delta is bounded by the length so the shot can be projected in 2D.
+        depth = round(abs(origin_depth + rng.uniform(-0.5, 0.5) * length), 2)
+
+        shot = {
+            "id_start": id_start,
+            "id_stop": self.new_station_id() if id_stop is None else id_stop,
+            "name": self.shot_name(),
+            "shot_type": ArianeShotType.REAL,
+            "length": length,
+            "depth": depth,
+            "depth_start": -1.0,
+            "azimuth": round(heading, 2),
+            "inclination": 0.0,
+            "latitude": 0.0,
+            "longitude": 0.0,
+            "profiletype": ArianeProfileType.VERTICAL,
+        }
+
+        if self.lrud:
+            for key in ["left", "right", "up", "down"]:
+                shot[key] = round(rng.uniform(0.0, 5.0), 2)
+
+        return shot, depth
+
+    def start_shot(self, latitude: float, longitude: float) -> dict[str, Any]:
+        return {
+            "id_start": -1,
+            "id_stop": self.new_station_id(),
+            "name": "START",
+            "shot_type": ArianeShotType.START,
+            "length": 0.0,
+            "depth": 0.0,
+            "depth_start": 0.0,
+            "azimuth": 0.0,
+            "inclination": 0.0,
+            "latitude": latitude,
+            "longitude": longitude,
+            "comment": "START",
+            "locked": True,
+        }
+
+    def closure_shot(self, id_start: int, closure_to_id: int) -> dict[str, Any]:
+        return {
+            "id_start": id_start,
+            "id_stop": self.new_station_id(),
+            "name": "CLOSURE:CLOSURE",
+            "shot_type": ArianeShotType.CLOSURE,
+            "length": 0.0,
+            "depth": 0.0,
+            "depth_start": 0.0,
+            "azimuth": 0.0,
+            "closure_to_id": closure_to_id,
+            "inclination": 0.0,
+            "latitude": 0.0,
+            "longitude": 0.0,
+            "color": "0x00000000",
+            "comment": "CLOSURE",
+        }
+
+
+def generate_survey_data(
+    n_shots: int = 1000,
+    *,
+    seed: int = 0,
+    branching: float = 0.05,
+    loop_density: float = 0.01,
+    anchors: int = 1,
+    section_size: int = 100,
+    lrud: bool = True,
+    orphans: int = 0,
+    cycles: int = 0,
+    unit: LengthUnits = LengthUnits.METERS,
+) -> dict[str, Any]:
+    """Generates the raw data of a synthetic survey (see `generate_survey`)."""
+    if n_shots < anchors:
+        raise ValueError(
+            f"`n_shots` ({n_shots}) must be at least equal to `anchors` ({anchors})."
+        )
+
+    if anchors < 1:
+        raise ValueError("At least one anchor is required.")
+
+    if section_size < 1:
+        raise ValueError("`section_size` must be a positive integer.")
+
+    for name, value in [("branching", branching), ("loop_density", loop_density)]:
+        if not 0.0 <= value <= 1.0:
+            raise ValueError(f"`{name}` must be within [0, 1], received: {value}")
+
+    rng = random.Random(seed)
+    builder = _SurveyBuilder(rng=rng, section_size=section_size, lrud=lrud)
+
+    # Each anchor roots its own connected network of `n_shots / anchors` shots.
+    base_lat, base_lon = SYNTHETIC_ANCHOR_LOCATION
+    for anchor_idx in range(anchors):
+        budget = n_shots // anchors + (1 if anchor_idx < n_shots % anchors else 0)
+
+        builder.section = None
+        start = builder.start_shot(
+            latitude=round(base_lat + rng.uniform(-0.05, 0.05), 7),
+            longitude=round(base_lon + rng.uniform(-0.05, 0.05), 7),
+        )
+        builder.add_shot(start)
+        budget -= 1
+
+        # Stations of this network: `(station_id, depth)`
+        stations: list[tuple[int, float]] = [(start["id_stop"], 0.0)]
+        current_id, current_depth = stations[0]
+        heading = rng.uniform(0.0, 360.0)
+
+        while budget > 0:
+            # 1. Branching: resume the survey from a random existing station.
+            if len(stations) > 1 and rng.random() < branching:
+                current_id, current_depth = rng.choice(stations)
+                heading = rng.uniform(0.0, 360.0)
+                builder.new_section()
+
+            # 2. Survey the next station of the current passage.
+            heading = (heading + rng.gauss(0.0, 25.0)) % 360.0
+            shot, current_depth = builder.real_shot(
+                id_start=current_id, origin_depth=current_depth, heading=heading
+            )
+            builder.add_shot(shot)
+            budget -= 1
+
+            current_id = shot["id_stop"]
+            stations.append((current_id, current_depth))
+
+            # 3. Loop closure back to a previously surveyed station.
+            if budget > 0 and len(stations) > 2 and rng.random() < loop_density:
+                closure_to_id, _ = rng.choice(stations[:-1])
+                builder.add_shot(
+                    builder.closure_shot(
+                        id_start=current_id, closure_to_id=closure_to_id
+                    )
+                )
+                budget -= 1
+
+    # Orphans: shots starting from a station which doesn't exist.
+    for _ in range(orphans):
+        missing_id = builder.new_station_id()
+        shot, _ = builder.real_shot(
+            id_start=missing_id, origin_depth=10.0, heading=rng.uniform(0.0, 360.0)
+        )
+        rng.choice(builder.sections)["shots"].append(shot)
+
+    # Cycles: closed rings of 3 shots that can't be reached from any anchor.
+    for _ in range(cycles):
+        ring_ids = [builder.new_station_id() for _ in range(3)]
+        section = rng.choice(builder.sections)
+        for idx, station_id in enumerate(ring_ids):
+            shot, _ = builder.real_shot(
+                id_start=ring_ids[idx - 1],
+                origin_depth=10.0,
+                heading=rng.uniform(0.0, 360.0),
+                id_stop=station_id,
+            )
+            section["shots"].append(shot)
+
+    for section in builder.sections:
+        section.pop("color")
+
+    return {
+        "name": f"Synthetic Survey (n={n_shots}, seed={seed})",
+        "unit": unit,
+        "first_start_absolute_elevation": 0.0,
+        "use_magnetic_azimuth": True,
+        "sections": builder.sections,
+    }
+
+
+def generate_survey(
+    n_shots: int = 1000,
+    *,
+    survey_cls: type[Survey] | None = None,
+    **kwargs,
+) -> Survey:
+    """Generates a deterministic synthetic survey.
+
+    Args:
+        n_shots: Number of connected shots (anchors and loop closures included).
+        survey_cls: Survey model to instantiate, e.g. `ArianeSurvey` to export
+            the result as TML. Defaults to `Survey`.
+        seed: Seed of the random generator.
+        branching: Probability, at each shot, to start a new passage from a
+            random station already surveyed.
+        loop_density: Probability, at each shot, to add a loop closure.
+        anchors: Number of independent networks, each with a geolocated `START`.
+        section_size: Maximum number of shots per section.
+        lrud: Whether to generate LRUD values.
+        orphans: Number of shots (added on top of `n_shots`) without any path
+            to an anchor.
+        cycles: Number of isolated 3-shot cycles (added on top of `n_shots`).
+        unit: Length unit of the survey.
+    """
+    if survey_cls is None:
+        from openspeleo_lib.models import Survey as survey_cls  # noqa: N813, PLC0415
+
+    data = generate_survey_data(n_shots, **kwargs)
+
+    with UniqueValueGenerator.activate_uniqueness():
+        return survey_cls.model_validate(data)
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ COMPASS DAT ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ #
+
+
+def _compass_value(value: float | None, factor: float) -> str:
+    if value is None:
+        return f"{COMPASS_MISSING_VALUE:8.2f}"
+    return f"{value * factor:8.2f}"
+
+
+def survey_to_compass_dat(survey: Survey) -> str:
+    """Serializes a survey to the Compass `.dat` format.
+
+    This is a minimal writer meant to produce benchmark inputs: stations are
+    named after their ID, `START` shots are skipped (Compass stores fixed
+    stations in the `.mak` project) and loop closures become zero-length shots
+    to the closed station.
+    """
+    factor = METERS_TO_FEET if survey.unit == LengthUnits.METERS else 1.0
+    depths = {shot.id_stop: shot.depth for shot in survey.shots}
+
+    lines: list[str] = []
+    for section in survey.sections:
+        if lines:
+            lines.append("\f")
+
+        date = section.date or SYNTHETIC_BASE_DATE
+        lines.extend(
+            [
+                survey.name or "Synthetic Survey",
+                f"SURVEY NAME: {section.name}",
+                f"SURVEY DATE: {date.month} {date.day} {date.year}  COMMENT:",
+                "SURVEY TEAM: ",
+                ",".join(section.surveyors or []),
+                (
+                    f"DECLINATION: {section.declination:7.2f}  "
+                    f"FORMAT: {section.compass_format}  CORRECTIONS:  0.00 0.00 0.00"
+                ),
+                "",
+                COMPASS_SHOTS_HEADER,
+                "",
+            ]
+        )
+
+        for shot in section.shots:
+            match shot.shot_type:
+                case ArianeShotType.START:
+                    continue
+
+                case ArianeShotType.CLOSURE:
+                    from_id, to_id = shot.id_start, shot.closure_to_id
+                    length = bearing = inclination = 0.0
+
+                case _:
+                    from_id, to_id = shot.id_start, shot.id_stop
+                    length, bearing = shot.length, shot.azimuth
+
+                    # Depth is positive downward: going deeper => negative angle
+                    inclination = 0.0
+                    if length > 0 and (origin_depth := depths.get(from_id)) is not None:
+                        ratio = (origin_depth - shot.depth) / length
+                        inclination = math.degrees(
+                            math.asin(max(-1.0, min(1.0, ratio)))
+                        )
+
+            lines.append(
+                f"{f'S{from_id}':>12s} {f'S{to_id}':>12s} "
+                f"{length * factor:8.2f} {bearing:8.2f} {inclination:8.2f} "
+                f"{_compass_value(shot.left, factor)} "
+                f"{_compass_value(shot.up, factor)} "
+                f"{_compass_value(shot.down, factor)} "
+                f"{_compass_value(shot.right, factor)}"
+            )
+
+    return "\r\n".join(lines) + "\r\n"
+
+
+def write_survey(survey: Survey, filepath: str | Path) -> None:
+    """Writes `survey` to `filepath`, the format is inferred from its suffix.
+
+    Supported formats: `.tml` (requires an `ArianeSurvey`), `.json` and `.dat`.
+    """
+    filepath = Path(filepath)
+
+    match filepath.suffix.lower():
+        case ".tml":
+            from openspeleo_lib.interfaces import ArianeInterface  # noqa: PLC0415
+
+            ArianeInterface.to_file(survey, filepath)
+
+        case ".json":
+            survey.to_json(filepath, beautify=False)
+
+        case ".dat":
+            filepath.write_bytes(survey_to_compass_dat(survey).encode("utf-8"))
+
+        case _:
+            raise ValueError(f"Unsupported file format: `{filepath.suffix}`")
@@ -0,0 +1,186 @@
+"""Change tracking of the survey models.
+
+Every `Survey` carries two version counters, bumped whenever the survey or
+one of its sections / shots is modified:
+
+- `version`: any change.
+- `topology_version`: changes of the survey structure (sections and shots
+  added, removed or reordered) or of the fields identifying / linking the
+  shots (`TOPOLOGY_FIELDS`).
+
+`Section` carries its own `version`. Attribute assignments are tracked by the
+models' `__setattr__`, the `sections` / `shots` lists are `TrackedList` which
+report their mutations to their owner.
+
+The survey versions are bumped lazily: a batch of changes made between two
+reads of the versions counts as a single change.
+
+Changes are reported upward through `Shot.section` / `Section.survey`. These
+parent links are weak references: a survey holds no reference cycle, it is
+freed as soon as it is no longer used, without the cycle collector.
+
+Derived data (indexes, geo anchor, propagated coordinates, ...) is cached along
+with the version it was computed at (see `Survey.derived`) and only recomputed
+once the version has changed.
+"""
+
+from __future__ import annotations
+
+import weakref
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from typing import Self
+    from typing import SupportsIndex
+
+    from pydantic import BaseModel
+
+# Parent links: assigning them isn't a modification of the survey.
+LINK_FIELDS = frozenset({"section", "survey"})
+
+# Fields used by the indexes and the shot graph.
+TOPOLOGY_FIELDS = frozenset(
+    {"id_start", "id_stop", "name", "sections", "shot_type", "shots"}
+)
+
+# Values compared by equality: re-assigning an equal value isn't a change.
+_SCALAR_TYPES = (bool, int, float, str)
+
+_MISSING = object()
+
+
+class ListOwner(Protocol):
+    def _children_changed(self, children: Iterable[Any]) -> None: ...
+
+
+class TrackedList(list):
+    """A list reporting its mutations to its owner (a `Section` / `Survey`).
+
+    The owner is notified with the items added to the list, in order to link
+    them to itself. Like the parent links, the owner is weakly referenced.
+    """
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, iterable: Iterable[Any] = (), owner: ListOwner | None = None):
+        super().__init__(iterable)
+        self._owner = None if owner is None else weakref.ref(owner)
+
+    @property
+    def owner(self) -> ListOwner | None:
+        return None if self._owner is None else self._owner()
+
+    def _changed(self, added: Iterable[Any] = ()) -> None:
+        if (owner := self.owner) is not None:
+            owner._children_changed(added)  # noqa: SLF001
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> tuple:
+        # Copies (`deepcopy`, `pickle`) are plain lists, filled once memoized
+        # (items link back to the list owner): the copied owner tracks them again.
+        return list, (), None, iter(self)
+
+    def append(self, item: Any) -> None:
+        super().append(item)
+        self._changed((item,))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        items = list(items)
+        super().extend(items)
+        self._changed(items)
+
+    def insert(self, index: SupportsIndex, item: Any) -> None:
+        super().insert(index, item)
+        self._changed((item,))
+
+    def remove(self, item: Any) -> None:
+        super().remove(item)
+        self._changed()
+
+    def pop(self, index: SupportsIndex = -1) -> Any:
+        item = super().pop(index)
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs) -> None:
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index: SupportsIndex | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            value = list(value)
+        super().__setitem__(index, value)
+        self._changed(value if isinstance(index, slice) else (value,))
+
+    def __delitem__(self, index: SupportsIndex | slice) -> None:
+        super().__delitem__(index)
+        self._changed()
+
+    def __iadd__(self, items: Iterable[Any]) -> Self:
+        self.extend(items)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> Self:
+        result = super().__imul__(count)
+        self._changed()
+        return result
+
+
+class DerivedCache(dict):
+    """`key => (version, value)` cache of the data derived from a survey.
+
+    The values may reference the shots of the survey (e.g. `shot_by_id`):
+    copies (`deepcopy`, `pickle`) of a survey start with an empty cache.
+    """
+
+    __slots__ = ()
+
+    def __deepcopy__(self, memo: dict) -> DerivedCache:
+        return DerivedCache()
+
+    def __reduce__(self) -> tuple:
+        return DerivedCache, ()
+
+
+def link_children(children: Iterable[BaseModel], attr: str, parent: Any) -> None:
+    """Sets the parent link (private attribute `attr`) of `children`."""
+    ref = weakref.ref(parent)
+    for child in children:
+        child.__pydantic_private__[attr] = ref
+
+
+def drop_parent_link(state: dict[Any, Any], attr: str) -> dict[Any, Any]:
+    """Removes a parent link from a pickled model state.
+
+    Weak references can't be pickled: the unpickled parent links its children.
+    """
+    private = state["__pydantic_private__"]
+    if private is not None and private.get(attr) is not None:
+        state = {**state, "__pydantic_private__": {**private, attr: None}}
+    return state
+
+
+def is_tracked_change(model: Any, name: str, value: Any) -> bool:
+    """Whether assigning `value` to `model.<name>` modifies the survey."""
+    if name.startswith("_") or name in LINK_FIELDS:
+        return False
+
+    old = model.__dict__.get(name, _MISSING)
+    return not (
+        old is value
+        or (
+            type(old) is type(value)
+            and isinstance(value, _SCALAR_TYPES)
+            and old == value
+        )
+    )
@@ -0,0 +1,120 @@
+"""Length unit conversion of whole surveys (see `Survey.convert_units`).
+
+The length fields of the shots are rescaled together, as a single NumPy
+matrix, and written back in one pass over the shots. The radii of the Ariane
+wall shapes (`Shot.shape`) are rescaled on copies of the shapes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from operator import attrgetter
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from openspeleo_lib.constants import FEET_TO_METERS
+from openspeleo_lib.constants import METERS_TO_FEET
+from openspeleo_lib.enums import LengthUnits
+
+if TYPE_CHECKING:
+    from openspeleo_lib.models import Shot
+
+# Shot fields expressed in the unit of the survey
+SHOT_LENGTH_FIELDS = ("length", "depth", "depth_start", "left", "right", "up", "down")
+
+# Wall shape: `{"RadiusCollection": {"RadiusVector": [{"length": ...}, ...]}}`
+RADIUS_COLLECTION_KEY = "RadiusCollection"
+RADIUS_VECTOR_KEY = "RadiusVector"
+RADIUS_LENGTH_KEY = "length"
+
+
+def conversion_factor(source: LengthUnits, target: LengthUnits) -> float:
+    """Factor converting lengths from `source` to `target` units."""
+    if source == target:
+        return 1.0
+
+    match (source, target):
+        case (LengthUnits.FEET, LengthUnits.METERS):
+            return FEET_TO_METERS
+        case (LengthUnits.METERS, LengthUnits.FEET):
+            return METERS_TO_FEET
+        case _:
+            raise ValueError(
+                f"Unsupported length unit conversion: {source} => {target}"
+            )
+
+
+def scale_shot_lengths(shots: list[Shot], factor: float) -> None:
+    """Multiplies the length fields of `shots` (see `SHOT_LENGTH_FIELDS`) by
+    `factor`, in place.
+
+    The values are written without validation nor change tracking: the caller
+    marks the sections as modified.
+    """
+    if not shots:
+        return
+
+    attrs = list(map(attrgetter("__dict__"), shots))
+    values = np.array(
+        list(map(itemgetter(*SHOT_LENGTH_FIELDS), attrs)), dtype=np.float64
+    )
+    missing = np.isnan(values)  # `None`
+
+    values *= factor
+    for shot_attrs, row in zip(attrs, values.tolist(), strict=True):
+        shot_attrs.update(zip(SHOT_LENGTH_FIELDS, row, strict=True))
+
+    for column, name in enumerate(SHOT_LENGTH_FIELDS):
+        for idx in np.flatnonzero(missing[:, column]).tolist():
+            attrs[idx][name] = None
+
+
+def _scale_radius(vector: Mapping, factor: float) -> Mapping:
+    if not isinstance(vector, Mapping) or vector.get(RADIUS_LENGTH_KEY) is None:
+        return vector
+
+    length = float(vector[RADIUS_LENGTH_KEY]) * factor
+    # Decoded from Ariane, the values are strings
+    if isinstance(vector[RADIUS_LENGTH_KEY], str):
+        length = str(length)
+    return {**vector, RADIUS_LENGTH_KEY: length}
+
+
+def scale_shape(shape: Mapping, factor: float) -> dict:
+    """Copy of the wall shape `shape` with its radii multiplied by `factor`.
+
+    `shape` is left untouched: only the containers leading to the radii are
+    copied, the other values are shared.
+    """
+    shape = dict(shape)  # Decodes an `OpaqueXML`
+    if not isinstance(collection := shape.get(RADIUS_COLLECTION_KEY), Mapping):
+        return shape
+
+    vectors = collection.get(RADIUS_VECTOR_KEY)
+    if isinstance(vectors, list):
+        vectors = [_scale_radius(vector, factor) for vector in vectors]
+    else:
+        # A single radius isn't wrapped in a list
+        vectors = _scale_radius(vectors, factor)
+
+    shape[RADIUS_COLLECTION_KEY] = {**collection, RADIUS_VECTOR_KEY: vectors}
+    return shape
+
+
+def scale_shot_shapes(shots: list[Shot], factor: float) -> None:
+    """Replaces the wall shape of `shots` with a copy whose radii are
+    multiplied by `factor` (see `scale_shape`).
+
+    Same as `scale_shot_lengths`: written without validation nor change
+    tracking. A shape shared by several shots is copied once.
+    """
+    scaled: dict[int, dict] = {}
+    for shot_attrs in map(attrgetter("__dict__"), shots):
+        if (shape := shot_attrs["shape"]) is None:
+            continue
+
+        if (new_shape := scaled.get(id(shape))) is None:
+            new_shape = scaled[id(shape)] = scale_shape(shape, factor)
+        shot_attrs["shape"] = new_shape
@@ -1,6 +1,12 @@
 from __future__ import annotations
 
+import contextlib
+import gc
 import re
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
 
 
 def camel2snakecase(value: str) -> str:
@@ -31,3 +37,22 @@ def str2bool(value: str) -> bool:
             return False
 
     raise ValueError(f"Cannot convert {value!r} to boolean")
+
+
+@contextlib.contextmanager
+def gc_paused() -> Generator[None]:
+    """Disables the cyclic garbage collector for the duration of the block.
+
+    Loading a survey allocates hundreds of thousands of objects, all of them kept
+    alive: the collections triggered along the way would traverse them for nothing.
+    Surveys hold no reference cycle, pausing the collector doesn't leak them.
+    """
+    if not gc.isenabled():  # Nested / paused by the caller
+        yield
+        return
+
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.enable()
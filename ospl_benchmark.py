@@ -1,12 +1,75 @@
 import argparse
+import re
 import statistics
+import subprocess
+import sys
 import tempfile
 import time
 from pathlib import Path
 
-from pyinstrument import Profiler
+# Modules imported by the `openspeleo` CLI before any command actually runs.
+CLI_STARTUP_MODULES = [
+    "openspeleo_lib.commands.main",
+    "openspeleo_lib.commands.convert",
+    "openspeleo_lib.commands.encrypt",
+    "openspeleo_lib.commands.validate_tml",
+]
+
+# Heavy dependencies which must only be imported on first use.
+CLI_FORBIDDEN_MODULES = [
+    "geojson",
+    "openspeleo_core",
+    "pydantic",
+    "pyproj",
+    "pyIGRF14",
+    "openspeleo_lib.models",
+]
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|\s+(\S+)$")
+
+
+def check_import_time(budget_ms: float) -> int:
+    """Runs `python -X importtime` over the CLI modules and enforces a budget."""
+    result = subprocess.run(  # noqa: S603
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import {', '.join(CLI_STARTUP_MODULES)}",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    imported = {}
+    for line in result.stderr.splitlines():
+        if (match := IMPORTTIME_RE.match(line)) is None:
+            continue
+        self_us, cumulative_us, module = match.groups()
+        imported[module] = (int(self_us), int(cumulative_us))
+
+    # Interpreter bootstrap (`site`, `encodings`, ...) is not accounted for.
+    total_ms = sum(imported[module][1] for module in CLI_STARTUP_MODULES) / 1000.0
+
+    print(f"CLI import time: {total_ms:.1f} ms (budget: {budget_ms:.1f} ms)")  # noqa: T201
+    for module, (self_us, _) in sorted(
+        imported.items(), key=lambda item: item[1][0], reverse=True
+    )[:10]:
+        print(f"  - {module:<50s} {self_us / 1000.0:>7.2f} ms")  # noqa: T201
+
+    status = 0
+    if forbidden := sorted(set(CLI_FORBIDDEN_MODULES) & set(imported)):
+        print(f"[FAIL] Heavy modules imported at startup: {forbidden}")  # noqa: T201
+        status = 1
+
+    if total_ms > budget_ms:
+        print("[FAIL] CLI import time budget exceeded.")  # noqa: T201
+        status = 1
+
+    return status
 
-from openspeleo_lib.interfaces import ArianeInterface
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -21,8 +84,29 @@ if __name__ == "__main__":
         default=False,
     )
 
+    parser.add_argument(
+        "--importtime",
+        action="store_true",
+        help="Check the `openspeleo` CLI import time against `--budget_ms`.",
+        default=False,
+    )
+
+    parser.add_argument(
+        "--budget_ms",
+        type=float,
+        help="Import time budget of the `openspeleo` CLI in milliseconds.",
+        default=75.0,
+    )
+
     args = parser.parse_args()
 
+    if args.importtime:
+        sys.exit(check_import_time(budget_ms=args.budget_ms))
+
+    from pyinstrument import Profiler
+
+    from openspeleo_lib.interfaces import ArianeInterface
+
     with tempfile.TemporaryDirectory() as tmp_d:
         target_f = Path(tmp_d) / "export.tml"
 
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import shlex
 import subprocess
+import sys
 import unittest
 
 
@@ -31,6 +32,67 @@ class TestOpenspeleoCommands(unittest.TestCase):
         assert "positional arguments:" in result.stdout
         assert "options:" in result.stdout
 
+    def test_lazy_imports(self):
+        """Heavy dependencies must not be imported before a command actually runs."""
+        modules = [
+            "openspeleo_lib.commands.bench",
+            "openspeleo_lib.commands.main",
+            "openspeleo_lib.commands.convert",
+            "openspeleo_lib.commands.decrypt",
+            "openspeleo_lib.commands.encrypt",
+            "openspeleo_lib.commands.serve",
+            "openspeleo_lib.commands.synthetic",
+            "openspeleo_lib.commands.validate_tml",
+        ]
+        heavy_modules = ["geojson", "pydantic", "pyproj", "openspeleo_lib.models"]
+
+        result = subprocess.run(  # noqa: S603
+            [
+                sys.executable,
+                "-c",
+                (
+                    f"import sys, {', '.join(modules)}; "
+                    f"print(sorted(m for m in {heavy_modules!r} if m in sys.modules))"
+                ),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+
+        # Nor NumPy along with the models
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, openspeleo_lib.models; print('numpy' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
+        # Nor the models along with the fast TML validation
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                (
+                    "import sys, openspeleo_lib.interfaces.ariane.validation; "
+                    "print('openspeleo_lib.models' in sys.modules)"
+                ),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "False"
+
 
 if __name__ == "__main__":
     unittest.main()
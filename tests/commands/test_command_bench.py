@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import shlex
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+import orjson
+
+from openspeleo_lib.commands.bench import STAGES
+from openspeleo_lib.commands.bench import bench_file
+from openspeleo_lib.commands.bench import compare_to_baseline
+
+
+class TestBenchCommand(unittest.TestCase):
+    def setUp(self):
+        self.cmd = "openspeleo bench"
+        self.file = Path("tests/artifacts/hand_survey.tml")
+
+    def run_command(self, command: str):
+        return subprocess.run(  # noqa: S603
+            shlex.split(command),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_bench_json_output(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = Path(tmp_dir) / "bench.json"
+            result = self.run_command(
+                f"{self.cmd} {self.file} -n 2 --warmup 0 -o {output_file}"
+            )
+            assert result.returncode == 0, result.stderr
+
+            results = orjson.loads(output_file.read_bytes())
+            file_results = results["files"]["hand_survey.tml"]
+            assert set(file_results["stages"]) == set(STAGES)
+            assert file_results["shots"] == 90
+
+            for stats in file_results["stages"].values():
+                assert stats["median"] > 0
+                assert stats["peak_memory"] >= 0
+            assert file_results["survey_memory"] > 0
+
+            # Comparing against itself with a generous threshold never fails.
+            result = self.run_command(
+                f"{self.cmd} {self.file} -n 1 --warmup 0 --no_memory "
+                f"--baseline {output_file} --threshold 1000"
+            )
+            assert result.returncode == 0, result.stderr
+            assert "No regression detected." in result.stderr
+
+    def test_bench_stdout(self):
+        result = self.run_command(f"{self.cmd} {self.file} -n 1 --warmup 0 -o -")
+        assert result.returncode == 0, result.stderr
+        assert self.file.name in orjson.loads(result.stdout)["files"]
+
+    def test_same_file_names(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            files = [Path(tmp_dir) / name / self.file.name for name in ("a", "b")]
+            for filepath in files:
+                filepath.parent.mkdir()
+                shutil.copy(self.file, filepath)
+
+            result = self.run_command(
+                f"{self.cmd} {files[0]} {files[1]} -n 1 --warmup 0 --no_memory -o -"
+            )
+            assert result.returncode == 0, result.stderr
+            assert set(orjson.loads(result.stdout)["files"]) == {
+                "a/hand_survey.tml",
+                "b/hand_survey.tml",
+            }
+
+    def test_file_doesnt_exist(self):
+        result = self.run_command(f"{self.cmd} hello.tml")
+        assert "FileNotFoundError: File not found: `hello.tml`" in result.stderr
+
+
+class TestBenchFile(unittest.TestCase):
+    def test_no_anchor_skips_geojson(self):
+        results = bench_file(
+            Path("tests/artifacts/test_simple.mini.tml"),
+            iterations=1,
+            warmup=0,
+            trace_memory=False,
+        )
+        assert "geojson_propagation" not in results["stages"]
+        assert "geojson_serialization" not in results["stages"]
+        assert "peak_memory" not in results["stages"]["validation"]
+        assert "survey_memory" not in results
+
+    def test_compare_to_baseline(self):
+        def make_results(median: float) -> dict:
+            return {
+                "files": {
+                    "a.tml": {
+                        "stages": {"validation": {"median": median}},
+                        "total": {"median": median},
+                    }
+                }
+            }
+
+        baseline = make_results(0.100)
+
+        assert (
+            compare_to_baseline(
+                make_results(0.105), baseline, threshold=10.0, min_delta=0.0
+            )
+            == []
+        )
+
+        regressions = compare_to_baseline(
+            make_results(0.150), baseline, threshold=10.0, min_delta=0.0
+        )
+        assert len(regressions) == 2
+        assert regressions[0].startswith("a.tml [validation]")
+
+        # Below the absolute `min_delta` => ignored.
+        assert (
+            compare_to_baseline(
+                make_results(0.150), baseline, threshold=10.0, min_delta=0.1
+            )
+            == []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
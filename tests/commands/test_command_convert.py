@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+import orjson
+import pytest
+
+from openspeleo_lib.commands.convert import iter_serialized_survey
+from openspeleo_lib.commands.convert import serialize_survey
+from openspeleo_lib.interfaces import ArianeInterface
+
+ARTIFACTS = [
+    Path("tests/artifacts/hand_survey.tml"),
+    Path("tests/artifacts/test_simple.mini.tml"),
+    Path("tests/artifacts/test_ariane_v26.tml"),
+]
+
+
+class TestConvertCommand(unittest.TestCase):
+    def setUp(self):
+        self.cmd = "openspeleo convert"
+
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = Path(self._tmp_dir.name) / "input"
+        self.output_dir = Path(self._tmp_dir.name) / "output"
+
+        self.input_dir.mkdir()
+        for artifact in ARTIFACTS:
+            shutil.copy(artifact, self.input_dir / artifact.name)
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def run_command(self, command: str):
+        return subprocess.run(  # noqa: S603
+            shlex.split(command),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_single_file(self):
+        output_file = Path(self._tmp_dir.name) / "hand_survey.geojson"
+        result = self.run_command(
+            f"{self.cmd} -i {ARTIFACTS[0]} -o {output_file} -f geojson"
+        )
+        assert result.returncode == 0, result.stderr
+        assert output_file.exists()
+
+    def test_batch_directory(self):
+        result = self.run_command(
+            f"{self.cmd} --input-dir {self.input_dir} --output-dir {self.output_dir} "
+            "--glob '*.tml' -f json -j 2"
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Converted: 3 - Skipped: 0 - Failed: 0" in result.stdout
+
+        for artifact in ARTIFACTS:
+            assert (self.output_dir / f"{artifact.name}.json").exists()
+
+        # Outputs are newer than their inputs => nothing to do.
+        result = self.run_command(
+            f"{self.cmd} --input_dir {self.input_dir} --output_dir {self.output_dir} "
+            "-f json -j 2"
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Converted: 0 - Skipped: 3 - Failed: 0" in result.stdout
+
+        # Touching an input makes its output stale.
+        input_f = self.input_dir / ARTIFACTS[0].name
+        output_f = self.output_dir / f"{ARTIFACTS[0].name}.json"
+        mtime = output_f.stat().st_mtime + 10
+        os.utime(input_f, (mtime, mtime))
+
+        result = self.run_command(
+            f"{self.cmd} --input_dir {self.input_dir} --output_dir {self.output_dir} "
+            "-f json"
+        )
+        assert result.returncode == 0, result.stderr
+        assert "Converted: 1 - Skipped: 2 - Failed: 0" in result.stdout
+
+    def test_batch_directory_failures(self):
+        shutil.copy("tests/artifacts/empty.tml", self.input_dir / "empty.tml")
+
+        result = self.run_command(
+            f"{self.cmd} --input_dir {self.input_dir} --output_dir {self.output_dir} "
+            "-f json -j 2"
+        )
+        assert result.returncode == 1
+        assert "Converted: 3 - Skipped: 0 - Failed: 1" in result.stdout
+        assert "[FAILED]" in result.stdout
+        assert "EmptySurveyError" in result.stdout
+
+    def test_batch_directory_requires_output_dir(self):
+        result = self.run_command(
+            f"{self.cmd} --input_dir {self.input_dir} -o out.json -f json"
+        )
+        assert result.returncode != 0
+        assert "`--input_dir` requires `--output_dir`." in result.stderr
+
+    def test_stdin_stdout(self):
+        output_file = Path(self._tmp_dir.name) / "hand_survey.geojson"
+        result = self.run_command(
+            f"{self.cmd} -i {ARTIFACTS[0]} -o {output_file} -f geojson"
+        )
+        assert result.returncode == 0, result.stderr
+
+        result = subprocess.run(  # noqa: S603
+            shlex.split(f"{self.cmd} -i - -o - -f geojson"),
+            input=ARTIFACTS[0].read_bytes(),
+            capture_output=True,
+            check=False,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout == output_file.read_bytes()
+
+    def test_stdout_beautify(self):
+        result = self.run_command(f"{self.cmd} -i {ARTIFACTS[0]} -o - -f json -b")
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.startswith("{\n  ")
+        assert len(orjson.loads(result.stdout)["sections"]) > 0
+
+
+@pytest.mark.parametrize("fmt", ["json", "geojson"])
+def test_iter_serialized_survey(fmt: str):
+    """Streamed chunks must be identical to the one-shot serialization."""
+    expected = serialize_survey(ArianeInterface.from_file(ARTIFACTS[0]), fmt=fmt)
+
+    chunks = list(
+        iter_serialized_survey(ArianeInterface.from_file(ARTIFACTS[0]), fmt=fmt)
+    )
+    assert len(chunks) > 2
+    assert b"".join(chunks) == expected
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import base64
+import shlex
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+
+from openspeleo_lib.encryption import MAGIC
+from openspeleo_lib.encryption import decrypt_file
+
+
+class TestEncryptCommand(unittest.TestCase):
+    def setUp(self):
+        self.cmd = "openspeleo encrypt"
+        self.file = Path("tests/artifacts/hand_survey.tml")
+        self.key = AESSIV.generate_key(512)
+
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp_dir.name)
+
+        self.env_file = self.tmp_dir / ".env"
+        self.env_file.write_text(
+            f"ARTIFACT_ENCRYPTION_KEY={base64.urlsafe_b64encode(self.key).decode()}\n"
+        )
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def run_command(self, command: str):
+        return subprocess.run(  # noqa: S603
+            shlex.split(command),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_encrypt(self):
+        output_file = self.tmp_dir / "hand_survey.tml.encrypted"
+
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {output_file} -e {self.env_file} -z"
+        )
+        assert result.returncode == 0, result.stderr
+        assert output_file.read_bytes().startswith(MAGIC)
+
+        decrypt_file(output_file, self.tmp_dir / "hand_survey.tml", self.key)
+        assert (self.tmp_dir / "hand_survey.tml").read_bytes() == (
+            self.file.read_bytes()
+        )
+
+    def test_threads_and_level(self):
+        output_file = self.tmp_dir / "hand_survey.tml.encrypted"
+
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {output_file} -e {self.env_file} -z "
+            "--threads 2 --level 3"
+        )
+        assert result.returncode == 0, result.stderr
+
+        decrypt_file(output_file, self.tmp_dir / "hand_survey.tml", self.key)
+        assert (self.tmp_dir / "hand_survey.tml").read_bytes() == (
+            self.file.read_bytes()
+        )
+
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {output_file} -e {self.env_file} -z -w "
+            "--level 10"
+        )
+        assert "Invalid compression level: `10`" in result.stderr
+
+    def test_file_exists(self):
+        output_file = self.tmp_dir / "hand_survey.tml.encrypted"
+        output_file.touch()
+
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {output_file} -e {self.env_file}"
+        )
+        assert "FileExistsError" in result.stderr
+
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {output_file} -e {self.env_file} -w"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_encrypt_decrypt_directory(self):
+        data_dir = self.tmp_dir / "data"
+        data_dir.mkdir()
+        shutil.copy(self.file, data_dir)
+        shutil.copy("tests/artifacts/test_simple.mini.tml", data_dir)
+
+        encrypt_cmd = (
+            f"{self.cmd} --input_dir {data_dir} -e {self.env_file} -z -j 2 -t 2"
+        )
+        decrypt_cmd = f"openspeleo decrypt --input_dir {data_dir} -e {self.env_file}"
+
+        result = self.run_command(encrypt_cmd)
+        assert result.returncode == 0, result.stderr
+        assert "Encrypted: 2 - Total: 2" in result.stdout
+        assert (data_dir / "manifest.json").exists()
+
+        result = self.run_command(encrypt_cmd)
+        assert "Skipped: 2 - Total: 2" in result.stdout
+
+        (data_dir / "hand_survey.tml").unlink()
+        result = self.run_command(decrypt_cmd)
+        assert result.returncode == 0, result.stderr
+        assert "Decrypted: 1 - Skipped: 1 - Total: 2" in result.stdout
+        assert (data_dir / "hand_survey.tml").read_bytes() == self.file.read_bytes()
+
+        # Single file mode
+        output_file = self.tmp_dir / "decrypted.tml"
+        result = self.run_command(
+            f"openspeleo decrypt -i {data_dir / 'hand_survey.tml.encrypted'} "
+            f"-o {output_file} -e {self.env_file}"
+        )
+        assert result.returncode == 0, result.stderr
+        assert output_file.read_bytes() == self.file.read_bytes()
+
+    def test_missing_output_file(self):
+        result = self.run_command(f"{self.cmd} -i {self.file} -e {self.env_file}")
+        assert "`--input_file` requires `--output_file`" in result.stderr
+
+    def test_missing_key(self):
+        self.env_file.write_text("")
+        result = self.run_command(
+            f"{self.cmd} -i {self.file} -o {self.tmp_dir / 'out'} -e {self.env_file}"
+        )
+        assert "No AES-SIV key found" in result.stderr
+
+
+if __name__ == "__main__":
+    unittest.main()
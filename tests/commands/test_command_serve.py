@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import http.client
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import orjson
+
+from openspeleo_lib.commands.serve import ConversionServer
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """Stand-in client talking HTTP over a Unix socket."""
+
+    def __init__(self, path: str, timeout: float = 60.0):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class ServerThread:
+    """Runs a `ConversionServer` on a background event loop."""
+
+    def __init__(self, **kwargs):
+        self.server = ConversionServer(**kwargs)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> ConversionServer:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(60)
+        return self.server
+
+    def __exit__(self, *exc) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(60)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+def request(
+    conn: http.client.HTTPConnection, method: str, path: str, body: bytes | None = None
+) -> tuple[int, dict]:
+    try:
+        conn.request(method, path, body=body)
+        response = conn.getresponse()
+        return response.status, orjson.loads(response.read())
+    finally:
+        conn.close()
+
+
+def _slow_task(*args) -> tuple:
+    time.sleep(2)
+    return True, b"{}"
+
+
+def _crashing_task(*args) -> tuple:
+    os._exit(1)
+
+
+class TestServeCommand(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server_thread = ServerThread(port=0, workers=1, timeout=60.0)
+        cls.server = cls.server_thread.__enter__()
+        cls.host, cls.port = cls.server.address
+
+        cls.tml_data = Path("tests/artifacts/hand_survey.tml").read_bytes()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server_thread.__exit__(None, None, None)
+
+    def connect(self) -> http.client.HTTPConnection:
+        return http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+    def test_health(self):
+        status, data = request(self.connect(), "GET", "/health")
+        assert status == 200
+        assert data["status"] == "ok"
+        assert data["in_flight"] == 0
+
+    def test_convert_json(self):
+        status, data = request(self.connect(), "POST", "/convert", self.tml_data)
+        assert status == 200
+        assert len(data["sections"]) > 0
+
+    def test_convert_geojson(self):
+        status, data = request(
+            self.connect(), "POST", "/convert?format=geojson", self.tml_data
+        )
+        assert status == 200
+        assert data["type"] == "FeatureCollection"
+
+        status, data_alias = request(self.connect(), "POST", "/geojson", self.tml_data)
+        assert status == 200
+        assert data_alias == data
+
+    def test_validate(self):
+        status, data = request(self.connect(), "POST", "/validate", self.tml_data)
+        assert status == 200
+        assert data == {"valid": True}
+
+    def test_validate_invalid_file(self):
+        status, data = request(
+            self.connect(),
+            "POST",
+            "/validate",
+            Path("tests/artifacts/empty.tml").read_bytes(),
+        )
+        assert status == 422
+        assert data["valid"] is False
+        assert "EmptySurveyError" in data["error"]
+
+    def test_unsupported_format(self):
+        status, _ = request(
+            self.connect(), "POST", "/convert?format=xml", self.tml_data
+        )
+        assert status == 400
+
+    def test_unknown_route(self):
+        status, _ = request(self.connect(), "POST", "/unknown", self.tml_data)
+        assert status == 404
+
+    def test_method_not_allowed(self):
+        status, _ = request(self.connect(), "GET", "/convert")
+        assert status == 405
+
+
+class TestServeTimeout(unittest.TestCase):
+    def test_request_timeout(self):
+        with ServerThread(port=0, workers=1, timeout=1e-6) as server:
+            host, port = server.address
+            status, data = request(
+                http.client.HTTPConnection(host, port, timeout=60),
+                "POST",
+                "/validate",
+                Path("tests/artifacts/hand_survey.tml").read_bytes(),
+            )
+        assert status == 504
+        assert data["error"] == "Gateway Timeout"
+
+    def test_timed_out_job_keeps_its_slot(self):
+        with (
+            mock.patch("openspeleo_lib.commands.serve._run_task", _slow_task),
+            ServerThread(port=0, workers=1, max_queue=0, timeout=0.1) as server,
+        ):
+            host, port = server.address
+
+            def connect():
+                return http.client.HTTPConnection(host, port, timeout=60)
+
+            status, _ = request(connect(), "POST", "/validate", b"")
+            assert status == 504
+
+            # The worker is still busy with the timed-out job
+            _, data = request(connect(), "GET", "/health")
+            assert data["in_flight"] == 1
+            status, _ = request(connect(), "POST", "/validate", b"")
+            assert status == 503
+
+            deadline = time.monotonic() + 30
+            while request(connect(), "GET", "/health")[1]["in_flight"]:
+                assert time.monotonic() < deadline
+                time.sleep(0.1)
+
+
+class TestServeWorkerCrash(unittest.TestCase):
+    def test_broken_pool_is_replaced(self):
+        with ServerThread(port=0, workers=1) as server:
+            host, port = server.address
+
+            def connect():
+                return http.client.HTTPConnection(host, port, timeout=60)
+
+            with mock.patch("openspeleo_lib.commands.serve._run_task", _crashing_task):
+                status, data = request(connect(), "POST", "/validate", b"")
+            assert status == 503
+            assert data["error"] == "Worker crashed"
+
+            status, data = request(
+                connect(),
+                "POST",
+                "/validate",
+                Path("tests/artifacts/hand_survey.tml").read_bytes(),
+            )
+            assert status == 200
+            assert data == {"valid": True}
+
+            _, data = request(connect(), "GET", "/health")
+            assert data["in_flight"] == 0
+
+
+class TestServeUnixSocket(unittest.TestCase):
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            socket_path = str(Path(tmp_dir) / "openspeleo.sock")
+            with ServerThread(unix_socket=socket_path, workers=1):
+                status, data = request(
+                    UnixHTTPConnection(socket_path),
+                    "POST",
+                    "/validate",
+                    Path("tests/artifacts/hand_survey.tml").read_bytes(),
+                )
+            assert status == 200
+            assert data == {"valid": True}
+            assert not Path(socket_path).exists()
+
+
+if __name__ == "__main__":
+    unittest.main()
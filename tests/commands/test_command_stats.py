@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import shlex
+import subprocess
+import unittest
+from pathlib import Path
+
+import orjson
+
+
+class TestStatsCommand(unittest.TestCase):
+    def setUp(self):
+        self.cmd = "openspeleo stats"
+        self.file = Path("tests/artifacts/hand_survey.tml")
+
+    def run_command(self, command: str):
+        return subprocess.run(  # noqa: S603
+            shlex.split(command),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_stats(self):
+        result = self.run_command(f"{self.cmd} {self.file} --sections")
+        assert result.returncode == 0, result.stderr
+        assert "Plan length" in result.stdout
+        assert "2024-04-07" in result.stdout
+        assert "Main Line - T1 Right" in result.stdout
+
+    def test_stats_json(self):
+        result = self.run_command(f"{self.cmd} {self.file} --json")
+        assert result.returncode == 0, result.stderr
+
+        stats = orjson.loads(result.stdout)["stats"]
+        assert stats["n_shots"] == 90
+        assert stats["length"] > stats["plan_length"] > 0
+        assert stats["dates"][0]["date"] == "2024-04-07"
+        assert "memory" not in orjson.loads(result.stdout)
+
+    def test_memory(self):
+        result = self.run_command(f"{self.cmd} --memory {self.file}")
+        assert result.returncode == 0, result.stderr
+        assert "90 shots" in result.stdout
+        assert "shapes" in result.stdout
+
+    def test_memory_json(self):
+        result = self.run_command(
+            f"{self.cmd} --memory {self.file} --json --lazy_shapes --sample_size 10"
+        )
+        assert result.returncode == 0, result.stderr
+
+        results = orjson.loads(result.stdout)
+        assert results["shots"] == 90
+        assert results["memory"]["n_sampled_shots"] == 10
+        assert results["memory"]["total"] > 0
+
+    def test_file_doesnt_exist(self):
+        result = self.run_command(f"{self.cmd} hello.tml")
+        assert "FileNotFoundError: File not found: `hello.tml`" in result.stderr
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import shlex
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from openspeleo_lib.interfaces import ArianeInterface
+
+
+class TestSyntheticCommand(unittest.TestCase):
+    def setUp(self):
+        self.cmd = "openspeleo synthetic"
+
+    def run_command(self, command: str):
+        return subprocess.run(  # noqa: S603
+            shlex.split(command),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_generate_tml(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = Path(tmp_dir) / "synthetic.tml"
+            result = self.run_command(
+                f"{self.cmd} -o {output_file} -n 500 --seed 3 --anchors 2 "
+                "--orphans 2 --cycles 1"
+            )
+            assert result.returncode == 0, result.stderr
+
+            survey = ArianeInterface.from_file(output_file)
+            assert sum(1 for _ in survey.shots) == 500 + 2 + 3
+
+            # Same seed => same file content
+            output_file_2 = Path(tmp_dir) / "synthetic_2.tml"
+            result = self.run_command(
+                f"{self.cmd} -o {output_file_2} -n 500 --seed 3 --anchors 2 "
+                "--orphans 2 --cycles 1"
+            )
+            assert result.returncode == 0, result.stderr
+
+            survey_2 = ArianeInterface.from_file(output_file_2)
+
+            # Shot UUIDs are randomly assigned on export
+            exclude = {"sections": {"__all__": {"shots": {"__all__": {"id"}}}}}
+            assert survey.model_dump(exclude=exclude) == survey_2.model_dump(
+                exclude=exclude
+            )
+
+    def test_generate_dat(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = Path(tmp_dir) / "synthetic.dat"
+            result = self.run_command(f"{self.cmd} -o {output_file} -n 100")
+            assert result.returncode == 0, result.stderr
+            assert "SURVEY NAME:" in output_file.read_text()
+
+    def test_file_exists(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output_file = Path(tmp_dir) / "synthetic.json"
+            output_file.touch()
+
+            result = self.run_command(f"{self.cmd} -o {output_file} -n 100")
+            assert "FileExistsError" in result.stderr
+
+            result = self.run_command(f"{self.cmd} -o {output_file} -n 100 -w")
+            assert result.returncode == 0, result.stderr
+
+    def test_unsupported_format(self):
+        result = self.run_command(f"{self.cmd} -o synthetic.xml")
+        assert "Unsupported file format: `.xml`" in result.stderr
+
+
+if __name__ == "__main__":
+    unittest.main()
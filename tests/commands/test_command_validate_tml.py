@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import shlex
+import shutil
 import subprocess
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -34,6 +36,40 @@ class TestValidateTMLCommand(unittest.TestCase):
         result = self.run_command(f"{self.cmd} --input_file={self.file} invalid_flag")
         assert "unrecognized arguments: invalid_flag" in result.stderr
 
+    def test_fast_mode(self):
+        result = self.run_command(f"{self.cmd} --input_file={self.file} --fast")
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == f"Filepath: `{self.file}` ... VALID"
+
+        result = self.run_command(
+            f"{self.cmd} -i tests/artifacts/empty.tml --fast --max-errors 1"
+        )
+        assert result.returncode == 1
+        assert "- The survey is empty" in result.stdout
+
+    def test_input_dir(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for filename in ["hand_survey.tml", "test_simple.mini.tml", "empty.tml"]:
+                shutil.copy(Path("tests/artifacts") / filename, tmp_dir)
+
+            for flags in ["--fast -j 2", "-j 1"]:
+                result = self.run_command(f"{self.cmd} --input-dir {tmp_dir} {flags}")
+                assert result.returncode == 1, result.stderr
+                assert "Valid: 2 - Invalid: 1 - Total: 3" in result.stdout
+                assert f"[INVALID] {Path(tmp_dir) / 'empty.tml'}" in result.stdout
+
+            result = self.run_command(
+                f"{self.cmd} --input-dir {tmp_dir} --fast -g 'hand_*.tml'"
+            )
+            assert result.returncode == 0, result.stderr
+            assert "Valid: 1 - Invalid: 0 - Total: 1" in result.stdout
+
+    def test_input_file_and_dir_exclusive(self):
+        result = self.run_command(
+            f"{self.cmd} --input_file={self.file} --input_dir=tests/artifacts"
+        )
+        assert "not allowed with argument" in result.stderr
+
     def test_help_output(self):
         """Test the help command to ensure the help message is displayed."""
         result = self.run_command(f"{self.cmd} --help")
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import base64
 import logging
-import lzma
 import os
 from pathlib import Path
 
-from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+from openspeleo_lib.encryption import decrypt_directory
+from openspeleo_lib.encryption import load_key
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -27,39 +26,34 @@ PRIVATE_COMPASS_DATA_DIR = PRIVATE_DATA_DIR / "compass"
 # Decryption
 # =============================================================================
 
-# XZ format magic bytes: 0xFD + "7zXZ" + 0x00
-XZ_MAGIC_HEADER = b"\xfd7zXZ\x00"
-
 
 def _decrypt_artifacts(target_dir: Path) -> None:
     if (key_str := os.environ.get("ARTIFACT_ENCRYPTION_KEY")) is None:
         return
 
     try:
-        key_bytes = base64.urlsafe_b64decode(key_str.encode("ascii"))
-        aead = AESSIV(key_bytes)
+        key_bytes = load_key(key_str)
     except ValueError:
         logger.exception("Invalid AES-SIV key provided.")
         return
 
-    for enc_f in target_dir.rglob(pattern="*.encrypted"):
-        with enc_f.open(mode="rb") as f:
-            enc_data = f.read()
-
-        try:
-            dec_data = aead.decrypt(enc_data, None)
-        except Exception:
-            logger.exception("Failed to decrypt: `%s`.", enc_f)
-            continue
-
-        # Auto-detect and decompress XZ/LZMA compressed data
-        if dec_data.startswith(XZ_MAGIC_HEADER):
-            dec_data = lzma.decompress(dec_data)
-
-        with (enc_f.parent / enc_f.stem).open(mode="wb") as f:
-            f.write(dec_data)
+    # Sub-directories included, each one with its own `manifest.json`: only the
+    # files that changed since the last session are decrypted. Both the
+    # streaming and the legacy formats are supported.
+    directories = sorted({enc_f.parent for enc_f in target_dir.rglob("*.encrypted")})
+    for directory in directories:
+        for result in decrypt_directory(directory, key_bytes, jobs=os.cpu_count() or 1):
+            if result.status == "failed":
+                logger.error(
+                    "Failed to decrypt: `%s` - %s.", result.input_file, result.error
+                )
 
 
 def pytest_sessionstart(session) -> None:
+    # With `pytest-xdist`, the artifacts are decrypted once by the controller
+    # before the workers start.
+    if os.environ.get("PYTEST_XDIST_WORKER") is not None:
+        return
+
     _decrypt_artifacts(PRIVATE_ARIANE_DATA_DIR)
     _decrypt_artifacts(PRIVATE_COMPASS_DATA_DIR)
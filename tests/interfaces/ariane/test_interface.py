@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import io
 import tempfile
 import unittest
+import zipfile
 from pathlib import Path
 
 import pytest
@@ -9,6 +11,10 @@ from parameterized import parameterized
 
 from openspeleo_lib.interfaces.ariane.enums_cls import ArianeFileType
 from openspeleo_lib.interfaces.ariane.interface import ArianeInterface
+from openspeleo_lib.interfaces.ariane.interface import load_tml_xml
+from openspeleo_lib.interfaces.ariane.xml_utils import extract_elements
+from openspeleo_lib.interfaces.ariane.xml_utils import extract_top_level_elements
+from openspeleo_lib.opaque_xml import OpaqueXML
 
 
 class TestArianeParser(unittest.TestCase):
@@ -58,5 +64,140 @@ class TestArianeParser(unittest.TestCase):
             ArianeInterface()
 
 
+class TestArianeInMemoryIO(unittest.TestCase):
+    def setUp(self):
+        self.filepath = Path("tests/artifacts/hand_survey.tml")
+
+    def test_from_bytes(self):
+        survey = ArianeInterface.from_bytes(self.filepath.read_bytes())
+        assert (
+            survey.model_dump() == ArianeInterface.from_file(self.filepath).model_dump()
+        )
+
+    def test_from_fileobj(self):
+        with self.filepath.open(mode="rb") as f:
+            survey = ArianeInterface.from_fileobj(f)
+        assert (
+            survey.model_dump() == ArianeInterface.from_file(self.filepath).model_dump()
+        )
+
+    def test_to_bytes_roundtrip(self):
+        survey = ArianeInterface.from_file(self.filepath)
+        data = ArianeInterface.to_bytes(survey)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "export.tml"
+            ArianeInterface.to_file(survey, filepath)
+            assert (
+                ArianeInterface.from_bytes(data).model_dump()
+                == ArianeInterface.from_file(filepath).model_dump()
+            )
+
+    def test_to_fileobj(self):
+        survey = ArianeInterface.from_file(self.filepath)
+
+        buffer = io.BytesIO()
+        ArianeInterface.to_fileobj(survey, buffer)
+        buffer.seek(0)
+
+        assert ArianeInterface.from_fileobj(buffer).model_dump() == survey.model_dump()
+
+    def test_from_bytes_invalid(self):
+        with pytest.raises(zipfile.BadZipFile):
+            ArianeInterface.from_bytes(b"not a zip file")
+
+
+class TestArianeOpaqueCarto(unittest.TestCase):
+    def setUp(self):
+        self.filepath = Path("tests/artifacts/hand_survey.tml")
+        self.survey = ArianeInterface.from_file(self.filepath, opaque_carto=True)
+
+    def test_layers_not_decoded(self):
+        layers = self.survey.ariane_viewer_layers
+        assert isinstance(layers, OpaqueXML)
+        assert not layers.is_decoded
+        assert layers.raw.startswith("<Layers>")
+        assert layers.raw in load_tml_xml(self.filepath)
+
+    def test_same_as_eager_load(self):
+        eager = ArianeInterface.from_file(self.filepath)
+        assert dict(self.survey.ariane_viewer_layers) == eager.ariane_viewer_layers
+        assert self.survey.model_dump() == eager.model_dump()
+        assert self.survey.ariane_viewer_layers.is_decoded
+
+    def test_written_verbatim(self):
+        raw = self.survey.ariane_viewer_layers.raw
+        data = ArianeInterface.to_bytes(self.survey)
+
+        assert raw in load_tml_xml(io.BytesIO(data))
+        assert not self.survey.ariane_viewer_layers.is_decoded
+        assert ArianeInterface.from_bytes(data).model_dump() == self.survey.model_dump()
+
+    def test_to_json(self):
+        data = self.survey.model_dump(mode="json")
+        assert isinstance(data["ariane_viewer_layers"], dict)
+        assert data["ariane_viewer_layers"] == (
+            ArianeInterface.from_file(self.filepath).ariane_viewer_layers
+        )
+
+    def test_extract_top_level_elements(self):
+        xml_str = (
+            "<CaveFile><CartoLine/><Layers><A><Layers>1</Layers></A></Layers>"
+            "<Data><SRVD><Layers>2</Layers></SRVD></Data>"
+            "<CartoPage> </CartoPage></CaveFile>"
+        )
+        remaining, elements = extract_top_level_elements(
+            xml_str, ["Layers", "CartoLine", "CartoPage"]
+        )
+        assert elements == {"Layers": "<Layers><A><Layers>1</Layers></A></Layers>"}
+        assert remaining == (
+            "<CaveFile><CartoLine/><Data><SRVD><Layers>2</Layers></SRVD></Data>"
+            "<CartoPage> </CartoPage></CaveFile>"
+        )
+
+
+class TestArianeLazyShapes(unittest.TestCase):
+    def setUp(self):
+        self.filepath = Path("tests/artifacts/test_with_walls.tml")
+        self.survey = ArianeInterface.from_file(self.filepath, lazy_shapes=True)
+        self.shots = [
+            shot for section in self.survey.sections for shot in section.shots
+        ]
+
+    def test_shapes_not_decoded(self):
+        assert all(isinstance(shot.shape, OpaqueXML) for shot in self.shots)
+        assert not any(shot.shape.is_decoded for shot in self.shots)
+
+    def test_same_as_eager_load(self):
+        eager = ArianeInterface.from_file(self.filepath)
+        eager_shots = [shot for section in eager.sections for shot in section.shots]
+
+        assert [dict(shot.shape) for shot in self.shots] == [
+            shot.shape for shot in eager_shots
+        ]
+
+    def test_written_verbatim(self):
+        self.shots[0].shape.to_dict()  # Decoded shapes are re-serialized
+        xml_str = load_tml_xml(io.BytesIO(ArianeInterface.to_bytes(self.survey)))
+
+        assert all(shot.shape.raw in xml_str for shot in self.shots[1:])
+        assert (
+            ArianeInterface.from_bytes(
+                ArianeInterface.to_bytes(self.survey)
+            ).model_dump()
+            == self.survey.model_dump()
+        )
+
+    def test_extract_elements(self):
+        xml_str = (
+            "<A><Shape><x>1</x></Shape><Shape/><Shape> </Shape><Shape>2</Shape></A>"
+        )
+        remaining, elements = extract_elements(xml_str, "Shape", "tok_")
+        assert elements == ["<Shape><x>1</x></Shape>", "<Shape>2</Shape>"]
+        assert remaining == (
+            "<A><Shape>tok_0</Shape><Shape/><Shape> </Shape><Shape>tok_1</Shape></A>"
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import io
+import unittest
+import zipfile
+from pathlib import Path
+
+from parameterized import parameterized
+
+from openspeleo_lib.interfaces.ariane.validation import _iter_chunks_without_shapes
+from openspeleo_lib.interfaces.ariane.validation import validate_tml_fast
+
+SHOT_XML = """
+<SurveyData>
+    <Azimut>{azimut}</Azimut>
+    <Depth>0.0</Depth>
+    <FromID>{from_id}</FromID>
+    <ID>{shot_id}</ID>
+    <Latitude>{latitude}</Latitude>
+    <Length>{length}</Length>
+    <Section>Main</Section>
+    <Type>{shot_type}</Type>
+    <Shape><RadiusCollection><RadiusVector><angle>0.0</angle></RadiusVector>
+    </RadiusCollection></Shape>
+</SurveyData>"""
+
+
+def _make_tml(shots: list[dict], unit: str = "m") -> io.BytesIO:
+    records = "".join(
+        SHOT_XML.format(
+            **{
+                "azimut": 10.0,
+                "from_id": idx - 1,
+                "shot_id": idx,
+                "latitude": 0.0,
+                "length": 2.0,
+                "shot_type": "REAL",
+            }
+            | shot
+        )
+        for idx, shot in enumerate(shots)
+    )
+    xml = f"<CaveFile><unit>{unit}</unit><Data>{records}</Data></CaveFile>"
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("Data.xml", xml)
+    buffer.seek(0)
+    return buffer
+
+
+class TestFastValidation(unittest.TestCase):
+    @parameterized.expand(
+        [
+            "hand_survey.tml",
+            "test_ariane_v26.tml",
+            "test_simple.mini.tml",
+            "test_simple.tml",
+            "test_with_walls.tml",
+        ]
+    )
+    def test_valid_artifacts(self, filename: str):
+        assert validate_tml_fast(Path("tests/artifacts") / filename) == []
+
+    def test_empty_survey(self):
+        issues = validate_tml_fast("tests/artifacts/empty.tml")
+        assert [str(issue) for issue in issues] == ["The survey is empty"]
+
+    def test_valid_file_object(self):
+        assert validate_tml_fast(_make_tml([{"shot_type": "START"}, {}, {}])) == []
+
+    def test_invalid_records(self):
+        issues = validate_tml_fast(
+            _make_tml(
+                [
+                    {"shot_type": "START"},
+                    {"shot_id": 0},
+                    {"length": -1.0},
+                    {"shot_type": "UNKNOWN"},
+                    {"latitude": 95.0},
+                    {"azimut": "north"},
+                ]
+            )
+        )
+
+        assert [(issue.shot_index, issue.message) for issue in issues] == [
+            (1, "Duplicate shot `ID`: `0`"),
+            (2, "`Length` must be non negative: `-1.0`"),
+            (3, "Unknown shot type `UNKNOWN`"),
+            (4, "`Latitude` out of range: `95.0`"),
+            (5, "`Azimut` is not a number: `north`"),
+        ]
+        assert str(issues[0]) == "[Shot #1 - ID=0] Duplicate shot `ID`: `0`"
+
+    def test_missing_field_and_unit(self):
+        source = _make_tml([{}], unit="parsec")
+        xml = (
+            zipfile.ZipFile(source)
+            .read("Data.xml")
+            .replace(b"<Length>2.0</Length>", b"")
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("Data.xml", xml)
+
+        assert [issue.message for issue in validate_tml_fast(buffer)] == [
+            "Unknown unit: `parsec`",
+            "Missing required field `Length`",
+        ]
+
+    def test_max_errors(self):
+        source = _make_tml([{"shot_id": 1} for _ in range(100)])
+
+        assert len(validate_tml_fast(source)) == 99
+        assert len(validate_tml_fast(source, max_errors=3)) == 3
+
+    def test_invalid_archive(self):
+        issues = validate_tml_fast(io.BytesIO(b"not a zip file"))
+        assert issues[0].message.startswith("Invalid TML archive")
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("Data.xml", "<CaveFile><Data><SurveyData>")
+        assert validate_tml_fast(buffer)[-1].message.startswith("Invalid XML")
+
+    @parameterized.expand([1, 3, 7, 64])
+    def test_shapes_removed_across_chunks(self, chunk_size: int):
+        data = b"<a><Shape><b/></Shape><c>1</c><Shape></Shape></a><Shape>"
+        stream = io.BytesIO(data)
+
+        assert b"".join(_iter_chunks_without_shapes(stream, chunk_size)) == (
+            b"<a><c>1</c></a><Shape>"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
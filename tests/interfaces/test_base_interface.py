@@ -24,6 +24,13 @@ class TestBaseInterface(unittest.TestCase):
         with tempfile.NamedTemporaryFile() as tmp_f, pytest.raises(NotImplementedError):
             BaseInterface.from_file(filepath=tmp_f.name)
 
+    def test_in_memory_io_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            BaseInterface.from_bytes(b"")
+
+        with pytest.raises(NotImplementedError):
+            BaseInterface.to_bytes(survey=None)
+
     def test_instanciation(self):
         with pytest.raises(TypeError):
             BaseInterface()
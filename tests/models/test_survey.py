@@ -3,6 +3,7 @@ from __future__ import annotations
 import datetime
 import uuid
 
+import orjson
 import pytest
 from hypothesis import given
 from hypothesis import strategies as st
@@ -13,9 +14,11 @@ from openspeleo_lib.constants import OSPL_SHOTNAME_MAX_LENGTH
 from openspeleo_lib.enums import ArianeProfileType
 from openspeleo_lib.enums import ArianeShotType
 from openspeleo_lib.enums import LengthUnits
+from openspeleo_lib.geojson import build_shot_graph
 from openspeleo_lib.models import Section
 from openspeleo_lib.models import Shot
 from openspeleo_lib.models import Survey
+from openspeleo_lib.synthetic import generate_survey
 
 
 def test_valid_survey():
@@ -274,3 +277,59 @@ def test_fuzzy_survey(
 
 if __name__ == "__main__":
     pytest.main()
+
+
+def test_survey_indexes():
+    survey = generate_survey(200, seed=3)
+    shots = list(survey.shots)
+
+    # Same tables as the `geojson` helpers
+    assert dict(survey.shot_by_id) == {
+        shot.id_stop: shot for shot in shots if shot.shot_type != ArianeShotType.CLOSURE
+    }
+    assert {
+        shot_id: list(ids) for shot_id, ids in survey.children_of.items()
+    } == build_shot_graph(survey.sections)
+
+    section = survey.sections[-1]
+    assert survey.section_by_name[section.name] is section
+    assert shots[0] in survey.shots_by_name[shots[0].name]
+
+    # Cached until the structure changes
+    assert survey.indexes is survey.indexes
+
+    new_shot = shots[-1].model_copy(update={"id_stop": 99_999, "name": "NEW"})
+    section.shots.append(new_shot)
+    assert survey.shot_by_id[99_999] is new_shot
+    assert survey.shots_by_name["NEW"] == (new_shot,)
+
+    # In place edits of indexed fields are tracked
+    new_shot.id_stop = 100_000
+    assert 99_999 not in survey.shot_by_id
+    assert survey.shot_by_id[100_000] is new_shot
+
+    with pytest.raises(TypeError):
+        survey.shot_by_id[1] = new_shot  # type: ignore[index]
+
+    # Copies build their own indexes
+    copy = survey.model_copy(deep=True)
+    assert copy.shot_by_id[100_000] is not new_shot
+
+
+def test_survey_json(tmp_path):
+    survey = generate_survey(200, seed=5)
+
+    # Same output as serializing `model_dump()`, streamed or not
+    data = survey.to_json_bytes(beautify=False)
+    assert data == orjson.dumps(survey.model_dump(mode="json"))
+    assert b"".join(survey.iter_json_bytes()) == data
+
+    loaded = Survey.from_json_bytes(data)
+    assert loaded.model_dump() == survey.model_dump()
+    assert loaded.sections[0].shots[0].section is loaded.sections[0]
+
+    for beautify in (True, False):
+        filepath = tmp_path / f"survey_{beautify}.json"
+        survey.to_json(filepath, beautify=beautify)
+        assert filepath.read_bytes() == survey.to_json_bytes(beautify=beautify)
+        assert Survey.from_json(filepath).model_dump() == survey.model_dump()
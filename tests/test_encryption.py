@@ -0,0 +1,283 @@
+"""Tests for the streaming artifact encryption."""
+
+from __future__ import annotations
+
+import base64
+import io
+import lzma
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESSIV
+from parameterized import parameterized
+
+from openspeleo_lib.encryption import HEADER_SIZE
+from openspeleo_lib.encryption import SIV_TAG_SIZE
+from openspeleo_lib.encryption import XZ_MAGIC_HEADER
+from openspeleo_lib.encryption import DecryptionError
+from openspeleo_lib.encryption import _compress_chunks
+from openspeleo_lib.encryption import _decompress_chunks
+from openspeleo_lib.encryption import decrypt_directory
+from openspeleo_lib.encryption import decrypt_file
+from openspeleo_lib.encryption import decrypt_stream
+from openspeleo_lib.encryption import encrypt_directory
+from openspeleo_lib.encryption import encrypt_file
+from openspeleo_lib.encryption import encrypt_stream
+from openspeleo_lib.encryption import load_key
+from openspeleo_lib.encryption import load_manifest
+from openspeleo_lib.encryption import sha256_file
+
+SEGMENT_SIZE = 1024
+
+
+def _encrypt(data: bytes, key: bytes, compress: bool = False) -> bytes:
+    dst = io.BytesIO()
+    encrypt_stream(
+        io.BytesIO(data), dst, key, compress=compress, segment_size=SEGMENT_SIZE
+    )
+    return dst.getvalue()
+
+
+def _decrypt(data: bytes, key: bytes) -> bytes:
+    dst = io.BytesIO()
+    decrypt_stream(io.BytesIO(data), dst, key)
+    return dst.getvalue()
+
+
+class TestStreamingEncryption(unittest.TestCase):
+    def setUp(self):
+        self.key = AESSIV.generate_key(512)
+        self.data = os.urandom(5 * SEGMENT_SIZE + 17)
+
+    @parameterized.expand(
+        [
+            (0, False),
+            (SEGMENT_SIZE, False),
+            (5 * SEGMENT_SIZE + 17, False),
+            (5 * SEGMENT_SIZE + 17, True),
+            (0, True),
+        ]
+    )
+    def test_roundtrip(self, size: int, compress: bool):
+        data = os.urandom(size)
+        enc_data = _encrypt(data, self.key, compress=compress)
+
+        assert _decrypt(enc_data, self.key) == data
+
+    def test_segments_layout(self):
+        enc_data = _encrypt(self.data, self.key)
+
+        # 5 full segments + 1 partial segment
+        assert len(enc_data) == HEADER_SIZE + len(self.data) + 6 * SIV_TAG_SIZE
+
+        # Exactly one full segment: no empty trailing segment
+        enc_data = _encrypt(self.data[:SEGMENT_SIZE], self.key)
+        assert len(enc_data) == HEADER_SIZE + SEGMENT_SIZE + SIV_TAG_SIZE
+
+    def test_compressed_content(self):
+        data = b"openspeleo " * 10_000
+        assert len(_encrypt(data, self.key, compress=True)) < len(data) // 10
+
+    @parameterized.expand([(1, 0), (3, 1), (4, 6 | lzma.PRESET_EXTREME)])
+    def test_parallel_compression(self, threads: int, preset: int):
+        data = b"".join(os.urandom(64) * 64 for _ in range(200))
+
+        dst = io.BytesIO()
+        encrypt_stream(
+            io.BytesIO(data),
+            dst,
+            self.key,
+            compress=True,
+            preset=preset,
+            threads=threads,
+            segment_size=SEGMENT_SIZE,
+        )
+        assert _decrypt(dst.getvalue(), self.key) == data
+
+    def test_parallel_compression_blocks(self):
+        data = b"".join(os.urandom(64) * 64 for _ in range(50))
+        chunks = list(_compress_chunks([data], threads=4, block_size=len(data) // 5))
+
+        # One XZ stream per block, readable as a single XZ file.
+        assert len(chunks) == 5
+        assert all(chunk.startswith(XZ_MAGIC_HEADER) for chunk in chunks)
+        assert lzma.decompress(b"".join(chunks)) == data
+        assert b"".join(_decompress_chunks(chunks)) == data
+
+        # Empty input is still a valid XZ file.
+        assert lzma.decompress(b"".join(_compress_chunks([], threads=4))) == b""
+
+    def test_nondeterministic(self):
+        assert _encrypt(self.data, self.key) != _encrypt(self.data, self.key)
+
+    def test_truncation_detected(self):
+        enc_data = _encrypt(self.data, self.key)
+        segment = SEGMENT_SIZE + SIV_TAG_SIZE
+
+        # Truncated at a segment boundary
+        with pytest.raises(DecryptionError, match="Segment #4 failed"):
+            _decrypt(enc_data[: HEADER_SIZE + 5 * segment], self.key)
+
+        with pytest.raises(DecryptionError, match="Segment #0 failed"):
+            _decrypt(enc_data[:HEADER_SIZE], self.key)
+
+        with pytest.raises(DecryptionError, match="Truncated file header"):
+            _decrypt(enc_data[: HEADER_SIZE - 1], self.key)
+
+    def test_reordering_detected(self):
+        enc_data = _encrypt(self.data, self.key)
+        segment = SEGMENT_SIZE + SIV_TAG_SIZE
+        first = HEADER_SIZE
+
+        swapped = (
+            enc_data[:first]
+            + enc_data[first + segment : first + 2 * segment]
+            + enc_data[first : first + segment]
+            + enc_data[first + 2 * segment :]
+        )
+        with pytest.raises(DecryptionError, match="Segment #0 failed"):
+            _decrypt(swapped, self.key)
+
+    def test_tampering_and_wrong_key(self):
+        enc_data = bytearray(_encrypt(self.data, self.key))
+        enc_data[-1] ^= 0x01
+
+        with pytest.raises(DecryptionError, match="Segment #5 failed"):
+            _decrypt(bytes(enc_data), self.key)
+
+        with pytest.raises(DecryptionError):
+            _decrypt(_encrypt(self.data, self.key), AESSIV.generate_key(512))
+
+    @parameterized.expand([False, True])
+    def test_legacy_format(self, compress: bool):
+        data = self.data
+        if compress:
+            data = lzma.compress(data, format=lzma.FORMAT_XZ)
+
+        legacy_data = AESSIV(self.key).encrypt(data, None)
+        assert _decrypt(legacy_data, self.key) == self.data
+
+        with pytest.raises(DecryptionError, match="Decryption failed"):
+            _decrypt(legacy_data[:-1], self.key)
+
+
+class TestFileEncryption(unittest.TestCase):
+    def test_encrypt_decrypt_file(self):
+        key = load_key(base64.urlsafe_b64encode(AESSIV.generate_key(512)).decode())
+        input_file = Path("tests/artifacts/hand_survey.tml")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            enc_file = Path(tmp_dir) / "hand_survey.tml.encrypted"
+            dec_file = Path(tmp_dir) / "hand_survey.tml"
+
+            digest = encrypt_file(input_file, enc_file, key, compress=True)
+            assert decrypt_file(enc_file, dec_file, key) == digest
+            assert dec_file.read_bytes() == input_file.read_bytes()
+
+            # A failed decryption leaves no partial output behind.
+            enc_file.write_bytes(enc_file.read_bytes()[:-1])
+            dec_file.unlink()
+
+            with pytest.raises(DecryptionError):
+                decrypt_file(enc_file, dec_file, key)
+
+            assert sorted(p.name for p in Path(tmp_dir).iterdir()) == [enc_file.name]
+
+
+class TestDirectoryEncryption(unittest.TestCase):
+    def setUp(self):
+        self.key = AESSIV.generate_key(512)
+
+        self._tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_dir = Path(self._tmp_dir.name)
+
+        for filename in ["a.tml", "B.TML", "c.json"]:
+            (self.tmp_dir / filename).write_bytes(os.urandom(2048))
+        (self.tmp_dir / "ignored.txt").write_text("ignored")
+
+    def tearDown(self):
+        self._tmp_dir.cleanup()
+
+    def _statuses(self, results) -> dict[str, str]:
+        return {result.input_file.name: result.status for result in results}
+
+    def test_encrypt_directory(self):
+        results = encrypt_directory(
+            self.tmp_dir, self.key, patterns=["*.tml", "*.json"], compress=True
+        )
+        assert self._statuses(results) == {
+            "B.TML": "encrypted",
+            "a.tml": "encrypted",
+            "c.json": "encrypted",
+        }
+
+        manifest = load_manifest(self.tmp_dir)
+        assert manifest["a.tml"] == {
+            "plaintext": sha256_file(self.tmp_dir / "a.tml"),
+            "ciphertext": sha256_file(self.tmp_dir / "a.tml.encrypted"),
+        }
+
+        # Only the modified file is encrypted again.
+        (self.tmp_dir / "c.json").write_bytes(b"{}")
+        results = encrypt_directory(
+            self.tmp_dir, self.key, patterns=["*.tml", "*.json"], jobs=2
+        )
+        assert self._statuses(results) == {
+            "B.TML": "skipped",
+            "a.tml": "skipped",
+            "c.json": "encrypted",
+        }
+        assert load_manifest(self.tmp_dir)["a.tml"] == manifest["a.tml"]
+
+        with mock.patch(
+            "openspeleo_lib.encryption.encrypt_file", wraps=encrypt_file
+        ) as encrypt_file_mock:
+            results = encrypt_directory(
+                self.tmp_dir,
+                self.key,
+                patterns=["*.tml"],
+                compress=True,
+                threads=3,
+                overwrite=True,
+            )
+        assert self._statuses(results) == {"B.TML": "encrypted", "a.tml": "encrypted"}
+        threads = [call.kwargs["threads"] for call in encrypt_file_mock.call_args_list]
+        assert threads == [3, 3]
+
+    def test_decrypt_directory(self):
+        encrypt_directory(self.tmp_dir, self.key, patterns=["*.tml", "*.json"])
+        plaintexts = {
+            f.name: f.read_bytes() for f in self.tmp_dir.iterdir() if f.suffix != ".txt"
+        }
+
+        (self.tmp_dir / "a.tml").unlink()
+        (self.tmp_dir / "B.TML").write_bytes(b"outdated")
+
+        results = decrypt_directory(self.tmp_dir, self.key, jobs=2)
+        assert self._statuses(results) == {
+            "B.TML.encrypted": "decrypted",
+            "a.tml.encrypted": "decrypted",
+            "c.json.encrypted": "skipped",
+        }
+        for filename in ["a.tml", "B.TML", "c.json"]:
+            assert (self.tmp_dir / filename).read_bytes() == plaintexts[filename]
+
+        results = decrypt_directory(self.tmp_dir, self.key)
+        assert set(self._statuses(results).values()) == {"skipped"}
+
+    def test_decrypt_directory_failure(self):
+        encrypt_directory(self.tmp_dir, self.key, patterns=["a.tml"])
+
+        results = decrypt_directory(
+            self.tmp_dir, AESSIV.generate_key(512), overwrite=True
+        )
+        assert results[0].status == "failed"
+        assert "DecryptionError" in results[0].error
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import gc
+import unittest
+
+import pytest
+
+from openspeleo_lib.utils import gc_paused
+
+
+class TestGCPaused(unittest.TestCase):
+    def test_paused(self):
+        assert gc.isenabled()
+
+        with gc_paused():
+            assert not gc.isenabled()
+
+            with gc_paused():
+                assert not gc.isenabled()
+
+            # Only re-enabled by the outermost block
+            assert not gc.isenabled()
+
+        assert gc.isenabled()
+
+    def test_reenabled_on_error(self):
+        with pytest.raises(RuntimeError), gc_paused():
+            raise RuntimeError
+
+        assert gc.isenabled()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,261 @@
+"""Tests for the pipeline instrumentation API."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+import orjson
+import pytest
+
+from openspeleo_lib import instrumentation
+from openspeleo_lib.geojson import survey_to_geojson
+from openspeleo_lib.interfaces import ArianeInterface
+
+
+class RecordingListener(instrumentation.InstrumentationListener):
+    def __init__(self):
+        self.events = []
+
+    def on_span(self, name, start_ns, duration_ns, attrs):
+        self.events.append(("span", name, attrs))
+
+    def on_counter(self, name, value):
+        self.events.append(("counter", name, value))
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        assert not instrumentation.is_enabled()
+
+        # No listener => shared no-op context manager
+        assert instrumentation.span("a") is instrumentation.span("b")
+        instrumentation.incr("counter")
+
+    def test_listener_registration(self):
+        listener = RecordingListener()
+
+        with instrumentation.listening(listener):
+            assert instrumentation.is_enabled()
+
+            with instrumentation.span("outer", key="value"):
+                instrumentation.incr("counter", 3)
+
+        assert not instrumentation.is_enabled()
+
+        # Nothing is recorded once the listener is removed.
+        with instrumentation.span("ignored"):
+            instrumentation.incr("ignored")
+
+        assert listener.events == [
+            ("counter", "counter", 3),
+            ("span", "outer", {"key": "value"}),
+        ]
+
+    def test_timed_decorator(self):
+        @instrumentation.timed("my_function")
+        def my_function(value: int) -> int:
+            return value * 2
+
+        assert my_function(2) == 4
+
+        with instrumentation.collect() as collector:
+            assert my_function(3) == 6
+            assert my_function(4) == 8
+
+        stats = collector.snapshot()["spans"]["my_function"]
+        assert stats["count"] == 2
+        assert stats["min"] <= stats["mean"] <= stats["max"]
+
+    def test_span_recorded_on_error(self):
+        with (
+            instrumentation.collect() as collector,
+            pytest.raises(ValueError, match="failure"),
+            instrumentation.span("failing"),
+        ):
+            raise ValueError("failure")
+
+        assert collector.spans["failing"].count == 1
+
+    def test_collector_reset(self):
+        with instrumentation.collect() as collector:
+            instrumentation.incr("counter")
+            collector.reset()
+            instrumentation.incr("counter", 2)
+
+        assert collector.snapshot() == {"spans": {}, "counters": {"counter": 2}}
+
+
+class TestPipelineInstrumentation(unittest.TestCase):
+    def test_load_export_geojson(self):
+        filepath = Path("tests/artifacts/hand_survey.tml")
+
+        with instrumentation.collect() as collector:
+            survey = ArianeInterface.from_file(filepath)
+            survey_to_geojson(survey)
+
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                ArianeInterface.to_file(survey, Path(tmp_dir) / "export.tml")
+
+        snapshot = collector.snapshot()
+
+        for name in [
+            "interface.from_file",
+            "ariane.zip_read",
+            "ariane.xml_to_dict",
+            "ariane.decode",
+            "ariane.validation",
+            "interface.to_file",
+            "ariane.serialization",
+            "ariane.encode",
+            "ariane.dict_to_xml",
+            "ariane.zip_write",
+            "geojson.survey_to_geojson",
+            "geojson.find_valid_shot_ids",
+            "geojson.propagate_coordinates",
+            "geojson.build_feature_collection",
+        ]:
+            assert snapshot["spans"][name]["count"] == 1, name
+
+        counters = snapshot["counters"]
+        assert counters["ariane.shots_decoded"] == 90
+        assert counters["ariane.shots_encoded"] == 90
+        assert counters["ariane.sections_created"] == len(survey.sections)
+        assert counters["ariane.bytes_read"] > 0
+        assert counters["ariane.bytes_written"] > 0
+        assert counters["geojson.geod_calls"] > 0
+        assert counters["geojson.invalid_shots"] == 0
+
+
+class TestChromeTrace(unittest.TestCase):
+    def test_trace_to(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_f = Path(tmp_dir) / "trace.json"
+
+            with instrumentation.trace_to(trace_f):
+                ArianeInterface.from_file("tests/artifacts/hand_survey.tml")
+
+            assert not instrumentation.is_enabled()
+            trace = orjson.loads(trace_f.read_bytes())
+
+        spans = {
+            event["name"]: event for event in trace["traceEvents"] if event["ph"] == "X"
+        }
+
+        # Nested spans: `zip_read` happens within `from_file`
+        outer, inner = spans["interface.from_file"], spans["ariane.zip_read"]
+        assert outer["ts"] <= inner["ts"]
+        assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+        assert outer["args"] == {"interface": "ArianeInterface"}
+        assert inner["cat"] == "ariane"
+
+        counters = {
+            event["name"]: event["args"]["value"]
+            for event in trace["traceEvents"]
+            if event["ph"] == "C"
+        }
+        assert counters["ariane.shots_decoded"] == 90
+
+    def test_ring_buffer(self):
+        recorder = instrumentation.TraceRecorder(max_events=5)
+
+        with instrumentation.listening(recorder):
+            for idx in range(20):
+                with instrumentation.span(f"span_{idx}"):
+                    pass
+
+        assert [event["name"] for event in recorder.events] == [
+            f"span_{idx}" for idx in range(15, 20)
+        ]
+        # + process metadata event
+        assert len(recorder.to_dict()["traceEvents"]) == 6
+
+    def test_env_variable(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_f = Path(tmp_dir) / "trace.json"
+
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    "-c",
+                    (
+                        "from openspeleo_lib.interfaces import ArianeInterface; "
+                        "ArianeInterface.from_file('tests/artifacts/hand_survey.tml')"
+                    ),
+                ],
+                capture_output=True,
+                text=True,
+                check=False,
+                env={**os.environ, instrumentation.TRACE_ENV_VAR: str(trace_f)},
+            )
+            assert result.returncode == 0, result.stderr
+
+            trace = orjson.loads(trace_f.read_bytes())
+
+        names = {event["name"] for event in trace["traceEvents"]}
+        assert {"interface.from_file", "ariane.decode", "ariane.validation"} <= names
+
+    def test_env_variable_worker_pool(self):
+        script = textwrap.dedent(
+            """
+            import multiprocessing
+            import os
+
+            from openspeleo_lib import instrumentation
+
+
+            def work(_):
+                with instrumentation.span("worker.task"):
+                    return os.getpid()
+
+
+            if __name__ == "__main__":
+                pool = multiprocessing.get_context("fork").Pool(2)
+                pool.map(work, range(8), chunksize=1)
+                pool.close()
+                pool.join()
+                print(os.getpid())
+            """
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = subprocess.run(  # noqa: S603
+                [sys.executable, "-c", script],
+                capture_output=True,
+                text=True,
+                check=False,
+                env={
+                    **os.environ,
+                    instrumentation.TRACE_ENV_VAR: f"{tmp_dir}/trace-{{pid}}.json",
+                },
+            )
+            assert result.returncode == 0, result.stderr
+
+            traces = {
+                int(trace_f.stem.removeprefix("trace-")): orjson.loads(
+                    trace_f.read_bytes()
+                )["traceEvents"]
+                for trace_f in Path(tmp_dir).glob("trace-*.json")
+            }
+
+        # The parent and both workers, each with its own events
+        parent_pid = int(result.stdout)
+        assert len(traces) == 3
+        assert parent_pid in traces
+        for pid, events in traces.items():
+            assert {event["pid"] for event in events} == {pid}
+
+        tasks = {
+            pid: sum(event["name"] == "worker.task" for event in events)
+            for pid, events in traces.items()
+        }
+        assert tasks.pop(parent_pid) == 0
+        assert sum(tasks.values()) == 8
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.interning import StringPool
+
+
+class TestStringPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = StringPool()
+
+    def test_intern(self):
+        value = self.pool.intern("#FFB366")
+        duplicate = value.encode().decode()  # Equal, distinct object
+        assert duplicate is not value
+        assert self.pool.intern(duplicate) is value
+        assert self.pool.intern_list(["#FFB366", "other"])[0] is value
+        assert len(self.pool) == 2
+
+    def test_intern_tree(self):
+        tree = {"a": ["x", {"a": "x", "n": 1.0}], "b": None}
+        interned = self.pool.intern_tree(tree)
+
+        assert interned == tree
+        assert interned is not tree
+        assert interned["a"][1]["a"] is interned["a"][0]
+        assert next(iter(interned["a"][1])) is next(iter(interned))
+
+
+class TestArianeInterning(unittest.TestCase):
+    def test_shared_strings(self):
+        survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+        shots = list(survey.shots)
+
+        colors = {shot.color: shot.color for shot in shots}
+        assert all(shot.color is colors[shot.color] for shot in shots)
+
+        shapes = [shot.shape for shot in shots if shot.shape is not None]
+        assert shapes
+        assert all(
+            next(iter(shape)) is next(iter(shapes[0]))
+            for shape in shapes
+            if next(iter(shape)) == next(iter(shapes[0]))
+        )
+
+    def test_json_shapes(self):
+        survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+        data = survey.to_json_bytes(beautify=False)
+
+        loaded = type(survey).from_json_bytes(data)
+        assert loaded.model_dump() == survey.model_dump()
+
+        loaded = type(survey).from_json_bytes(data, intern_strings=True)
+        assert loaded.model_dump() == survey.model_dump()
+
+        keys = [next(iter(shot.shape)) for shot in loaded.shots if shot.shape]
+        assert len(keys) > 1
+        assert keys[0] is keys[1]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.interfaces.ariane.interface import ArianeSurvey
+from openspeleo_lib.json_stream import SurveyJSONReader
+from openspeleo_lib.synthetic import generate_survey
+
+
+class TestSurveyJSONReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.filepath = Path(self.tmp_dir.name) / "survey.json"
+
+        self.survey = generate_survey(300, seed=11, section_size=20)
+        self.survey.name = "Grotte à l'été"  # Non-ASCII: split across chunks
+        self.sections = [section.model_dump() for section in self.survey.sections]
+        self.fields = self.survey.model_dump(exclude={"sections"})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _assert_reads(self, reader: SurveyJSONReader, *, survey_first: bool):
+        if survey_first:
+            assert reader.survey.model_dump(exclude={"sections"}) == self.fields
+
+        assert [section.model_dump() for section in reader] == self.sections
+        assert reader.survey.model_dump(exclude={"sections"}) == self.fields
+        assert not reader.survey.sections
+
+        # Can be iterated again
+        assert len(list(reader)) == len(self.sections)
+
+    def test_compact(self):
+        # Fields written before and after the sections
+        self.survey.to_json(self.filepath, beautify=False)
+
+        for chunk_size in (64, 1024 * 1024):
+            for survey_first in (True, False):
+                reader = SurveyJSONReader(self.filepath, chunk_size=chunk_size)
+                self._assert_reads(reader, survey_first=survey_first)
+
+    def test_beautified(self):
+        self.survey.to_json(self.filepath, beautify=True)
+
+        reader = SurveyJSONReader(self.filepath, chunk_size=100)
+        self._assert_reads(reader, survey_first=True)
+
+    def test_ariane(self):
+        survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+        survey.to_json(self.filepath)
+
+        reader = SurveyJSONReader(self.filepath, ArianeSurvey, intern_strings=True)
+        assert reader.survey.name == survey.name
+        assert [section.model_dump() for section in reader] == [
+            section.model_dump() for section in survey.sections
+        ]
+
+    def test_empty_sections(self):
+        self.filepath.write_text(json.dumps({"name": "empty", "sections": []}))
+
+        reader = SurveyJSONReader(self.filepath)
+        assert list(reader) == []
+        assert reader.survey.name == "empty"
+
+    def test_invalid(self):
+        for content in ('{"name": "x", "sections": [{}', '["sections"]', "{1: 2}"):
+            self.filepath.write_text(content)
+            with pytest.raises(ValueError):  # noqa: PT011
+                list(SurveyJSONReader(self.filepath, chunk_size=4))
+
+
+if __name__ == "__main__":
+    unittest.main()
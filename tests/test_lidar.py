@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from openspeleo_lib.interfaces.ariane.interface import ArianeInterface
+from openspeleo_lib.interfaces.ariane.interface import load_tml_xml
+from openspeleo_lib.interfaces.ariane.interface import save_tml_xml
+from openspeleo_lib.lidar import LidarRecords
+
+RAW_RECORDS = (
+    "<ListLidarRecords>"
+    "<LidarRecord><Name>Scan 1</Name><Points>"
+    "<Point><X>1.5</X><Y>2.0</Y><Z>-3.25</Z><Intensity>0.5</Intensity></Point>"
+    "<Point><X>4.0</X><Y>5.0</Y><Z>6.0</Z><Intensity>0.75</Intensity></Point>"
+    "</Points></LidarRecord>"
+    "<LidarRecord><Points>"
+    "<Point><x>7.0</x><y>8.0</y><z>9.0</z><intensity>1.0</intensity></Point>"
+    "</Points></LidarRecord>"
+    "</ListLidarRecords>"
+)
+
+
+class TestLidarRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = LidarRecords("ListLidarRecords", RAW_RECORDS)
+
+    def test_decoding(self):
+        assert self.records.points.dtype == np.float32
+        np.testing.assert_array_equal(
+            self.records.points, [[1.5, 2.0, -3.25], [4.0, 5.0, 6.0], [7.0, 8.0, 9.0]]
+        )
+        np.testing.assert_array_equal(self.records.intensity, [0.5, 0.75, 1.0])
+        np.testing.assert_array_equal(self.records.record_offsets, [0, 2, 3])
+        assert self.records.n_records == 2
+        assert [len(pts) for pts, _ in self.records.iter_records()] == [2, 1]
+
+    def test_read_only(self):
+        with pytest.raises(ValueError, match="read-only"):
+            self.records.points[0, 0] = 0.0
+
+    def test_mapping(self):
+        assert self.records["LidarRecord"][0]["Name"] == "Scan 1"
+
+    def test_from_arrays(self):
+        points = np.random.default_rng(0).random((10, 3)) * 1000
+        records = LidarRecords.from_arrays(points, record_offsets=[0, 4, 10])
+
+        decoded = LidarRecords("ListLidarRecords", records.raw)
+        np.testing.assert_array_equal(decoded.points, points.astype(np.float32))
+        np.testing.assert_array_equal(decoded.record_offsets, [0, 4, 10])
+        assert decoded.intensity is None
+
+        with pytest.raises(ValueError, match="Invalid `record_offsets`"):
+            LidarRecords.from_arrays(points, record_offsets=[0, 4])
+
+    def test_save_load_mmap(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            self.records.save(tmp_dir)
+            loaded = LidarRecords.load(tmp_dir)
+
+            assert isinstance(loaded.points, np.memmap)
+            np.testing.assert_array_equal(loaded.points, self.records.points)
+            np.testing.assert_array_equal(loaded.intensity, self.records.intensity)
+            assert loaded.raw == self.records.raw
+
+            del loaded  # Releases the memory mapped files
+
+    def test_pickle(self):
+        records = pickle.loads(pickle.dumps(self.records))  # noqa: S301
+        np.testing.assert_array_equal(records.points, self.records.points)
+
+    def test_ariane_roundtrip(self):
+        xml_str = load_tml_xml("tests/artifacts/hand_survey.tml").replace(
+            "</CaveFile>", f"{RAW_RECORDS}</CaveFile>"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "lidar.tml"
+            save_tml_xml(xml_str, filepath)
+            survey = ArianeInterface.from_file(filepath, opaque_carto=True)
+
+        assert isinstance(survey.list_lidar_records, LidarRecords)
+        assert survey.list_lidar_records.n_points == 3
+
+        data = ArianeInterface.to_bytes(survey)
+        assert RAW_RECORDS in load_tml_xml(io.BytesIO(data))
+
+        survey.list_lidar_records = LidarRecords.from_arrays(np.zeros((5, 3)))
+        reloaded = ArianeInterface.from_bytes(
+            ArianeInterface.to_bytes(survey), opaque_carto=True
+        )
+        np.testing.assert_array_equal(reloaded.list_lidar_records.points, 0.0)
+        assert reloaded.list_lidar_records.n_points == 5
+
+    def test_ariane_roundtrip_not_opaque(self):
+        xml_str = load_tml_xml("tests/artifacts/hand_survey.tml").replace(
+            "</CaveFile>", f"{RAW_RECORDS}</CaveFile>"
+        )
+
+        buffer = io.BytesIO()
+        save_tml_xml(xml_str, buffer)
+        survey = ArianeInterface.from_bytes(buffer.getvalue())
+        assert isinstance(survey.list_lidar_records, dict)
+
+        # Converted back from the dict: same content, child elements sorted
+        data = ArianeInterface.to_bytes(survey)
+        reloaded = ArianeInterface.from_bytes(data)
+        assert reloaded.list_lidar_records == survey.list_lidar_records
+
+        records = ArianeInterface.from_bytes(data, opaque_carto=True)
+        expected = LidarRecords("ListLidarRecords", RAW_RECORDS)
+        np.testing.assert_array_equal(
+            records.list_lidar_records.points, expected.points
+        )
+        np.testing.assert_array_equal(
+            records.list_lidar_records.intensity, expected.intensity
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
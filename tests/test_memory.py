@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.lidar import LidarRecords
+from openspeleo_lib.memory import COMPONENTS
+from openspeleo_lib.memory import DeepSizer
+from openspeleo_lib.synthetic import generate_survey
+
+
+class TestDeepSizer(unittest.TestCase):
+    def test_shared_objects_counted_once(self):
+        value = "shared" * 100
+        sizer = DeepSizer()
+        size = sizer.sizeof([value])
+        assert sizer.sizeof([value]) < size
+        assert sizer.sizeof(value) == 0
+
+    def test_arrays(self):
+        points = np.zeros((1_000, 3), dtype=np.float32)
+        assert DeepSizer().sizeof(points) >= points.nbytes
+        assert DeepSizer().sizeof(points[:10]) >= points.nbytes  # View
+
+
+class TestMemoryReport(unittest.TestCase):
+    def setUp(self):
+        self.survey = generate_survey(2_000, seed=3)
+
+    def test_components(self):
+        report = self.survey.memory_report(sample_size=None)
+        assert tuple(report.components) == COMPONENTS
+        assert not report.is_sampled
+        assert report.components["shots"] > 0
+        assert report.components["strings"] > 0
+        assert report.components["indexes"] == 0
+        assert report.to_dict()["total"] == report.total
+
+        # Lookup tables are reported once built
+        _ = self.survey.shot_by_id
+        assert self.survey.memory_report().components["indexes"] > 0
+
+    def test_sampling(self):
+        full = self.survey.memory_report(sample_size=None)
+        sampled = self.survey.memory_report(sample_size=200)
+        assert sampled.is_sampled
+        assert sampled.n_sampled_shots == 200
+        assert sampled.total == pytest.approx(full.total, rel=0.1)
+
+        # Shared strings aren't extrapolated
+        assert sampled.components["strings"] == full.components["strings"]
+
+        with pytest.raises(ValueError, match="Invalid sample size"):
+            self.survey.memory_report(sample_size=0)
+
+    def test_ariane_blocks(self):
+        survey = ArianeInterface.from_file(
+            Path("tests/artifacts/hand_survey.tml"), lazy_shapes=True
+        )
+        survey.list_lidar_records = LidarRecords.from_arrays(
+            np.zeros((10_000, 3), dtype=np.float32)
+        )
+
+        report = survey.memory_report()
+        assert report.components["shapes"] > 0
+        assert report.components["carto"] > 0
+        assert report.components["lidar"] > 10_000 * 3 * 4
+
+
+if __name__ == "__main__":
+    unittest.main()
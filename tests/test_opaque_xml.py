@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pickle
+import unittest
+
+import pytest
+
+from openspeleo_lib.opaque_xml import OpaqueXML
+from openspeleo_lib.opaque_xml import OpaqueXMLRegistry
+
+
+class TestOpaqueXML(unittest.TestCase):
+    def setUp(self):
+        self.element = OpaqueXML("Layers", "<Layers><a>1</a><a>2</a></Layers>")
+
+    def test_lazy_decoding(self):
+        assert not self.element.is_decoded
+        assert self.element["a"] == ["1", "2"]
+        assert self.element.is_decoded
+        assert self.element == {"a": ["1", "2"]}
+
+    def test_pickle(self):
+        element = pickle.loads(pickle.dumps(self.element))  # noqa: S301
+        assert element.raw == self.element.raw
+        assert dict(element) == dict(self.element)
+
+    def test_registry_substitute(self):
+        registry = OpaqueXMLRegistry()
+        token = registry.register(self.element)
+        xml_str = f"<CaveFile><Layers>{token}</Layers></CaveFile>"
+
+        assert registry.substitute(xml_str) == (
+            f"<CaveFile>{self.element.raw}</CaveFile>"
+        )
+
+    def test_registry_missing_placeholder(self):
+        registry = OpaqueXMLRegistry()
+        token = registry.register(self.element)
+
+        with pytest.raises(ValueError, match="Found 0 placeholders, expected 1"):
+            registry.substitute("<CaveFile><Layers/></CaveFile>")
+
+        with pytest.raises(ValueError, match="expected `<Layers>`"):
+            registry.substitute(f"<CaveFile><Other>{token}</Other></CaveFile>")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from openspeleo_lib.enums import ArianeShotType
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.models import Survey
+from openspeleo_lib.stats import SHOT_TYPES
+from openspeleo_lib.stats import plan_lengths
+from openspeleo_lib.stats import shot_columns
+from openspeleo_lib.synthetic import generate_survey
+
+
+def _length_2d(survey, shot) -> float:
+    origin = survey.shot_by_id.get(shot.id_start)
+    try:
+        return shot.length_2d(origin_depth=None if origin is None else origin.depth)
+    except ValueError:
+        return math.nan
+
+
+class TestSurveyStats(unittest.TestCase):
+    def setUp(self):
+        self.survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+
+    def test_plan_lengths(self):
+        for survey in (self.survey, generate_survey(2_000, seed=5)):
+            expected = [_length_2d(survey, shot) for shot in survey.shots]
+            np.testing.assert_allclose(plan_lengths(survey), expected)
+
+    def test_totals(self):
+        shots = list(self.survey.shots)
+        shots[0].excluded = True
+        stats = self.survey.stats()
+
+        surveyed = [
+            shot
+            for shot in shots
+            if not shot.excluded and shot.shot_type != ArianeShotType.VIRTUAL
+        ]
+        assert stats.n_shots == len(shots)
+        assert stats.length == pytest.approx(sum(shot.length for shot in surveyed))
+        assert stats.excluded_length == shots[0].length
+        assert stats.depth_min == min(shot.depth for shot in surveyed)
+        assert stats.vertical_extent == pytest.approx(
+            max(shot.depth for shot in surveyed) - stats.depth_min
+        )
+        assert stats.shot_types["VIRTUAL"] == sum(
+            shot.shot_type == ArianeShotType.VIRTUAL for shot in shots
+        )
+
+        plan = [_length_2d(self.survey, shot) for shot in surveyed]
+        assert stats.plan_length == pytest.approx(np.nansum(plan))
+        assert stats.n_unresolved_shots == sum(map(math.isnan, plan))
+
+    def test_sections_and_dates(self):
+        survey = generate_survey(1_000, seed=2)
+        stats = survey.stats()
+
+        assert [section.name for section in stats.sections] == [
+            section.name for section in survey.sections
+        ]
+        assert sum(section.n_shots for section in stats.sections) == 1_000
+        assert sum(stats.dates.values()) == pytest.approx(stats.length)
+        assert list(stats.dates) == sorted(stats.dates)
+
+    def test_cached_until_modified(self):
+        columns = shot_columns(self.survey)
+        assert shot_columns(self.survey) is columns
+
+        length = self.survey.stats().length
+        shot = next(
+            shot
+            for shot in self.survey.shots
+            if shot.shot_type == ArianeShotType.REAL and not shot.excluded
+        )
+        shot.length += 10
+        assert self.survey.stats().length == pytest.approx(length + 10)
+
+    def test_columns(self):
+        shots = list(self.survey.shots)
+        shots[5].depth = None
+        columns = shot_columns(self.survey)
+
+        np.testing.assert_array_equal(columns.length, [shot.length for shot in shots])
+        np.testing.assert_array_equal(columns.id_stop, [shot.id_stop for shot in shots])
+        np.testing.assert_array_equal(
+            columns.excluded, [shot.excluded for shot in shots]
+        )
+        assert [SHOT_TYPES[code] for code in columns.shot_type] == [
+            shot.shot_type for shot in shots
+        ]
+        assert math.isnan(columns.depth[5])
+        assert columns.depth[6] == shots[6].depth
+
+    def test_empty_survey(self):
+        stats = Survey().stats()
+        assert stats.n_shots == 0
+        assert stats.length == 0
+        assert stats.depth_min is None
+        assert stats.vertical_extent is None
+        assert stats.to_dict()["sections"] == []
+
+
+if __name__ == "__main__":
+    unittest.main()
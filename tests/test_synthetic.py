@@ -0,0 +1,145 @@
+"""Tests for the synthetic survey generator."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from openspeleo_lib.enums import ArianeShotType
+from openspeleo_lib.enums import LengthUnits
+from openspeleo_lib.geojson import build_shot_graph
+from openspeleo_lib.geojson import build_shots_map
+from openspeleo_lib.geojson import find_valid_shot_ids
+from openspeleo_lib.geojson import survey_to_geojson
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.interfaces.ariane.interface import ArianeSurvey
+from openspeleo_lib.synthetic import generate_survey
+from openspeleo_lib.synthetic import generate_survey_data
+from openspeleo_lib.synthetic import survey_to_compass_dat
+from openspeleo_lib.synthetic import write_survey
+
+
+class TestGenerateSurvey(unittest.TestCase):
+    def test_deterministic(self):
+        kwargs = {"seed": 42, "branching": 0.2, "loop_density": 0.1, "anchors": 2}
+        survey = generate_survey(500, **kwargs)
+
+        assert survey.model_dump() == generate_survey(500, **kwargs).model_dump()
+        assert survey.model_dump() != generate_survey(500, seed=1).model_dump()
+
+    def test_shot_count_and_structure(self):
+        survey = generate_survey(
+            1000, seed=3, anchors=3, section_size=25, loop_density=0.1, lrud=False
+        )
+        shots = list(survey.shots)
+
+        assert len(shots) == 1000
+        assert all(len(section.shots) <= 25 for section in survey.sections)
+        assert all(shot.left is None for shot in shots)
+
+        types = [shot.shot_type for shot in shots]
+        assert types.count(ArianeShotType.START) == 3
+        assert types.count(ArianeShotType.CLOSURE) > 0
+
+        # Unique station IDs
+        assert len({shot.id_stop for shot in shots}) == len(shots)
+
+        # Depth variation is always compatible with the shot length
+        shots_map = build_shots_map(survey)
+        for shot in shots_map.values():
+            if shot.shot_type == ArianeShotType.REAL:
+                shot.length_2d(origin_depth=shots_map[shot.id_start].depth)
+
+    def test_all_shots_reachable(self):
+        survey = generate_survey(2000, seed=7, branching=0.3, anchors=2)
+        shots_map = build_shots_map(survey)
+        graph = build_shot_graph(survey.sections)
+
+        assert find_valid_shot_ids(shots_map, graph) == set(shots_map)
+
+    def test_orphans_and_cycles_injection(self):
+        survey = generate_survey(300, seed=7, orphans=4, cycles=2, loop_density=0.0)
+        shots_map = build_shots_map(survey)
+        graph = build_shot_graph(survey.sections)
+
+        with self.assertLogs("openspeleo_lib.geojson", level="WARNING"):
+            valid_ids = find_valid_shot_ids(shots_map, graph)
+
+        assert len(shots_map) == 300 + 4 + 2 * 3
+        assert len(shots_map) - len(valid_ids) == 4 + 2 * 3
+
+    def test_invalid_parameters(self):
+        with pytest.raises(ValueError, match="At least one anchor"):
+            generate_survey_data(10, anchors=0)
+
+        with pytest.raises(ValueError, match="must be at least equal"):
+            generate_survey_data(2, anchors=3)
+
+        with pytest.raises(ValueError, match="`branching` must be within"):
+            generate_survey_data(10, branching=1.5)
+
+
+class TestWriteSurvey(unittest.TestCase):
+    def test_tml_roundtrip(self):
+        survey = generate_survey(
+            800, seed=11, survey_cls=ArianeSurvey, orphans=1, cycles=1
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "synthetic.tml"
+            write_survey(survey, filepath)
+            reloaded = ArianeInterface.from_file(filepath)
+
+        assert reloaded.model_dump() == survey.model_dump()
+
+        with self.assertLogs("openspeleo_lib.geojson", level="WARNING"):
+            geojson = survey_to_geojson(reloaded)
+
+        # START points + connected shots
+        assert len(geojson["features"]) == 800 - sum(
+            1 for shot in survey.shots if shot.shot_type == ArianeShotType.CLOSURE
+        )
+
+    def test_json_output(self):
+        survey = generate_survey(100, seed=0)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = Path(tmp_dir) / "synthetic.json"
+            write_survey(survey, filepath)
+            assert type(survey).from_json(filepath).model_dump() == survey.model_dump()
+
+    def test_compass_dat(self):
+        survey = generate_survey(
+            200, seed=0, section_size=50, loop_density=0.0, unit=LengthUnits.FEET
+        )
+        dat = survey_to_compass_dat(survey)
+
+        assert dat.count("SURVEY NAME:") == len(survey.sections)
+        assert dat.count("\f") == len(survey.sections) - 1
+
+        shot_lines = [
+            line.split()
+            for line in dat.split("\r\n")
+            if line.startswith(" ") and "FROM" not in line
+        ]
+        # START shots are not exported
+        assert len(shot_lines) == 199
+
+        first_shot = next(s for s in survey.shots if s.shot_type == ArianeShotType.REAL)
+        assert shot_lines[0][:4] == [
+            f"S{first_shot.id_start}",
+            f"S{first_shot.id_stop}",
+            f"{first_shot.length:.2f}",
+            f"{first_shot.azimuth:.2f}",
+        ]
+
+    def test_unsupported_format(self):
+        with pytest.raises(ValueError, match="Unsupported file format"):
+            write_survey(generate_survey(10), "synthetic.xml")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import gc
+import pickle
+import unittest
+import weakref
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from openspeleo_lib.errors import DetachedModelError
+from openspeleo_lib.geojson import propagate_survey
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.models import Section
+from openspeleo_lib.models import Shot
+from openspeleo_lib.models import Survey
+from openspeleo_lib.synthetic import generate_survey
+from openspeleo_lib.tracking import TrackedList
+
+
+class TestChangeTracking(unittest.TestCase):
+    def setUp(self):
+        self.survey = generate_survey(100, seed=7)
+        self.section = self.survey.sections[0]
+        self.shot = self.section.shots[0]
+
+    def test_tracked_lists(self):
+        assert isinstance(self.survey.sections, TrackedList)
+        assert isinstance(self.section.shots, TrackedList)
+
+        # Lists assigned afterward are tracked too
+        self.section.shots = list(self.section.shots)
+        assert isinstance(self.section.shots, TrackedList)
+
+    def test_field_edit(self):
+        version = self.survey.version
+        section_version = self.section.version
+        topology_version = self.survey.topology_version
+
+        self.shot.comment = "edited"
+        assert self.survey.version == version + 1
+        assert self.section.version == section_version + 1
+        assert self.survey.topology_version == topology_version
+
+        # Re-assigning an equal value isn't a change
+        self.shot.comment = "edited"
+        assert self.survey.version == version + 1
+
+        self.shot.id_stop = 1_000_000
+        assert self.survey.topology_version == topology_version + 1
+
+    def test_list_mutations(self):
+        topology_version = self.survey.topology_version
+
+        new_shot = self.shot.model_copy()
+        self.survey.sections[-1].shots.append(new_shot)
+        assert new_shot.section is self.survey.sections[-1]
+        assert self.survey.topology_version == topology_version + 1
+
+        # Changes made between two reads of the versions count once
+        self.section.shots.pop()
+        del self.survey.sections[0]
+        assert self.survey.topology_version == topology_version + 2
+
+    def test_derived(self):
+        calls = []
+
+        def compute():
+            calls.append(None)
+            return len(calls)
+
+        assert self.survey.derived("key", compute) == 1
+        assert self.survey.derived("key", compute) == 1
+
+        self.shot.comment = "edited"
+        assert self.survey.derived("key", compute) == 2
+        assert self.survey.derived("key", compute, topology=True) == 3
+
+        # Only recomputed on topology changes
+        self.shot.comment = "edited again"
+        assert self.survey.derived("key", compute, topology=True) == 3
+
+    def test_copies(self):
+        self.shot.comment = "edited"
+        self.survey.derived("key", lambda: self.survey.sections)
+
+        for copy in (
+            self.survey.model_copy(deep=True),
+            pickle.loads(pickle.dumps(self.survey)),  # noqa: S301
+        ):
+            assert isinstance(copy.sections, TrackedList)
+            assert copy.sections[0].survey is copy
+            assert copy.sections[0].shots[0].section is copy.sections[0]
+            assert "key" not in copy._derived  # noqa: SLF001
+
+            version = copy.version
+            copy.sections[0].shots[0].comment = "copy"
+            assert copy.version == version + 1
+            assert self.shot.comment == "edited"
+
+    def test_model_dump(self):
+        data = self.survey.model_dump()
+        assert type(data["sections"]) is list
+        assert type(data["sections"][0]["shots"]) is list
+
+
+class TestParentLinks(unittest.TestCase):
+    def test_weak_links(self):
+        survey = generate_survey(100, seed=7)
+        section = survey.sections[0]
+        shot = section.shots[0]
+        assert shot.section is section
+        assert section.survey is survey
+
+        # No reference cycle: freed without the cycle collector
+        gc.disable()
+        try:
+            ref = weakref.ref(survey)
+            del survey
+            assert ref() is None
+            assert section.survey is None
+            assert shot.section is section
+        finally:
+            gc.enable()
+
+    def test_detached(self):
+        survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+        assert survey.sections[3].computed_declination == pytest.approx(-2.05)
+        assert survey.sections[3].shots[1].azimuth_true == pytest.approx(34.05)
+
+        # Survey released: the section / shot can't reach it anymore
+        section = survey.sections[3]
+        shot = section.shots[1]
+        del survey
+
+        with pytest.raises(DetachedModelError, match="detached from its survey"):
+            _ = section.computed_declination
+        with pytest.raises(DetachedModelError, match="detached from its survey"):
+            _ = shot.azimuth_true
+
+        del section
+        with pytest.raises(DetachedModelError, match="detached from its section"):
+            _ = shot.azimuth_true
+
+    def test_parent_keywords(self):
+        survey = generate_survey(10, seed=7)
+        section = Section(name="linked", survey=survey)
+        assert section.survey is survey
+
+        shot = survey.sections[0].shots[0]
+        data = shot.model_dump(exclude={"id_stop"})
+        assert Shot(**data, id_stop=999, section=section).section is section
+
+    def test_pickled_shot(self):
+        survey = generate_survey(10, seed=7)
+        shot = pickle.loads(pickle.dumps(survey.sections[0].shots[0]))  # noqa: S301
+        assert shot.section is None
+
+
+class TestPropagationCache(unittest.TestCase):
+    def setUp(self):
+        self.survey = ArianeInterface.from_file(Path("tests/artifacts/hand_survey.tml"))
+
+    def test_cached_until_modified(self):
+        result = propagate_survey(self.survey)
+        assert propagate_survey(self.survey) is result
+
+        self.survey.sections[0].shots[0].comment = "edited"
+        assert propagate_survey(self.survey) is not result
+
+    def test_anchor_found_once(self):
+        # The anchor is the 59th shot: the propagated coordinates must not
+        # invalidate it.
+        assert not self.survey.sections[0].shots[0].is_geolocation_known()
+
+        with mock.patch.object(
+            Survey,
+            "_find_geo_anchor",
+            autospec=True,
+            side_effect=Survey._find_geo_anchor,  # noqa: SLF001
+        ) as find_geo_anchor:
+            propagate_survey(self.survey)
+            propagate_survey(self.survey)
+
+        assert find_geo_anchor.call_count == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+
+import pytest
+
+from openspeleo_lib.constants import FEET_TO_METERS
+from openspeleo_lib.enums import LengthUnits
+from openspeleo_lib.interfaces import ArianeInterface
+from openspeleo_lib.synthetic import generate_survey
+from openspeleo_lib.units import SHOT_LENGTH_FIELDS
+from openspeleo_lib.units import conversion_factor
+
+
+def _radii(shape) -> dict[str, float]:
+    return {
+        vector["angle"]: float(vector["length"])
+        for vector in shape["RadiusCollection"]["RadiusVector"]
+    }
+
+
+class TestConversionFactor(unittest.TestCase):
+    def test_factors(self):
+        assert conversion_factor(LengthUnits.FEET, LengthUnits.METERS) == 0.3048
+        factor = conversion_factor(LengthUnits.METERS, LengthUnits.FEET)
+        assert factor == pytest.approx(1 / 0.3048)
+        assert conversion_factor(LengthUnits.FEET, LengthUnits.FEET) == 1.0
+
+
+class TestConvertUnits(unittest.TestCase):
+    def setUp(self):
+        self.survey = ArianeInterface.from_file(Path("tests/artifacts/test_large.tml"))
+        assert self.survey.unit == LengthUnits.FEET
+        self.data = self.survey.model_dump()
+
+    def _assert_converted(self, source: dict, converted: dict, factor: float):
+        for section, converted_section in zip(
+            source["sections"], converted["sections"], strict=True
+        ):
+            for shot, converted_shot in zip(
+                section["shots"], converted_section["shots"], strict=True
+            ):
+                for name in SHOT_LENGTH_FIELDS:
+                    if shot[name] is None:
+                        assert converted_shot[name] is None
+                    else:
+                        assert converted_shot[name] == pytest.approx(
+                            shot[name] * factor
+                        )
+
+    def test_new_survey(self):
+        converted = self.survey.convert_units(LengthUnits.METERS)
+
+        # The original survey is left untouched
+        assert self.survey.model_dump() == self.data
+        assert converted.unit == LengthUnits.METERS
+        assert type(converted) is type(self.survey)
+        self._assert_converted(self.data, converted.model_dump(), FEET_TO_METERS)
+
+        # Own tree and wall shapes
+        section, shot = converted.sections[0], converted.sections[0].shots[0]
+        assert section is not self.survey.sections[0]
+        assert section.survey is converted
+        assert shot.section is section
+        assert self.survey.sections[0].survey is self.survey
+        assert shot.shape is not self.survey.sections[0].shots[0].shape
+
+        # Mutations aren't shared
+        version = self.survey.version
+        shot.comment = "converted"
+        section.shots.pop()
+        assert self.survey.version == version
+        assert self.survey.model_dump() == self.data
+
+    def test_round_trip(self):
+        converted = self.survey.convert_units(LengthUnits.METERS).convert_units(
+            LengthUnits.FEET
+        )
+        self._assert_converted(self.data, converted.model_dump(), 1.0)
+
+    def test_inplace(self):
+        survey = generate_survey(500, seed=4)
+        data = survey.model_dump()
+        length = survey.stats().length
+        version = survey.version
+        section_version = survey.sections[0].version
+
+        assert survey.convert_units(LengthUnits.FEET, inplace=True) is survey
+        assert survey.unit == LengthUnits.FEET
+        assert survey.version > version
+        assert survey.sections[0].version > section_version
+        self._assert_converted(data, survey.model_dump(), 1 / FEET_TO_METERS)
+
+        # Derived data is recomputed
+        assert survey.stats().length == pytest.approx(length / FEET_TO_METERS)
+
+    def test_shapes(self):
+        survey = ArianeInterface.from_file(Path("tests/artifacts/test_with_walls.tml"))
+        assert survey.unit == LengthUnits.METERS
+        data = survey.model_dump()
+
+        converted = survey.convert_units(LengthUnits.FEET)
+        assert survey.model_dump() == data
+
+        for shot, converted_shot in zip(survey.shots, converted.shots, strict=True):
+            assert converted_shot.shape is not shot.shape
+            assert _radii(converted_shot.shape) == pytest.approx(
+                {
+                    angle: length / FEET_TO_METERS
+                    for angle, length in _radii(shot.shape).items()
+                }
+            )
+
+        # The radii mirror the LRUD (50 / 36 / 33 / 50): rescaled alike
+        shot = next(shot for shot in converted.shots if shot.right)
+        assert shot.right == pytest.approx(36 / FEET_TO_METERS)
+        assert _radii(shot.shape) == pytest.approx(
+            {"0.0": shot.up, "90.0": shot.right, "180.0": shot.down, "270.0": shot.left}
+        )
+
+    def test_lazy_shapes(self):
+        filepath = Path("tests/artifacts/test_with_walls.tml")
+        survey = ArianeInterface.from_file(filepath, lazy_shapes=True)
+        converted = survey.convert_units(LengthUnits.FEET)
+
+        expected = ArianeInterface.from_file(filepath).convert_units(LengthUnits.FEET)
+        assert [shot.shape for shot in converted.shots] == [
+            shot.shape for shot in expected.shots
+        ]
+
+    def test_same_unit(self):
+        assert self.survey.convert_units(LengthUnits.FEET, inplace=True) is self.survey
+
+        converted = self.survey.convert_units(LengthUnits.FEET)
+        assert converted is not self.survey
+        assert converted.model_dump() == self.data
+
+
+if __name__ == "__main__":
+    unittest.main()